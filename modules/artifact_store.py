@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+"""
+산출물 저장소 - 생성기(계약서, 동의서·위임장, 손해사정서)가 만든 파일을 output/에 내용 해시 기준으로
+저장하고, 생성 이력을 SQLite 원장(ledger)에 기록합니다.
+
+- 파일: output/<sha256 앞 2자>/<sha256>.<확장자>. 같은 내용은 한 번만 저장됩니다.
+- 원장: 생성 1건당 1행 (문서 종류, 사건 ID, 담당자, 파일명, 생성 시각). 생성 시각·종류·사건 ID에 인덱스가 있어
+  최근 목록이 폴더를 훑지 않고 인덱스 조회로 끝납니다.
+- 집계(rollups): 일/주/월/전체 × 문서 종류 × 담당자별 건수를 기록과 같은 트랜잭션에서 증가시킵니다.
+  대시보드 통계와 추이(스파크라인)는 원장을 세지 않고 집계 행 몇 개만 읽습니다.
+
+secrets.toml 설정 예:
+    STAFF_NAME = "홍길동"   # 이 PC에서 생성한 문서의 담당자 (집계용)
+"""
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from modules.settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+OUTPUT_DIR = PROJECT_ROOT / "output"
+DB_PATH = OUTPUT_DIR / "ledger.sqlite3"
+
+# 문서 종류 → 표시 이름
+DOC_TYPES = {
+    "contract": "계약서",
+    "consent": "동의서·위임장",
+    "report": "손해사정서",
+}
+
+# 집계 단위. "all"은 버킷이 하나(ALL_BUCKET)인 전체 누계
+PERIODS = ("day", "week", "month", "all")
+ALL_BUCKET = "all"
+# 집계 행에서 "모든 문서 종류 / 모든 담당자"를 뜻하는 값
+ANY = "*"
+
+_init_lock = threading.Lock()
+_initialized = False
+
+
+def _connect() -> sqlite3.Connection:
+    """원장 DB 연결을 엽니다. 최초 호출 시 스키마를 생성합니다."""
+    global _initialized
+    if not _initialized:
+        with _init_lock:
+            if not _initialized:
+                OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(DB_PATH, timeout=30)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS blobs ("
+                    " sha256 TEXT PRIMARY KEY,"
+                    " ext TEXT NOT NULL,"
+                    " size INTEGER NOT NULL,"
+                    " created_at REAL NOT NULL)"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS artifacts ("
+                    " id INTEGER PRIMARY KEY,"
+                    " sha256 TEXT NOT NULL REFERENCES blobs(sha256),"
+                    " doc_type TEXT NOT NULL,"
+                    " case_id TEXT,"
+                    " staff TEXT NOT NULL DEFAULT '',"
+                    " file_name TEXT NOT NULL,"
+                    " created_at REAL NOT NULL)"
+                )
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(artifacts)")}
+                if "staff" not in columns:
+                    conn.execute("ALTER TABLE artifacts ADD COLUMN staff TEXT NOT NULL DEFAULT ''")
+                conn.execute("CREATE INDEX IF NOT EXISTS artifacts_created ON artifacts (created_at)")
+                conn.execute("CREATE INDEX IF NOT EXISTS artifacts_type ON artifacts (doc_type, created_at)")
+                conn.execute("CREATE INDEX IF NOT EXISTS artifacts_case ON artifacts (case_id, created_at)")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS rollups ("
+                    " period TEXT NOT NULL,"
+                    " bucket TEXT NOT NULL,"
+                    " doc_type TEXT NOT NULL,"
+                    " staff TEXT NOT NULL,"
+                    " count INTEGER NOT NULL,"
+                    " bytes INTEGER NOT NULL,"
+                    " PRIMARY KEY (period, bucket, doc_type, staff)) WITHOUT ROWID"
+                )
+                # 집계 테이블 도입 전 원장이면 한 번 채워 둠
+                if conn.execute("SELECT 1 FROM rollups LIMIT 1").fetchone() is None:
+                    _rebuild_rollups(conn)
+                conn.commit()
+                conn.close()
+                _initialized = True
+    return sqlite3.connect(DB_PATH, timeout=30)
+
+
+def period_bucket(period: str, dt: datetime) -> str:
+    """시각이 속한 집계 버킷 이름. day: 2026-10-19, week: 2026-W43 (ISO 주), month: 2026-10."""
+    if period == "day":
+        return dt.strftime("%Y-%m-%d")
+    if period == "week":
+        year, week, _ = dt.isocalendar()
+        return f"{year}-W{week:02d}"
+    if period == "month":
+        return dt.strftime("%Y-%m")
+    return ALL_BUCKET
+
+
+def _bump_rollups(conn: sqlite3.Connection, created_at: float, doc_type: str, staff: str, size: int):
+    """생성 1건을 일/주/월/전체 × (종류, 전체 종류) × (담당자, 전체 담당자) 집계 행에 더합니다."""
+    dt = datetime.fromtimestamp(created_at)
+    conn.executemany(
+        "INSERT INTO rollups (period, bucket, doc_type, staff, count, bytes) VALUES (?, ?, ?, ?, 1, ?)"
+        " ON CONFLICT (period, bucket, doc_type, staff)"
+        " DO UPDATE SET count = count + 1, bytes = bytes + excluded.bytes",
+        [
+            (period, period_bucket(period, dt), t, who, size)
+            for period in PERIODS
+            for t in (doc_type, ANY)
+            for who in (staff, ANY)
+        ],
+    )
+
+
+def _rebuild_rollups(conn: sqlite3.Connection):
+    """원장 전체로부터 집계 테이블을 다시 만듭니다 (호출자가 commit)."""
+    conn.execute("DELETE FROM rollups")
+    rows = conn.execute(
+        "SELECT a.created_at, a.doc_type, a.staff, b.size FROM artifacts a JOIN blobs b ON b.sha256 = a.sha256"
+    ).fetchall()
+    for created_at, doc_type, staff, size in rows:
+        _bump_rollups(conn, created_at, doc_type, staff, size)
+    if rows:
+        logger.info("rollups rebuilt from %d ledger rows", len(rows))
+
+
+def blob_path(sha256: str, ext: str) -> Path:
+    """내용 해시로 정해지는 저장 경로."""
+    return OUTPUT_DIR / sha256[:2] / f"{sha256}.{ext}"
+
+
+def save_artifact(data: bytes, doc_type: str, file_name: str, case_id: str | None = None,
+                  ext: str = "pdf", staff: str | None = None) -> dict | None:
+    """생성된 파일을 저장하고 원장·집계에 기록합니다. 저장·기록 실패는 로그만 남기고 None을 반환합니다
+    (다운로드 등 생성 흐름을 막지 않도록).
+
+    Args:
+        staff: 담당자 (생략하면 STAFF_NAME 설정, 설정도 없으면 빈 문자열)
+
+    Returns:
+        {"id", "sha256", "path", "deduplicated": 이미 같은 내용이 저장되어 있었는지}
+    """
+    sha256 = hashlib.sha256(data).hexdigest()
+    path = blob_path(sha256, ext)
+    now = time.time()
+    if staff is None:
+        staff = str(get_setting("STAFF_NAME", "") or "")
+    try:
+        conn = _connect()
+        try:
+            new_blob = conn.execute(
+                "INSERT OR IGNORE INTO blobs (sha256, ext, size, created_at) VALUES (?, ?, ?, ?)",
+                (sha256, ext, len(data), now),
+            ).rowcount == 1
+            if new_blob or not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(path.suffix + ".tmp")
+                tmp.write_bytes(data)
+                tmp.replace(path)
+            artifact_id = conn.execute(
+                "INSERT INTO artifacts (sha256, doc_type, case_id, staff, file_name, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (sha256, doc_type, case_id, staff, file_name, now),
+            ).lastrowid
+            _bump_rollups(conn, now, doc_type, staff, len(data))
+            conn.commit()
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("artifact store failed for %s: %s", file_name, e)
+        return None
+    return {"id": artifact_id, "sha256": sha256, "path": path, "deduplicated": not new_blob}
+
+
+def rollup_counts(now: datetime | None = None, doc_type: str | None = None,
+                  staff: str | None = None) -> dict:
+    """집계 테이블에서 생성 건수 {"today", "week", "month", "total"}를 읽습니다 (행 4개 조회)."""
+    now = now or datetime.now()
+    names = {"day": "today", "week": "week", "month": "month", "all": "total"}
+    counts = {name: 0 for name in names.values()}
+    if not DB_PATH.exists():
+        return counts
+    keys = [(period, period_bucket(period, now)) for period in PERIODS]
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            "SELECT period, count FROM rollups WHERE doc_type = ? AND staff = ?"
+            f" AND (period, bucket) IN ({', '.join('(?, ?)' for _ in keys)})",
+            (doc_type or ANY, staff or ANY, *(v for key in keys for v in key)),
+        ).fetchall()
+    finally:
+        conn.close()
+    for period, count in rows:
+        counts[names[period]] = count
+    return counts
+
+
+def _step_back(period: str, dt: datetime) -> datetime:
+    if period == "day":
+        return dt - timedelta(days=1)
+    if period == "week":
+        return dt - timedelta(weeks=1)
+    return (dt.replace(day=1) - timedelta(days=1)).replace(day=1)
+
+
+def rollup_series(period: str = "day", n: int = 14, now: datetime | None = None,
+                  doc_type: str | None = None, staff: str | None = None) -> list[tuple[str, int]]:
+    """최근 n개 버킷의 생성 건수 (오래된 것부터, 생성이 없던 버킷은 0).
+
+    Returns:
+        [(버킷 이름, 건수), ...]
+    """
+    if period not in ("day", "week", "month"):
+        raise ValueError(f"unknown period: {period}")
+    dt = now or datetime.now()
+    buckets = []
+    for _ in range(n):
+        buckets.append(period_bucket(period, dt))
+        dt = _step_back(period, dt)
+    buckets.reverse()
+    if not DB_PATH.exists():
+        return [(bucket, 0) for bucket in buckets]
+    conn = _connect()
+    try:
+        rows = dict(conn.execute(
+            "SELECT bucket, count FROM rollups WHERE period = ? AND doc_type = ? AND staff = ?"
+            " AND bucket BETWEEN ? AND ?",
+            (period, doc_type or ANY, staff or ANY, buckets[0], buckets[-1]),
+        ).fetchall())
+    finally:
+        conn.close()
+    return [(bucket, rows.get(bucket, 0)) for bucket in buckets]
+
+
+def rollup_breakdown(period: str = "week", by: str = "doc_type", now: datetime | None = None) -> dict[str, int]:
+    """현재 버킷의 문서 종류별(by="doc_type") 또는 담당자별(by="staff") 건수 (많은 순)."""
+    if by not in ("doc_type", "staff"):
+        raise ValueError(f"unknown breakdown: {by}")
+    if not DB_PATH.exists():
+        return {}
+    other = "staff" if by == "doc_type" else "doc_type"
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            f"SELECT {by}, count FROM rollups WHERE period = ? AND bucket = ? AND {other} = ? AND {by} != ?"
+            " ORDER BY count DESC",
+            (period, period_bucket(period, now or datetime.now()), ANY, ANY),
+        ).fetchall()
+    finally:
+        conn.close()
+    return dict(rows)
+
+
+def recent_artifacts(n: int = 3, doc_type: str | None = None, case_id: str | None = None) -> list[dict]:
+    """최근 생성 이력 n건 (최신순).
+
+    Returns:
+        [{"id", "sha256", "doc_type", "case_id", "file_name", "created_at", "staff", "path"}, ...]
+    """
+    if not DB_PATH.exists():
+        return []
+    clauses, params = [], []
+    if doc_type:
+        clauses.append("a.doc_type = ?")
+        params.append(doc_type)
+    if case_id:
+        clauses.append("a.case_id = ?")
+        params.append(case_id)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    conn = _connect()
+    try:
+        rows = conn.execute(
+            "SELECT a.id, a.sha256, a.doc_type, a.case_id, a.file_name, a.created_at, b.ext, a.staff"
+            f" FROM artifacts a JOIN blobs b ON b.sha256 = a.sha256 {where}"
+            " ORDER BY a.created_at DESC LIMIT ?",
+            (*params, n),
+        ).fetchall()
+    finally:
+        conn.close()
+    return [
+        {
+            "id": row[0],
+            "sha256": row[1],
+            "doc_type": row[2],
+            "case_id": row[3],
+            "file_name": row[4],
+            "created_at": row[5],
+            "staff": row[7],
+            "path": blob_path(row[1], row[6]),
+        }
+        for row in rows
+    ]
+
+
+def store_info() -> dict:
+    """저장소 규모 {"artifacts": 생성 건수, "blobs": 저장 파일 수, "blob_bytes", "db_bytes": 원장 DB(WAL 포함) 크기}"""
+    info = {"artifacts": 0, "blobs": 0, "blob_bytes": 0, "db_bytes": 0}
+    if not DB_PATH.exists():
+        return info
+    conn = _connect()
+    try:
+        info["blobs"], info["blob_bytes"] = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+        row = conn.execute(
+            "SELECT count FROM rollups WHERE period = 'all' AND bucket = ? AND doc_type = ? AND staff = ?",
+            (ALL_BUCKET, ANY, ANY),
+        ).fetchone()
+        info["artifacts"] = row[0] if row else 0
+    finally:
+        conn.close()
+    for suffix in ("", "-wal"):
+        path = DB_PATH.with_name(DB_PATH.name + suffix)
+        if path.exists():
+            info["db_bytes"] += path.stat().st_size
+    return info
+
+
+def read_artifact(sha256: str, ext: str = "pdf") -> bytes:
+    """저장된 파일 내용을 읽습니다.
+
+    Raises:
+        FileNotFoundError: 저장소에 없는 파일
+    """
+    return blob_path(sha256, ext).read_bytes()
@@ -0,0 +1,383 @@
+# -*- coding: utf-8 -*-
+"""
+사건 검색 색인 - 보고서 사건(입력값·첨부 파일명·보고서 본문)과 계약서·동의서 생성 기록을 SQLite FTS5로 색인합니다.
+
+한국어는 형태소 분석 없이 글자 2-gram으로 쪼개 색인하고, 검색어도 같은 방식으로 쪼개 구(phrase)로 찾습니다
+("홍길동" → "홍길 길동"). 그래서 이름 일부, 증권번호, 진단명처럼 띄어쓰기와 무관한 부분 문자열 검색이 됩니다.
+단어의 마지막 글자는 한 글자 조각으로도 색인해 한 글자 검색("동")이 단어 끝 글자도 찾습니다.
+
+- 보고서 사건은 단계가 바뀔 때마다(페이지의 persist_case) 갱신되며, 세션 저장소의 사건 상태를 가리키므로
+  검색 결과에서 다시 열 때(?case=) 자료를 다시 추출하지 않습니다.
+- 계약서·동의서는 PDF를 생성할 때 1건씩 색인됩니다. 주민등록번호는 앞 6자리(생년월일)만 색인합니다.
+- 주소·연락처·생년월일이 들어 있으므로 종류와 관계없이 CASE_RETENTION_DAYS(세션 저장소와 같은 설정) 동안
+  갱신되지 않은 항목은 삭제합니다 (expire_cases, 색인·검색 때 1시간에 한 번).
+"""
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from modules.artifact_store import DOC_TYPES
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DATA_DIR = PROJECT_ROOT / "data"
+DB_PATH = DATA_DIR / "case_index.sqlite3"
+
+# 검색 결과 기본 개수와 미리보기(스니펫) 앞뒤 글자 수
+DEFAULT_LIMIT = 20
+SNIPPET_CHARS = 40
+# bm25 가중치: 제목(이름) > 입력값 > 본문
+RANK_WEIGHTS = (10.0, 4.0, 1.0)
+
+# 보고서 사건에서 색인할 입력값 (report_data 키 → 표시 이름)
+REPORT_FIELDS = {
+    "insured_birth": "생년월일",
+    "insured_phone": "연락처",
+    "insured_address": "주소",
+    "accident_date": "사고일시",
+    "accident_place": "사고장소",
+    "accident_desc": "사고경위",
+    "additional_info": "추가 정보",
+}
+# 보험계약 한 건에서 색인할 값
+CONTRACT_FIELDS = {
+    "company": "보험회사",
+    "product": "상품명",
+    "policy_no": "증권번호",
+    "period": "보험기간",
+    "coverage": "담보내역",
+}
+
+# 색인 형식 버전 (PRAGMA user_version) — 올리면 다음 연결 때 저장된 원문으로 FTS를 다시 만듭니다
+INDEX_VERSION = 2
+# 보존 기간 정리 간격 (초)
+EXPIRE_INTERVAL_SECONDS = 60 * 60
+
+_WORD_RE = re.compile(r"\w+")
+
+_init_lock = threading.Lock()
+_initialized = False
+_expire_lock = threading.Lock()
+_last_expire = 0.0
+
+
+def ngrams(text: str) -> str:
+    """색인용 2-gram 문자열. 단어(글자·숫자 연속)마다 겹치는 두 글자 조각으로 나누고 마지막 글자를 덧붙입니다
+    (한 글자 단어는 그대로). 마지막 글자가 있어야 한 글자 접두어 검색이 단어 끝 글자도 찾습니다."""
+    grams = []
+    for word in _WORD_RE.findall(text.lower()):
+        if len(word) >= 2:
+            grams.extend(word[i:i + 2] for i in range(len(word) - 1))
+        grams.append(word[-1])
+    return " ".join(grams)
+
+
+def match_query(query: str) -> str:
+    """검색어 → FTS5 MATCH 식. 단어마다 2-gram 구를 만들어 모두 포함(AND)하도록 합니다. 한 글자는 접두어 검색."""
+    phrases = []
+    for word in _WORD_RE.findall(query.lower()):
+        if len(word) < 2:
+            phrases.append(f'"{word}"*')
+        else:
+            phrases.append('"' + " ".join(word[i:i + 2] for i in range(len(word) - 1)) + '"')
+    return " AND ".join(phrases)
+
+
+def _connect() -> sqlite3.Connection:
+    """색인 DB 연결을 엽니다. 최초 호출 시 스키마를 만들고, 비어 있으면 저장된 보고서 사건으로 채웁니다."""
+    global _initialized
+    if not _initialized:
+        with _init_lock:
+            if not _initialized:
+                DATA_DIR.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(DB_PATH, timeout=30)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS entries ("
+                    " id INTEGER PRIMARY KEY,"
+                    " case_id TEXT NOT NULL UNIQUE,"
+                    " kind TEXT NOT NULL,"
+                    " title TEXT NOT NULL,"
+                    " fields TEXT NOT NULL,"
+                    " body TEXT NOT NULL,"
+                    " status TEXT NOT NULL,"
+                    " artifact TEXT,"
+                    " signature TEXT NOT NULL,"
+                    " created_at REAL NOT NULL,"
+                    " updated_at REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS entries_updated ON entries (kind, updated_at)")
+                conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts"
+                    " USING fts5(title, fields, body, tokenize='unicode61 remove_diacritics 0')"
+                )
+                empty = conn.execute("SELECT 1 FROM entries LIMIT 1").fetchone() is None
+                if not empty and conn.execute("PRAGMA user_version").fetchone()[0] < INDEX_VERSION:
+                    _rebuild_fts(conn)
+                conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+                conn.commit()
+                conn.close()
+                _initialized = True
+                if empty:
+                    _backfill_reports()
+    return sqlite3.connect(DB_PATH, timeout=30)
+
+
+def _rebuild_fts(conn: sqlite3.Connection):
+    """저장된 원문(entries)으로 FTS 색인을 다시 만듭니다 (색인 형식이 바뀐 경우)."""
+    conn.execute("DELETE FROM entries_fts")
+    rows = conn.execute("SELECT id, title, fields, body FROM entries").fetchall()
+    conn.executemany(
+        "INSERT INTO entries_fts (rowid, title, fields, body) VALUES (?, ?, ?, ?)",
+        [(entry_id, ngrams(title), ngrams(_field_text(json.loads(fields))), ngrams(body))
+         for entry_id, title, fields, body in rows],
+    )
+    logger.info("case index rebuilt for format %d (%d entries)", INDEX_VERSION, len(rows))
+
+
+def _field_text(fields: dict) -> str:
+    """입력값 dict를 색인·미리보기용 한 덩어리 문자열로 펼칩니다."""
+    parts = []
+    for value in fields.values():
+        if isinstance(value, (list, tuple)):
+            parts.extend(str(v) for v in value if v)
+        elif value:
+            parts.append(str(value))
+    return "\n".join(parts)
+
+
+def index_case(case_id: str, kind: str, title: str, fields: dict, body: str = "", status: str = "",
+               artifact: str | None = None, updated_at: float | None = None) -> bool:
+    """사건 1건을 색인합니다 (같은 case_id면 덮어쓰기). 내용이 그대로면 다시 쓰지 않습니다.
+    색인 실패는 로그만 남기고 False를 반환합니다 (문서 생성 흐름을 막지 않도록).
+
+    Args:
+        fields: {표시 이름: 값 | 값 목록} — 검색 대상이자 결과 화면에 보이는 입력값
+        artifact: 생성 파일의 sha256 (산출물 저장소), 없으면 기존 값 유지
+    """
+    expire_cases()
+    signature = hashlib.sha256(
+        json.dumps([kind, title, fields, body, status, artifact], ensure_ascii=False, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    now = updated_at or time.time()
+    try:
+        conn = _connect()
+        try:
+            row = conn.execute("SELECT id, signature FROM entries WHERE case_id = ?", (case_id,)).fetchone()
+            if row is not None and row[1] == signature:
+                return True
+            values = (kind, title, json.dumps(fields, ensure_ascii=False), body, status, artifact, signature, now)
+            if row is None:
+                entry_id = conn.execute(
+                    "INSERT INTO entries (kind, title, fields, body, status, artifact, signature, updated_at,"
+                    " case_id, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (*values, case_id, now),
+                ).lastrowid
+            else:
+                entry_id = row[0]
+                conn.execute(
+                    "UPDATE entries SET kind = ?, title = ?, fields = ?, body = ?, status = ?,"
+                    " artifact = COALESCE(?, artifact), signature = ?, updated_at = ? WHERE id = ?",
+                    (*values, entry_id),
+                )
+                conn.execute("DELETE FROM entries_fts WHERE rowid = ?", (entry_id,))
+            conn.execute(
+                "INSERT INTO entries_fts (rowid, title, fields, body) VALUES (?, ?, ?, ?)",
+                (entry_id, ngrams(title), ngrams(_field_text(fields)), ngrams(body)),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning("case index failed for %s: %s", case_id, e)
+        return False
+    return True
+
+
+def remove_cases(case_ids: list[str]) -> int:
+    """사건 색인 항목을 삭제합니다 (보존 기간이 지나 원본 사건 상태가 지워진 경우). 삭제 실패는 로그만 남깁니다."""
+    if not case_ids or not DB_PATH.exists():
+        return 0
+    try:
+        conn = _connect()
+        try:
+            conn.execute("PRAGMA secure_delete=ON")
+            ids = [row[0] for case_id in case_ids
+                   for row in conn.execute("SELECT id FROM entries WHERE case_id = ?", (case_id,))]
+            _delete_entries(conn, ids)
+            conn.commit()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning("case index removal failed: %s", e)
+        return 0
+    return len(ids)
+
+
+def _delete_entries(conn: sqlite3.Connection, ids: list[int]):
+    conn.executemany("DELETE FROM entries_fts WHERE rowid = ?", [(i,) for i in ids])
+    conn.executemany("DELETE FROM entries WHERE id = ?", [(i,) for i in ids])
+
+
+def expire_cases(force: bool = False, now: float | None = None) -> int:
+    """보존 기간(CASE_RETENTION_DAYS)이 지난 색인 항목을 종류(보고서·계약서·동의서)와 관계없이 삭제합니다.
+    force=False면 EXPIRE_INTERVAL_SECONDS에 한 번만 실행하고, 다른 스레드가 정리 중이면 건너뜁니다.
+    실패는 로그만 남깁니다. 삭제한 항목 수를 반환합니다."""
+    global _last_expire
+    from modules.report_session_store import retention_seconds
+
+    now = now or time.time()
+    # 색인이 비어 있을 때의 백필이 index_case → expire_cases로 다시 들어오므로 기다리지 않음
+    if not _expire_lock.acquire(blocking=False):
+        return 0
+    try:
+        if not DB_PATH.exists() or (not force and now - _last_expire < EXPIRE_INTERVAL_SECONDS):
+            return 0
+        _last_expire = now
+        conn = _connect()
+        try:
+            conn.execute("PRAGMA secure_delete=ON")
+            with conn:
+                ids = [row[0] for row in conn.execute(
+                    "SELECT id FROM entries WHERE updated_at < ?", (now - retention_seconds(),)
+                )]
+                _delete_entries(conn, ids)
+            # WAL에 남은 삭제 전 페이지도 비움
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            conn.close()
+    except (sqlite3.Error, ValueError) as e:
+        logger.warning("case index expiry failed: %s", e)
+        return 0
+    finally:
+        _expire_lock.release()
+    if ids:
+        logger.info("case index expired %d entries", len(ids))
+    return len(ids)
+
+
+def report_fields(state: dict) -> dict:
+    """보고서 사건 상태(session_state 스냅샷)에서 색인할 입력값을 뽑습니다."""
+    data = state.get("report_data") or {}
+    fields = {label: data.get(key, "") for key, label in REPORT_FIELDS.items()}
+    for label in CONTRACT_FIELDS.values():
+        fields[label] = []
+    for contract in data.get("contracts") or []:
+        for key, label in CONTRACT_FIELDS.items():
+            if contract.get(key):
+                fields[label].append(contract[key])
+    fields["첨부자료"] = list(state.get("report_uploaded_names") or [])
+    return {label: value for label, value in fields.items() if value}
+
+
+def index_report_case(case_id: str, state: dict, updated_at: float | None = None) -> bool:
+    """보고서 사건을 색인합니다. 본문은 세션 저장소의 초안(report_draft 핸들)입니다."""
+    from modules.report_session_store import get_text
+
+    try:
+        body = get_text(state.get("report_draft", ""))
+    except KeyError:
+        body = ""
+    title = (state.get("report_data") or {}).get("insured_name") or "(성명 미입력)"
+    return index_case(case_id, "report", title, report_fields(state), body=body,
+                      status=state.get("report_phase", ""), updated_at=updated_at)
+
+
+def _backfill_reports():
+    """색인 도입 전에 저장된 보고서 사건을 색인합니다 (색인이 비어 있을 때 1회)."""
+    from modules.report_session_store import iter_case_states
+
+    count = 0
+    try:
+        for case_id, state, updated_at in iter_case_states():
+            count += index_report_case(case_id, state, updated_at=updated_at)
+    except (sqlite3.Error, ValueError) as e:
+        logger.warning("case index backfill stopped: %s", e)
+    if count:
+        logger.info("case index backfilled %d report cases", count)
+
+
+def birth_only(value: str) -> str:
+    """주민등록번호에서 앞 6자리(생년월일)만 남깁니다. 생년월일만 입력된 값은 그대로."""
+    return value.split("-")[0].strip() if value else ""
+
+
+def snippet(text: str, query: str, width: int = SNIPPET_CHARS) -> str:
+    """text에서 검색어 단어가 처음 나오는 곳 앞뒤 width자를 잘라 냅니다 (없으면 빈 문자열)."""
+    lowered = text.lower()
+    for word in _WORD_RE.findall(query.lower()):
+        pos = lowered.find(word)
+        if pos >= 0:
+            start, end = max(0, pos - width), min(len(text), pos + len(word) + width)
+            piece = " ".join(text[start:end].split())
+            return ("…" if start else "") + piece + ("…" if end < len(text) else "")
+    return ""
+
+
+def _row_to_entry(row, query: str = "") -> dict:
+    fields = json.loads(row[3])
+    entry = {
+        "case_id": row[0],
+        "kind": row[1],
+        "kind_label": DOC_TYPES.get(row[1], row[1]),
+        "title": row[2],
+        "fields": fields,
+        "status": row[5],
+        "artifact": row[6],
+        "updated_at": row[7],
+        "snippet": "",
+    }
+    if query:
+        entry["snippet"] = snippet(_field_text(fields), query) or snippet(row[4], query)
+    return entry
+
+
+_COLUMNS = "e.case_id, e.kind, e.title, e.fields, e.body, e.status, e.artifact, e.updated_at"
+
+
+def search_cases(query: str, kind: str | None = None, limit: int = DEFAULT_LIMIT) -> list[dict]:
+    """검색어로 사건을 찾습니다 (관련도순). 검색어가 비어 있으면 최근 갱신순.
+
+    Returns:
+        [{"case_id", "kind", "kind_label", "title", "fields", "status", "artifact", "updated_at", "snippet"}, ...]
+    """
+    expire_cases()
+    expr = match_query(query)
+    params = [kind] if kind else []
+    conn = _connect()
+    try:
+        if expr:
+            # 순위는 FTS 테이블 안에서 매기고 상위 limit건만 entries와 조인 (본문을 전부 읽지 않도록)
+            kind_clause = "AND rowid IN (SELECT id FROM entries WHERE kind = ?)" if kind else ""
+            rows = conn.execute(
+                f"SELECT {_COLUMNS} FROM ("
+                f" SELECT rowid, bm25(entries_fts, {', '.join(map(str, RANK_WEIGHTS))}) AS score"
+                f" FROM entries_fts WHERE entries_fts MATCH ? {kind_clause} ORDER BY score LIMIT ?"
+                ") f JOIN entries e ON e.id = f.rowid ORDER BY f.score, e.updated_at DESC",
+                (expr, *params, limit),
+            ).fetchall()
+        else:
+            kind_clause = "WHERE e.kind = ?" if kind else ""
+            rows = conn.execute(
+                f"SELECT {_COLUMNS} FROM entries e {kind_clause} ORDER BY e.updated_at DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+    finally:
+        conn.close()
+    return [_row_to_entry(row, query if expr else "") for row in rows]
+
+
+def get_case(case_id: str) -> dict | None:
+    """색인된 사건 1건 (없으면 None)."""
+    conn = _connect()
+    try:
+        row = conn.execute(f"SELECT {_COLUMNS} FROM entries e WHERE e.case_id = ?", (case_id,)).fetchone()
+    finally:
+        conn.close()
+    return _row_to_entry(row) if row else None
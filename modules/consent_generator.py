@@ -7,7 +7,9 @@
 from datetime import date
 from pathlib import Path
 
-import fitz  # PyMuPDF
+from modules.lazy import lazy_import
+
+fitz = lazy_import("fitz")  # PyMuPDF — 첫 사용 시 import
 
 # ── 경로 설정 ──────────────────────────────────────────────
 PROJECT_ROOT = Path(__file__).parent.parent
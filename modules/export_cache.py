@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+내보내기 캐시 - 보고서 초안을 다운로드 형식(md, pdf 등)으로 변환한 결과를 프로세스 전체에서 공유합니다.
+키는 (형식, 변환기 버전, 초안 내용 해시)라 같은 초안은 세션이 달라도 한 번만 변환되고,
+변환은 사용자가 다운로드 버튼을 누를 때(lazy_export) 처음 실행됩니다. 용량 상한을 넘으면 오래된 것부터 지웁니다.
+
+secrets.toml 설정 예:
+    EXPORT_CACHE_MB = 128
+"""
+import hashlib
+import importlib.util
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from modules.settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_MB = 128
+# 실패 기록 보관 개수 (다음 rerun에서 오류를 보여 주는 용도)
+MAX_ERRORS = 64
+
+
+def _render_md(text: str, stats: dict) -> bytes:
+    return text.encode("utf-8")
+
+
+def _render_pdf(text: str, stats: dict) -> bytes:
+    from modules.report_pdf_exporter import render_report_pdf
+
+    return render_report_pdf(text, stats=stats)
+
+
+def _pdf_version() -> str:
+    from modules.report_pdf_exporter import EXPORTER_VERSION
+
+    return EXPORTER_VERSION
+
+
+# 형식 → {"label", "ext", "mime", "version": 변환기 버전(문자열 또는 함수), "render", "requires": 필요한 패키지}
+FORMATS = {
+    "md": {
+        "label": "마크다운(.md)",
+        "ext": "md",
+        "mime": "text/markdown",
+        "version": "1",
+        "render": _render_md,
+        "requires": (),
+    },
+    "pdf": {
+        "label": "PDF",
+        "ext": "pdf",
+        "mime": "application/pdf",
+        "version": _pdf_version,
+        "render": _render_pdf,
+        "requires": ("fpdf", "fitz"),
+    },
+}
+
+_entries: "OrderedDict[str, dict]" = OrderedDict()
+_entries_bytes = 0
+_errors: "OrderedDict[str, str]" = OrderedDict()
+_lock = threading.Lock()
+# 키별 변환 잠금 (같은 초안을 여러 세션이 동시에 요청해도 한 번만 변환)
+_building: dict[str, threading.Lock] = {}
+
+
+def _budget_bytes() -> int:
+    return int(float(get_setting("EXPORT_CACHE_MB", DEFAULT_CACHE_MB)) * 1024 * 1024)
+
+
+def export_available(fmt: str) -> bool:
+    """형식 변환에 필요한 패키지가 설치되어 있는지 (import하지 않고 확인)."""
+    return all(importlib.util.find_spec(name) is not None for name in FORMATS[fmt]["requires"])
+
+
+def export_key(fmt: str, text: str) -> str:
+    """캐시 키: 형식 + 변환기 버전 + 초안 내용 해시."""
+    version = FORMATS[fmt]["version"]
+    if callable(version):
+        version = version()
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{fmt}:{version}:{digest}"
+
+
+def _store(key: str, entry: dict):
+    global _entries_bytes
+    size = entry["size"]
+    budget = _budget_bytes()
+    if size > budget // 2:
+        return
+    with _lock:
+        if key in _entries:
+            return
+        _entries[key] = entry
+        _entries_bytes += size
+        while _entries_bytes > budget and _entries:
+            _, old = _entries.popitem(last=False)
+            _entries_bytes -= old["size"]
+
+
+def _lookup(key: str) -> dict | None:
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None:
+            _entries.move_to_end(key)
+        return entry
+
+
+def _build(fmt: str, key: str, text: str) -> dict:
+    stats = {}
+    started = time.perf_counter()
+    try:
+        data = FORMATS[fmt]["render"](text, stats)
+    except Exception as e:
+        with _lock:
+            _errors[key] = str(e) or type(e).__name__
+            while len(_errors) > MAX_ERRORS:
+                _errors.popitem(last=False)
+        logger.warning("export %s failed: %s", fmt, e)
+        raise
+    entry = {
+        "data": data,
+        "size": len(data),
+        "stats": stats,
+        "seconds": time.perf_counter() - started,
+        "built_at": time.time(),
+    }
+    _store(key, entry)
+    with _lock:
+        _errors.pop(key, None)
+    logger.info("export %s built: %d bytes in %.2fs", fmt, entry["size"], entry["seconds"])
+    return entry
+
+
+def get_export(fmt: str, text: str, on_build: Callable[[bytes], None] | None = None) -> bytes:
+    """변환 결과를 반환합니다. 캐시에 없으면 변환 후 저장합니다. 변환 실패는 기록 후 다시 발생시킵니다.
+
+    Args:
+        on_build: 이번 호출에서 새로 변환했을 때만 결과 bytes로 호출 (산출물 저장소 기록 등)
+    """
+    key = export_key(fmt, text)
+    entry = _lookup(key)
+    if entry is not None:
+        return entry["data"]
+
+    with _lock:
+        build_lock = _building.setdefault(key, threading.Lock())
+    try:
+        with build_lock:
+            entry = _lookup(key)
+            built = entry is None
+            if built:
+                entry = _build(fmt, key, text)
+    finally:
+        with _lock:
+            _building.pop(key, None)
+    if built and on_build is not None:
+        on_build(entry["data"])
+    return entry["data"]
+
+
+def lazy_export(fmt: str, text: str, on_build: Callable[[bytes], None] | None = None) -> Callable[[], bytes]:
+    """st.download_button(data=...)용 함수. 버튼을 누를 때 get_export()를 호출합니다."""
+    def build() -> bytes:
+        return get_export(fmt, text, on_build=on_build)
+
+    return build
+
+
+def peek_export(fmt: str, text: str) -> dict | None:
+    """캐시에 있으면 {"size", "stats", "seconds", "built_at"}, 없으면 None (변환하지 않음)."""
+    entry = _lookup(export_key(fmt, text))
+    if entry is None:
+        return None
+    return {k: v for k, v in entry.items() if k != "data"}
+
+
+def export_error(fmt: str, text: str) -> str | None:
+    """이 초안의 마지막 변환 실패 메시지 (성공했거나 시도 전이면 None)."""
+    with _lock:
+        return _errors.get(export_key(fmt, text))
+
+
+def cache_info() -> dict:
+    """{"entries", "bytes", "budget"}"""
+    with _lock:
+        return {"entries": len(_entries), "bytes": _entries_bytes, "budget": _budget_bytes()}
@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+"""
+시스템 점검 모듈 - 백그라운드 스레드가 템플릿·폰트·AI 백엔드·저장소를 깊게 점검하고 결과를 스냅샷으로 보관합니다.
+대시보드는 health_snapshot()으로 스냅샷만 읽으므로 rerun마다 폴더를 훑거나 파일을 stat하지 않습니다.
+
+- 템플릿: 파일 해시, 페이지 수, 생성기가 찾는 마커·플레이스홀더가 제자리에 있는지, 좌표 설정 JSON
+- 폰트: 로딩 가능 여부와 한글 글리프
+- AI 백엔드: 모드, API 키, live/record 모드에서는 모델 조회 응답 시간
+- 저장소·캐시: 출력 폴더 쓰기 권한, 원장·파일 용량, 메모리 캐시 사용량
+
+항목마다 TTL이 지나거나 감시 폴더(templates/, config/, assets/fonts/, .streamlit/)에 변경이 생기면 그 항목만
+다시 점검합니다. 변경 감지는 watchdog(Streamlit 선택 의존성)이 있으면 파일 이벤트로, 없으면 수정 시각 폴링으로 합니다.
+항목 상태: pending → ok | warn | failed
+"""
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+from modules.warmup import wait_ready
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+TEMPLATE_DIR = PROJECT_ROOT / "templates"
+CONFIG_DIR = PROJECT_ROOT / "config"
+FONT_PATH = PROJECT_ROOT / "assets" / "fonts" / "malgun.ttf"
+OUTPUT_DIR = PROJECT_ROOT / "output"
+SETTINGS_DIR = PROJECT_ROOT / ".streamlit"
+
+# TTL 확인·폴링 간격 (초)
+POLL_SECONDS = 5.0
+# 첫 점검 전에 워밍업이 끝나기를 기다리는 최대 시간 (같은 파일을 동시에 읽으며 CPU를 다투지 않도록)
+WARMUP_WAIT_SECONDS = 60.0
+# 폰트에 반드시 있어야 하는 글자
+REQUIRED_GLYPHS = "가힣한글"
+LLM_PING_TIMEOUT_MS = 5000
+# 이보다 느리면 AI 백엔드 "주의"
+LLM_SLOW_SECONDS = 2.0
+# 메모리 캐시가 상한의 이 비율을 넘으면 "주의"
+CACHE_WARN_RATIO = 0.9
+# 변경으로 보는 파일 이벤트 (읽기용 open/close 이벤트는 무시 — 점검 자체가 파일을 읽으므로)
+WATCH_EVENTS = {"created", "deleted", "modified", "moved"}
+
+
+class ProbeWarning(Exception):
+    """점검은 통과했지만 주의가 필요한 상태 (status "warn")."""
+
+    def __init__(self, message: str, metrics: dict | None = None):
+        super().__init__(message)
+        self.metrics = metrics or {}
+
+
+def _mb(n: int) -> str:
+    return f"{n / (1024 * 1024):,.1f} MB"
+
+
+# ── 점검 항목 ──────────────────────────────────────────────
+
+def _check_contract(doc) -> list[str]:
+    """계약서: FIELD_MAP의 마커 글자가 좌표 안에 그대로 있는지."""
+    import fitz
+    from modules.pdf_generator import FIELD_MAP
+
+    problems = []
+    for key, (page_idx, bbox, _, _) in FIELD_MAP.items():
+        if page_idx >= doc.page_count:
+            problems.append(f"{key}: {page_idx + 1}페이지 없음")
+            continue
+        marker = key.rsplit("_", 1)[0]
+        if marker not in doc[page_idx].get_textbox(fitz.Rect(bbox)).replace(" ", ""):
+            problems.append(f"{key}: 마커 없음")
+    return problems
+
+
+def _check_consent(doc) -> list[str]:
+    """동의서·위임장: 플레이스홀더가 하나 이상 있고 날짜 삽입 페이지가 있는지."""
+    from modules.consent_generator import DATE_COORDS, PLACEHOLDER_MAP, _find_placeholder_rects
+
+    problems = [
+        f"{text}: 플레이스홀더 없음"
+        for text in PLACEHOLDER_MAP
+        if not any(_find_placeholder_rects(page, text) for page in doc)
+    ]
+    problems += [f"날짜: {idx + 1}페이지 없음" for idx in DATE_COORDS if idx >= doc.page_count]
+    return problems
+
+
+def _template_checks() -> dict:
+    from modules.consent_generator import TEMPLATE_NAME
+
+    return {"지산법인 계약서 2026.pdf": _check_contract, TEMPLATE_NAME: _check_consent}
+
+
+def _probe_templates() -> tuple[str, dict]:
+    import fitz
+
+    templates = sorted(TEMPLATE_DIR.glob("*.pdf")) if TEMPLATE_DIR.is_dir() else []
+    if not templates:
+        raise FileNotFoundError("templates 폴더에 PDF 템플릿이 없습니다.")
+    checks = _template_checks()
+    missing = [name for name in checks if not (TEMPLATE_DIR / name).exists()]
+    if missing:
+        raise FileNotFoundError(f"생성기 템플릿이 없습니다: {', '.join(missing)}")
+
+    hashes, pages, problems = {}, 0, []
+    for path in templates:
+        hashes[path.name] = hashlib.sha256(path.read_bytes()).hexdigest()[:12]
+        with fitz.open(path) as doc:
+            pages += doc.page_count
+            check = checks.get(path.name)
+            if check is not None:
+                problems += [f"{path.name} {p}" for p in check(doc)]
+    for path in sorted(CONFIG_DIR.glob("*.json")):
+        try:
+            json.loads(path.read_text(encoding="utf-8"))
+        except ValueError as e:
+            problems.append(f"{path.name}: JSON 오류 ({e})")
+    if problems:
+        raise RuntimeError("; ".join(problems))
+    return (
+        f"템플릿 {len(templates)}개 · {pages}페이지 · 마커 정상",
+        {"count": len(templates), "pages": pages, "hashes": hashes},
+    )
+
+
+def _probe_font() -> tuple[str, dict]:
+    import fitz
+
+    if not FONT_PATH.exists():
+        raise FileNotFoundError(f"폰트 파일이 없습니다: {FONT_PATH.relative_to(PROJECT_ROOT)}")
+    font = fitz.Font(fontfile=str(FONT_PATH))
+    metrics = {"file": FONT_PATH.name, "name": font.name, "bytes": FONT_PATH.stat().st_size}
+    missing = [ch for ch in REQUIRED_GLYPHS if not font.has_glyph(ord(ch))]
+    if missing:
+        raise RuntimeError(f"{FONT_PATH.name}에 한글 글리프가 없습니다: {''.join(missing)}")
+    return f"{FONT_PATH.name} ({font.name}, {metrics['bytes'] // 1024:,} KB)", metrics
+
+
+def _probe_llm() -> tuple[str, dict]:
+    from modules.llm_backends import RECORD_DIR, get_mode, needs_api_key
+
+    mode = get_mode()
+    metrics = {"mode": mode, "latency": None}
+    if not needs_api_key():
+        if mode == "replay":
+            recordings = sum(1 for _ in RECORD_DIR.glob("*/*.json")) if RECORD_DIR.is_dir() else 0
+            metrics["recordings"] = recordings
+            if not recordings:
+                raise ProbeWarning("replay 모드지만 녹화가 없습니다.", metrics)
+            return f"replay 모드 · 녹화 {recordings:,}개", metrics
+        return f"{mode} 모드 (API 호출 없음)", metrics
+
+    from google import genai
+    from google.genai import types
+
+    from modules.report_ai_client import get_api_key
+    from modules.report_model_router import get_route
+
+    key = get_api_key()
+    if not key:
+        raise ValueError("Gemini API 키가 설정되지 않았습니다.")
+    model = get_route("drafting")["model"]
+    client = genai.Client(api_key=key, http_options=types.HttpOptions(timeout=LLM_PING_TIMEOUT_MS))
+    started = time.perf_counter()
+    client.models.get(model=model)
+    metrics["latency"] = time.perf_counter() - started
+    detail = f"{mode} 모드 · {model} 응답 {metrics['latency'] * 1000:,.0f} ms"
+    if metrics["latency"] > LLM_SLOW_SECONDS:
+        raise ProbeWarning(f"{detail} (느림)", metrics)
+    return detail, metrics
+
+
+def _probe_storage() -> tuple[str, dict]:
+    from modules import export_cache
+    from modules.artifact_store import store_info
+
+    writable_dir = OUTPUT_DIR if OUTPUT_DIR.is_dir() else PROJECT_ROOT
+    if not os.access(writable_dir, os.W_OK):
+        raise PermissionError(f"출력 폴더에 쓸 수 없습니다: {writable_dir}")
+
+    caches = {"내보내기": export_cache.cache_info()}
+    # 조각 캐시는 보고서 PDF를 한 번이라도 만든 뒤에만 존재 (점검 때문에 fpdf를 불러오지 않음)
+    exporter = sys.modules.get("modules.report_pdf_exporter")
+    if exporter is not None:
+        caches["PDF 조각"] = exporter.cache_info()
+    metrics = {"store": store_info(), "caches": caches}
+
+    store = metrics["store"]
+    detail = f"문서 {store['artifacts']:,}건 · 파일 {_mb(store['blob_bytes'])} · 원장 {_mb(store['db_bytes'])}"
+    detail += "".join(f" · {name} 캐시 {_mb(c['bytes'])}/{_mb(c['budget'])}" for name, c in caches.items())
+    full = [name for name, c in caches.items() if c["budget"] and c["bytes"] > c["budget"] * CACHE_WARN_RATIO]
+    if full:
+        raise ProbeWarning(f"{detail} (거의 참: {', '.join(full)})", metrics)
+    return detail, metrics
+
+
+# (키, 표시 이름, 함수, TTL 초, 감시 폴더)
+PROBES = [
+    ("templates", "템플릿", _probe_templates, 3600, (TEMPLATE_DIR, CONFIG_DIR)),
+    ("font", "폰트", _probe_font, 3600, (FONT_PATH.parent,)),
+    ("llm", "AI 백엔드", _probe_llm, 300, (SETTINGS_DIR,)),
+    ("storage", "저장소·캐시", _probe_storage, 60, ()),
+]
+
+_lock = threading.Lock()
+_wake = threading.Event()
+_thread: threading.Thread | None = None
+_watch_mode: str | None = None
+_dirty: set[str] = set()
+# 폴링 감시 중인 폴더의 마지막 서명 {폴더: 서명}
+_signatures: dict[Path, tuple] = {}
+_results = {
+    key: {"key": key, "label": label, "status": "pending", "detail": "", "error": "",
+          "duration": None, "checked_at": None, "metrics": {}}
+    for key, label, _, _, _ in PROBES
+}
+
+
+# ── 변경 감지 ──────────────────────────────────────────────
+
+def _dir_signature(path: Path) -> tuple:
+    """폴더 안 파일 이름·크기·수정 시각 (없는 폴더는 빈 서명)."""
+    try:
+        return tuple(sorted((e.name, e.stat().st_size, e.stat().st_mtime_ns) for e in os.scandir(path)))
+    except OSError:
+        return ()
+
+
+def _start_watcher() -> set[Path]:
+    """watchdog으로 감시 폴더를 등록합니다. 등록한 폴더 집합을 반환 (watchdog이 없으면 빈 집합)."""
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return set()
+
+    class _Handler(FileSystemEventHandler):
+        def __init__(self, key: str):
+            self.key = key
+
+        def on_any_event(self, event):
+            if event.event_type in WATCH_EVENTS:
+                request_refresh([self.key])
+
+    observer = Observer()
+    observer.daemon = True
+    watched = set()
+    for key, _, _, _, dirs in PROBES:
+        for path in dirs:
+            if path.is_dir():
+                observer.schedule(_Handler(key), str(path), recursive=False)
+                watched.add(path)
+    try:
+        observer.start()
+    except OSError as e:  # inotify 한도 초과 등
+        logger.warning("health watcher unavailable, polling instead: %s", e)
+        return set()
+    return watched
+
+
+def _poll_changes(watched: set[Path]):
+    """watchdog이 감시하지 않는 폴더의 서명을 비교해 바뀐 항목을 다시 점검 대상으로 표시합니다."""
+    changed = []
+    for key, _, _, _, dirs in PROBES:
+        for path in dirs:
+            if path in watched:
+                continue
+            signature = _dir_signature(path)
+            previous = _signatures.get(path)
+            _signatures[path] = signature
+            if previous is not None and previous != signature:
+                changed.append(key)
+    if changed:
+        with _lock:
+            _dirty.update(changed)
+
+
+def _run_probe(key: str, func):
+    started = time.perf_counter()
+    try:
+        detail, metrics = func()
+        status, error = "ok", ""
+    except ProbeWarning as e:
+        detail, metrics, status, error = str(e), e.metrics, "warn", ""
+    except Exception as e:
+        detail, metrics, status, error = "", {}, "failed", str(e) or type(e).__name__
+        logger.warning("health %s failed: %s", key, error)
+    with _lock:
+        _results[key].update(status=status, detail=detail, error=error, metrics=metrics,
+                             duration=time.perf_counter() - started, checked_at=time.time())
+
+
+def _run():
+    global _watch_mode
+    wait_ready(WARMUP_WAIT_SECONDS)
+    watched = _start_watcher()
+    with _lock:
+        _watch_mode = "watchdog" if watched else "polling"
+    while True:
+        _poll_changes(watched)
+        now = time.time()
+        with _lock:
+            due = [
+                (key, func) for key, _, func, ttl, _ in PROBES
+                if key in _dirty or _results[key]["checked_at"] is None or now - _results[key]["checked_at"] >= ttl
+            ]
+            _dirty.difference_update(key for key, _ in due)
+        for key, func in due:
+            _run_probe(key, func)
+        _wake.wait(POLL_SECONDS)
+        _wake.clear()
+
+
+def start_health_monitor():
+    """점검 스레드를 시작합니다. 프로세스당 한 번만 실행되며 이후 호출은 무시됩니다."""
+    global _thread
+    with _lock:
+        if _thread is not None:
+            return
+        _thread = threading.Thread(target=_run, name="health", daemon=True)
+        _thread.start()
+
+
+def request_refresh(keys: list[str] | None = None):
+    """항목(생략하면 전체)을 다음 주기를 기다리지 않고 다시 점검하도록 요청합니다."""
+    with _lock:
+        _dirty.update(keys or [key for key, _, _, _, _ in PROBES])
+    _wake.set()
+
+
+def health_snapshot() -> dict:
+    """마지막 점검 결과 스냅샷 (I/O 없음).
+
+    Returns:
+        {"state": "idle"|"checking"|"ok"|"warn"|"failed", "watch": "watchdog"|"polling"|None,
+         "checked_at": 가장 최근 점검 시각 | None,
+         "probes": {키: {"key", "label", "status", "detail", "error", "duration", "checked_at", "metrics"}}}
+    """
+    with _lock:
+        probes = {key: dict(_results[key]) for key, _, _, _, _ in PROBES}
+        started, watch = _thread is not None, _watch_mode
+
+    statuses = {p["status"] for p in probes.values()}
+    if not started:
+        state = "idle"
+    elif "failed" in statuses:
+        state = "failed"
+    elif "pending" in statuses:
+        state = "checking"
+    elif "warn" in statuses:
+        state = "warn"
+    else:
+        state = "ok"
+    checked = [p["checked_at"] for p in probes.values() if p["checked_at"] is not None]
+    return {"state": state, "watch": watch, "checked_at": max(checked, default=None), "probes": probes}
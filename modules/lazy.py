@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+지연 import 모듈 - 무거운 라이브러리(fitz, fpdf, google.genai 등)를 첫 사용 시점에 불러옵니다.
+페이지는 모듈 최상단에서 import해도 비용을 치르지 않고 폼을 먼저 그릴 수 있습니다.
+
+사용 예:
+    from modules.lazy import lazy_import
+    fitz = lazy_import("fitz")   # 여기서는 import하지 않음
+    doc = fitz.open(path)        # 첫 속성 접근 시 실제 import
+"""
+import importlib
+import logging
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# 모듈명 → 실제 import에 걸린 시간(초)
+_load_times: dict[str, float] = {}
+_lock = threading.Lock()
+
+
+class LazyModule:
+    """첫 속성 접근 시 실제 모듈을 import하는 프록시."""
+
+    __slots__ = ("_name", "_module")
+
+    def __init__(self, name: str):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_module", None)
+
+    def _load(self):
+        module = self._module
+        if module is None:
+            name = self._name
+            already = name in sys.modules
+            started = time.perf_counter()
+            module = importlib.import_module(name)
+            if not already:
+                with _lock:
+                    _load_times[name] = time.perf_counter() - started
+                logger.debug("lazy import %s: %.3fs", name, _load_times[name])
+            object.__setattr__(self, "_module", module)
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """모듈을 지연 import합니다. 이미 import된 모듈이어도 프록시를 반환합니다."""
+    return LazyModule(name)
+
+
+def is_loaded(name: str) -> bool:
+    """모듈이 실제로 import되었는지 여부."""
+    return name in sys.modules
+
+
+def load_times() -> dict[str, float]:
+    """이 프로세스에서 지연 import가 실제로 불러온 모듈과 소요 시간(초)."""
+    with _lock:
+        return dict(_load_times)
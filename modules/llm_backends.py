@@ -0,0 +1,363 @@
+# -*- coding: utf-8 -*-
+"""
+LLM 백엔드 모듈 - Gemini 호출을 교체 가능한 백엔드로 분리합니다.
+
+모든 백엔드는 generate(request, api_key, usage) / stream(request, api_key, usage)를 제공하며,
+usage dict를 넘기면 입력·출력 토큰 수(prompt_tokens, output_tokens, thinking_tokens)를 채웁니다.
+
+모드 (설정 LLM_BACKEND):
+- live:   실제 Gemini API 호출 (기본값)
+- record: 실제 호출 결과를 요청 키별로 data/llm_recordings/에 저장
+- replay: 저장된 응답을 재생 (네트워크·API 키 불필요)
+- stub:   요청 키로 결정되는 고정 응답을 지정된 지연으로 스트리밍 (오프라인 벤치마크·테스트용)
+
+요청 키는 모델 + 시스템 프롬프트 해시 + 메시지 해시 + 생성 설정(+ 첨부 PDF 해시)으로 만듭니다.
+
+secrets.toml 설정 예:
+    LLM_BACKEND = "stub"
+    LLM_STUB_TTFT = 0.8          # 첫 청크까지 지연(초)
+    LLM_STUB_CHUNK_DELAY = 0.05  # 청크 간 지연(초)
+    LLM_STUB_CHARS = 6000        # 응답 길이(자)
+    LLM_REPLAY_MISS = "stub"     # replay 모드에서 녹화가 없을 때: error | stub
+    LLM_REPLAY_SPEED = 1.0       # 녹화 당시 청크 간격 재현 배율 (0이면 즉시)
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Iterator
+
+from modules.settings import get_setting
+
+PROJECT_ROOT = Path(__file__).parent.parent
+RECORD_DIR = PROJECT_ROOT / "data" / "llm_recordings"
+
+MODES = ("live", "record", "replay", "stub")
+DEFAULT_MODE = "live"
+
+# 스텁 기본값
+DEFAULT_STUB_TTFT = 0.5
+DEFAULT_STUB_CHUNK_DELAY = 0.03
+DEFAULT_STUB_CHARS = 3000
+STUB_CHUNK_CHARS = 80
+
+
+class ReplayMissError(RuntimeError):
+    """replay 모드에서 요청 키에 해당하는 녹화가 없을 때."""
+
+
+# ── 요청 ────────────────────────────────────────────────────
+def make_request(model: str, system_prompt: str, messages: list[dict], config: dict,
+                 attachments: list[dict] | None = None) -> dict:
+    """백엔드에 넘길 요청을 만듭니다 (SDK 타입에 의존하지 않는 plain dict).
+
+    Args:
+        model: 모델명
+        system_prompt: 시스템 프롬프트 ("" 가능)
+        messages: [{"role": "user"|"model"|"assistant", "content": "..."}]
+        config: 생성 설정 (max_output_tokens, temperature, response_mime_type, response_schema)
+        attachments: 첫 user 메시지 앞에 붙일 파일 [{"mime_type", "data": bytes}]
+    """
+    return {
+        "model": model,
+        "system_prompt": system_prompt or "",
+        "messages": [
+            {"role": "model" if m["role"] == "assistant" else m["role"], "content": m["content"]}
+            for m in messages
+        ],
+        "config": dict(config),
+        "attachments": list(attachments or []),
+    }
+
+
+def _sha256(data: bytes | str) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def request_key(request: dict) -> str:
+    """녹화·재생·스텁에 쓰는 요청 키."""
+    parts = {
+        "model": request["model"],
+        "system": _sha256(request["system_prompt"]),
+        "messages": _sha256(json.dumps(request["messages"], ensure_ascii=False, sort_keys=True)),
+        "config": request["config"],
+        "attachments": [_sha256(a["data"]) for a in request["attachments"]],
+    }
+    return _sha256(json.dumps(parts, ensure_ascii=False, sort_keys=True))
+
+
+def _fill_usage(usage: dict | None, metadata):
+    """Gemini usage_metadata를 usage dict로 옮깁니다."""
+    if usage is None or metadata is None:
+        return
+    usage["prompt_tokens"] = getattr(metadata, "prompt_token_count", None)
+    usage["output_tokens"] = getattr(metadata, "candidates_token_count", None)
+    usage["thinking_tokens"] = getattr(metadata, "thoughts_token_count", None)
+
+
+# ── live ────────────────────────────────────────────────────
+class LiveBackend:
+    """google-genai SDK로 실제 Gemini API를 호출합니다."""
+
+    name = "live"
+
+    @staticmethod
+    def _prepare(request: dict):
+        from google.genai import types
+
+        contents = []
+        for i, msg in enumerate(request["messages"]):
+            parts = []
+            if i == 0:
+                parts.extend(
+                    types.Part.from_bytes(data=a["data"], mime_type=a["mime_type"])
+                    for a in request["attachments"]
+                )
+            parts.append(types.Part.from_text(text=msg["content"]))
+            contents.append(types.Content(role=msg["role"], parts=parts))
+
+        config_kwargs = dict(request["config"])
+        if request["system_prompt"]:
+            config_kwargs["system_instruction"] = request["system_prompt"]
+        return contents, types.GenerateContentConfig(**config_kwargs)
+
+    def generate(self, request: dict, api_key: str, usage: dict | None = None) -> str:
+        from google import genai
+
+        contents, config = self._prepare(request)
+        client = genai.Client(api_key=api_key)
+        response = client.models.generate_content(model=request["model"], contents=contents, config=config)
+        _fill_usage(usage, response.usage_metadata)
+        return response.text
+
+    def stream(self, request: dict, api_key: str, usage: dict | None = None) -> Iterator[str]:
+        from google import genai
+
+        contents, config = self._prepare(request)
+        client = genai.Client(api_key=api_key)
+        for chunk in client.models.generate_content_stream(model=request["model"], contents=contents, config=config):
+            # usage_metadata는 누적값이며 마지막 청크에 최종값이 실립니다
+            _fill_usage(usage, chunk.usage_metadata)
+            if chunk.text:
+                yield chunk.text
+
+
+# ── 녹화 저장소 ─────────────────────────────────────────────
+def _recording_path(key: str) -> Path:
+    return RECORD_DIR / key[:2] / f"{key}.json"
+
+
+def load_recording(key: str) -> dict | None:
+    """녹화를 불러옵니다. 없으면 None."""
+    path = _recording_path(key)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_recording(key: str, request: dict, chunks: list[str], offsets: list[float],
+                   usage: dict | None = None):
+    """응답 청크와 청크별 도착 시각(요청 시작 기준 초), 토큰 사용량을 저장합니다."""
+    path = _recording_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    record = {
+        "key": key,
+        "model": request["model"],
+        "config": request["config"],
+        "system_sha256": _sha256(request["system_prompt"]),
+        "messages_sha256": _sha256(json.dumps(request["messages"], ensure_ascii=False, sort_keys=True)),
+        "chunks": chunks,
+        "offsets": offsets,
+        "usage": usage or {},
+        "recorded_at": time.time(),
+    }
+    tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps(record, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# ── record ──────────────────────────────────────────────────
+class RecordBackend:
+    """실제 호출을 그대로 전달하면서 완료된 응답을 녹화합니다. 중간에 끊긴 스트림은 저장하지 않습니다."""
+
+    name = "record"
+
+    def __init__(self, inner: LiveBackend):
+        self.inner = inner
+
+    def generate(self, request: dict, api_key: str, usage: dict | None = None) -> str:
+        usage = {} if usage is None else usage
+        started = time.perf_counter()
+        text = self.inner.generate(request, api_key, usage)
+        save_recording(request_key(request), request, [text or ""], [time.perf_counter() - started], usage)
+        return text
+
+    def stream(self, request: dict, api_key: str, usage: dict | None = None) -> Iterator[str]:
+        usage = {} if usage is None else usage
+        started = time.perf_counter()
+        chunks, offsets = [], []
+        for chunk in self.inner.stream(request, api_key, usage):
+            chunks.append(chunk)
+            offsets.append(time.perf_counter() - started)
+            yield chunk
+        save_recording(request_key(request), request, chunks, offsets, usage)
+
+
+# ── stub ────────────────────────────────────────────────────
+def _stub_value(schema: dict, seed: str):
+    """Gemini response_schema 형식의 스키마를 만족하는 최소 값을 만듭니다."""
+    kind = str(schema.get("type", "STRING")).upper()
+    if kind == "OBJECT":
+        return {name: _stub_value(sub, seed) for name, sub in schema.get("properties", {}).items()}
+    if kind == "ARRAY":
+        return []
+    if kind in ("INTEGER", "NUMBER"):
+        return 0
+    if kind == "BOOLEAN":
+        return False
+    if schema.get("enum"):
+        return schema["enum"][0]
+    return f"[STUB {seed[:8]}]"
+
+
+def stub_text(request: dict, chars: int) -> str:
+    """요청 키로 결정되는 고정 응답 텍스트.
+
+    JSON 모드면 스키마를 만족하는 JSON을, 아니면 마크다운 단락을 반환합니다.
+    검수 단계가 끝까지 진행되도록 마지막 줄에 통과 판정을 둡니다.
+    """
+    key = request_key(request)
+    schema = request["config"].get("response_schema")
+    if schema is not None:
+        return json.dumps(_stub_value(schema, key), ensure_ascii=False)
+
+    lines = [f"# [STUB] {request['model']} 응답", "", f"요청 키: `{key[:16]}`", ""]
+    body_len = sum(len(line) + 1 for line in lines)
+    n = 0
+    while body_len < chars:
+        n += 1
+        paragraph = f"{n}. 스텁 백엔드가 생성한 결정적 단락입니다 ({key[n % 48:n % 48 + 16]})."
+        lines.extend([paragraph, ""])
+        body_len += len(paragraph) + 2
+    lines.append("판정: 통과")
+    return "\n".join(lines)
+
+
+class StubBackend:
+    """네트워크 없이 결정적 응답을 청크 단위로 스트리밍합니다."""
+
+    name = "stub"
+
+    def __init__(self, ttft: float = DEFAULT_STUB_TTFT, chunk_delay: float = DEFAULT_STUB_CHUNK_DELAY,
+                 chars: int = DEFAULT_STUB_CHARS):
+        self.ttft = ttft
+        self.chunk_delay = chunk_delay
+        self.chars = chars
+
+    def generate(self, request: dict, api_key: str, usage: dict | None = None) -> str:
+        return "".join(self.stream(request, api_key, usage))
+
+    def stream(self, request: dict, api_key: str, usage: dict | None = None) -> Iterator[str]:
+        text = stub_text(request, self.chars)
+        if usage is not None:
+            # 실제 토크나이저 대신 2자당 1토큰으로 추정
+            prompt_chars = len(request["system_prompt"]) + sum(len(m["content"]) for m in request["messages"])
+            usage.update(prompt_tokens=prompt_chars // 2, output_tokens=len(text) // 2, thinking_tokens=0)
+        time.sleep(self.ttft)
+        for i in range(0, len(text), STUB_CHUNK_CHARS):
+            if i:
+                time.sleep(self.chunk_delay)
+            yield text[i:i + STUB_CHUNK_CHARS]
+
+
+# ── replay ──────────────────────────────────────────────────
+class ReplayBackend:
+    """녹화된 응답을 재생합니다. speed > 0이면 녹화 당시 청크 간격을 배율만큼 재현합니다."""
+
+    name = "replay"
+
+    def __init__(self, speed: float = 0.0, fallback: StubBackend | None = None):
+        self.speed = speed
+        self.fallback = fallback
+
+    def _load(self, request: dict) -> dict | None:
+        key = request_key(request)
+        record = load_recording(key)
+        if record is None and self.fallback is None:
+            raise ReplayMissError(f"녹화된 응답이 없습니다 (모델 {request['model']}, 키 {key[:16]})")
+        return record
+
+    def generate(self, request: dict, api_key: str, usage: dict | None = None) -> str:
+        record = self._load(request)
+        if record is None:
+            return self.fallback.generate(request, api_key, usage)
+        if usage is not None:
+            usage.update(record.get("usage", {}))
+        return "".join(self._replay(record))
+
+    def stream(self, request: dict, api_key: str, usage: dict | None = None) -> Iterator[str]:
+        record = self._load(request)
+        if record is None:
+            return self.fallback.stream(request, api_key, usage)
+        if usage is not None:
+            usage.update(record.get("usage", {}))
+        return self._replay(record)
+
+    def _replay(self, record: dict) -> Iterator[str]:
+        previous = 0.0
+        for chunk, offset in zip(record["chunks"], record["offsets"]):
+            if self.speed > 0:
+                time.sleep(max(0.0, offset - previous) * self.speed)
+            previous = offset
+            yield chunk
+
+
+# ── 선택 ────────────────────────────────────────────────────
+_backends: dict[tuple, object] = {}
+_backends_lock = threading.Lock()
+
+
+def get_mode() -> str:
+    """현재 백엔드 모드 (설정 LLM_BACKEND)."""
+    mode = str(get_setting("LLM_BACKEND", DEFAULT_MODE)).strip().lower()
+    if mode not in MODES:
+        raise ValueError(f"알 수 없는 LLM_BACKEND입니다: {mode} (가능: {', '.join(MODES)})")
+    return mode
+
+
+def get_backend():
+    """설정에 맞는 백엔드 인스턴스를 반환합니다. 같은 설정이면 같은 인스턴스를 재사용합니다."""
+    mode = get_mode()
+    stub_settings = (
+        float(get_setting("LLM_STUB_TTFT", DEFAULT_STUB_TTFT)),
+        float(get_setting("LLM_STUB_CHUNK_DELAY", DEFAULT_STUB_CHUNK_DELAY)),
+        int(get_setting("LLM_STUB_CHARS", DEFAULT_STUB_CHARS)),
+    )
+    replay_settings = (
+        float(get_setting("LLM_REPLAY_SPEED", 0.0)),
+        str(get_setting("LLM_REPLAY_MISS", "error")).lower(),
+    )
+    cache_key = (mode, stub_settings, replay_settings)
+    with _backends_lock:
+        backend = _backends.get(cache_key)
+        if backend is None:
+            if mode == "live":
+                backend = LiveBackend()
+            elif mode == "record":
+                backend = RecordBackend(LiveBackend())
+            elif mode == "stub":
+                backend = StubBackend(*stub_settings)
+            else:
+                speed, miss = replay_settings
+                backend = ReplayBackend(speed, StubBackend(*stub_settings) if miss == "stub" else None)
+            _backends[cache_key] = backend
+    return backend
+
+
+def needs_api_key() -> bool:
+    """현재 모드가 실제 API 키를 필요로 하는지 여부."""
+    return get_mode() in ("live", "record")
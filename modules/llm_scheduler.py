@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+LLM 호출 스케줄러 - 모든 Gemini 호출이 거치는 프로세스 공용 입장 제어(admission control) 계층입니다.
+
+- 동시 실행 상한: 한 번에 진행 중인 호출 수를 제한합니다.
+- 토큰 버킷: 분당 요청 수(RPM)와 분당 토큰 수(TPM)를 넘지 않도록 입장을 늦춥니다.
+- 공정 대기열: 세션(사건)별 대기열을 라운드 로빈으로 돌아가며 입장시키므로
+  한 사용자의 대량 호출(검수 6영역 등)이 다른 사용자를 막지 않습니다.
+- 재시도: 429/503 등 일시적 오류는 지터를 섞은 지수 백오프로 다시 대기열에 넣습니다.
+- 취소: cancel 이벤트가 설정되면 대기열에서 빠지고 호출을 시작하지 않습니다 (CallCancelled) —
+  취소된 작업이 입장해 RPM/TPM 한도를 쓰지 않도록 입장 직전과 스트림을 열기 직전에 확인합니다.
+
+secrets.toml 설정 예:
+    LLM_MAX_CONCURRENCY = 4
+    LLM_RPM = 60
+    LLM_TPM = 1000000
+    LLM_MAX_RETRIES = 4
+"""
+import itertools
+import logging
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Generator, Iterable
+
+from modules.settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+# ── 기본 설정 ───────────────────────────────────────────────
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_RPM = 60
+DEFAULT_TPM = 1_000_000
+DEFAULT_MAX_RETRIES = 4
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+
+# 세션을 지정하지 않은 호출(참고자료 OCR 등)의 대기열 이름
+DEFAULT_SESSION = "system"
+
+# PDF 1페이지를 Gemini에 보낼 때 소비되는 입력 토큰 수
+PDF_PAGE_TOKENS = 258
+
+# 재시도 대상 오류 표시 (HTTP 상태 코드 / gRPC 상태명)
+RETRYABLE_CODES = (429, 500, 503, 504)
+RETRYABLE_MARKERS = ("429", "503", "RESOURCE_EXHAUSTED", "UNAVAILABLE", "DEADLINE_EXCEEDED", "overloaded")
+
+
+class CallCancelled(Exception):
+    """cancel 이벤트가 설정되어 호출을 시작하지 않았습니다."""
+
+
+def _check_cancel(cancel: threading.Event | None):
+    if cancel is not None and cancel.is_set():
+        raise CallCancelled("cancelled")
+
+
+def estimate_tokens(*texts: str) -> int:
+    """입력 토큰 수를 대략 추정합니다 (한글 위주 문서 기준 약 2자당 1토큰)."""
+    return max(1, sum(len(t or "") for t in texts) // 2)
+
+
+def is_retryable(error: Exception) -> bool:
+    """일시적 오류(한도 초과·과부하·일시 장애)인지 판별합니다."""
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    if isinstance(code, int) and code in RETRYABLE_CODES:
+        return True
+    message = f"{type(error).__name__} {error}"
+    return any(marker in message for marker in RETRYABLE_MARKERS)
+
+
+def backoff_delay(attempt: int) -> float:
+    """attempt번째 재시도 전 대기 시간 (full jitter 지수 백오프)."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+class _TokenBucket:
+    """분당 한도를 초당 보충량으로 환산한 토큰 버킷."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """amount를 꺼낼 수 있을 때까지 남은 시간(초). 0이면 즉시 가능."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        self.level -= min(amount, self.capacity)
+
+
+class LLMScheduler:
+    """동시 실행 상한 + RPM/TPM 토큰 버킷 + 세션별 라운드 로빈 대기열."""
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY, rpm: int = DEFAULT_RPM,
+                 tpm: int = DEFAULT_TPM, max_retries: int = DEFAULT_MAX_RETRIES):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.max_retries = max(0, int(max_retries))
+        self._requests = _TokenBucket(rpm)
+        self._tokens = _TokenBucket(tpm)
+        self._cond = threading.Condition()
+        self._queues: dict[str, deque] = {}
+        self._rotation: deque[str] = deque()
+        self._active = 0
+        self._paused_until = 0.0
+        self._ids = itertools.count(1)
+        self.admitted = 0
+        self.retries = 0
+        self.throttled = 0
+
+    # ── 대기열 ──
+    def _order(self) -> list[dict]:
+        """현재 입장 예정 순서 (라운드 로빈으로 세션 대기열을 번갈아 펼친 순서)."""
+        queues = [list(self._queues[s]) for s in self._rotation]
+        order = []
+        for depth in range(max((len(q) for q in queues), default=0)):
+            order.extend(q[depth] for q in queues if depth < len(q))
+        return order
+
+    def _position(self, ticket: dict) -> int:
+        for i, t in enumerate(self._order(), 1):
+            if t is ticket:
+                return i
+        return 0
+
+    def _remove(self, ticket: dict):
+        queue = self._queues[ticket["session"]]
+        queue.remove(ticket)
+        if not queue:
+            del self._queues[ticket["session"]]
+            self._rotation.remove(ticket["session"])
+
+    @contextmanager
+    def slot(self, session: str | None = None, est_tokens: int = 1,
+             on_wait: Callable[[int, int], None] | None = None, cancel: threading.Event | None = None):
+        """호출 1건의 입장 허가를 받을 때까지 대기합니다. with 블록이 끝나면 자리를 반납합니다.
+
+        Args:
+            session: 공정 대기열 키 (사건 ID 등). None이면 DEFAULT_SESSION
+            est_tokens: TPM 버킷에서 차감할 추정 입력 토큰 수
+            on_wait: 대기 중 순번이 바뀔 때마다 (순번, 전체 대기 수)로 호출되는 콜백
+            cancel: 설정되면 대기열에서 빠지고 CallCancelled를 일으킴 (대기 중 최대 1초 안에 반영)
+        """
+        session = session or DEFAULT_SESSION
+        ticket = {"id": next(self._ids), "session": session, "tokens": est_tokens, "since": time.time()}
+        last_reported = None
+        with self._cond:
+            if session not in self._queues:
+                self._queues[session] = deque()
+                self._rotation.append(session)
+            self._queues[session].append(ticket)
+            try:
+                while True:
+                    _check_cancel(cancel)
+                    now = time.monotonic()
+                    is_next = self._queues[self._rotation[0]][0] is ticket
+                    wait = 0.0
+                    if is_next and self._active < self.max_concurrency:
+                        wait = max(
+                            self._paused_until - now,
+                            self._requests.wait_time(1, now),
+                            self._tokens.wait_time(est_tokens, now),
+                        )
+                        if wait <= 0:
+                            break
+                        self.throttled += 1
+                    if on_wait is not None:
+                        position = (self._position(ticket), len(self._order()))
+                        if position != last_reported:
+                            last_reported = position
+                            # 콜백(화면 갱신 등)은 잠금 밖에서 — 다른 세션의 입장·반납을 막지 않도록.
+                            # 그 사이 상태가 바뀌었을 수 있으므로 대기하지 않고 다시 판단
+                            self._cond.release()
+                            try:
+                                on_wait(*position)
+                            except Exception as e:
+                                logger.warning("scheduler on_wait callback failed: %s", e)
+                            finally:
+                                self._cond.acquire()
+                            continue
+                    # 취소 이벤트는 조건 변수를 깨우지 않으므로 RPM/TPM 대기가 길어도 1초마다 확인
+                    self._cond.wait(timeout=min(wait, 1.0) if wait and cancel is not None else wait or 1.0)
+            except BaseException:
+                self._remove(ticket)
+                self._cond.notify_all()
+                raise
+
+            self._remove(ticket)
+            # 이번에 입장한 세션은 라운드 로빈 순서의 맨 뒤로
+            if session in self._queues:
+                self._rotation.remove(session)
+                self._rotation.append(session)
+            self._requests.take(1)
+            self._tokens.take(est_tokens)
+            self._active += 1
+            self.admitted += 1
+            self._cond.notify_all()
+
+        try:
+            yield ticket
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+    def pause(self, seconds: float):
+        """한도 초과 응답을 받았을 때 전체 입장을 잠시 멈춥니다."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    # ── 호출 래퍼 ──
+    def call(self, fn: Callable[[], object], session: str | None = None, est_tokens: int = 1,
+             on_wait: Callable[[int, int], None] | None = None, cancel: threading.Event | None = None):
+        """fn()을 입장 제어 하에 실행하고, 일시적 오류는 백오프 후 다시 대기열에 넣어 재시도합니다.
+        cancel이 설정되면 입장 전이나 fn() 호출 전에 CallCancelled를 일으킵니다."""
+        for attempt in itertools.count():
+            try:
+                with self.slot(session, est_tokens, on_wait, cancel):
+                    _check_cancel(cancel)
+                    return fn()
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                self._before_retry(attempt)
+
+    def stream(self, open_stream: Callable[[], Iterable], session: str | None = None, est_tokens: int = 1,
+               on_wait: Callable[[int, int], None] | None = None,
+               cancel: threading.Event | None = None) -> Generator:
+        """open_stream()이 반환하는 스트림을 입장 제어 하에 중계합니다.
+
+        스트리밍 동안 자리를 점유합니다. 재시도는 첫 청크를 받기 전의 오류에 대해서만 합니다
+        (이미 내보낸 출력이 중복되지 않도록). cancel이 설정되면 입장 전이나 스트림을 열기 전에
+        CallCancelled를 일으킵니다 (스트림을 연 뒤의 취소는 소비자가 읽기를 멈춰 처리).
+        """
+        for attempt in itertools.count():
+            yielded = False
+            try:
+                with self.slot(session, est_tokens, on_wait, cancel):
+                    _check_cancel(cancel)
+                    for item in open_stream():
+                        yielded = True
+                        yield item
+                return
+            except Exception as e:
+                if yielded or attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                self._before_retry(attempt)
+
+    def _before_retry(self, attempt: int):
+        delay = backoff_delay(attempt)
+        with self._cond:
+            self.retries += 1
+        self.pause(delay / 2)
+        time.sleep(delay)
+
+    # ── 상태 ──
+    def snapshot(self) -> dict:
+        """UI 표시용 현재 상태."""
+        with self._cond:
+            now = time.time()
+            waiting = [
+                {"session": t["session"], "position": i, "waited": now - t["since"]}
+                for i, t in enumerate(self._order(), 1)
+            ]
+            return {
+                "active": self._active,
+                "limit": self.max_concurrency,
+                "waiting": waiting,
+                "admitted": self.admitted,
+                "retries": self.retries,
+                "throttled": self.throttled,
+            }
+
+    def session_position(self, session: str) -> int:
+        """세션의 가장 앞선 대기 순번. 대기 중이 아니면 0."""
+        for entry in self.snapshot()["waiting"]:
+            if entry["session"] == session:
+                return entry["position"]
+        return 0
+
+
+_scheduler: LLMScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> LLMScheduler:
+    """프로세스 공용 스케줄러. 최초 호출 시 설정값으로 생성합니다."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = LLMScheduler(
+                    max_concurrency=int(get_setting("LLM_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)),
+                    rpm=int(get_setting("LLM_RPM", DEFAULT_RPM)),
+                    tpm=int(get_setting("LLM_TPM", DEFAULT_TPM)),
+                    max_retries=int(get_setting("LLM_MAX_RETRIES", DEFAULT_MAX_RETRIES)),
+                )
+    return _scheduler
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+LLM 호출 계측 모듈 - send_message / OCR 호출마다 대기 시간, 입장 후 첫 청크까지 시간(TTFT), 전체 시간,
+청크 수, 초당 글자 수, 입력·출력 토큰 수(usage metadata)를 기록합니다.
+기록은 단계(phase)와 사건 ID로 태그되어 data/llm_metrics.jsonl에 한 줄씩 추가됩니다.
+
+- 최근 SUMMARY_WINDOW건은 메모리에도 유지해 대시보드가 rerun마다 파일을 읽지 않습니다
+  (파일은 처음 한 번, 또는 다른 프로세스가 파일을 바꿨을 때만 끝에서부터 읽음).
+- 파일이 MAX_FILE_BYTES를 넘으면 llm_metrics.1.jsonl로 돌리고 새 파일에 씁니다 (이전 것 1개만 보관).
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from modules.report_model_router import record_latency
+
+PROJECT_ROOT = Path(__file__).parent.parent
+METRICS_FILE = PROJECT_ROOT / "data" / "llm_metrics.jsonl"
+ROTATED_FILE = METRICS_FILE.with_suffix(".1.jsonl")
+
+# 대시보드 요약에 사용할 최근 기록 수 상한
+SUMMARY_WINDOW = 2000
+MAX_FILE_BYTES = 16 * 1024 * 1024
+# 파일 끝에서 거꾸로 읽을 때 한 번에 읽는 크기
+TAIL_BLOCK = 64 * 1024
+
+_write_lock = threading.Lock()
+# 최근 기록 (오래된 것부터) + 그 시점의 파일 서명 (inode, 크기) — 서명이 다르면 파일에서 다시 읽음
+_recent: deque = deque(maxlen=SUMMARY_WINDOW)
+_recent_sig: tuple[int, int] | None = None
+
+
+class CallMeter:
+    """호출 1건의 계측기.
+
+    사용 예:
+        meter = CallMeter("drafting", model, case_id)
+        ... meter.admitted()  # 스케줄러 입장 시점
+        ... meter.chunk(text) # 청크 도착마다
+        meter.finish(usage)   # 완료 시 (오류면 error=)
+    """
+
+    def __init__(self, phase: str, model: str, case_id: str | None = None, kind: str = "stream"):
+        self.phase = phase
+        self.model = model
+        self.case_id = case_id or ""
+        self.kind = kind
+        self.started = time.perf_counter()
+        self.admitted_at = None
+        self.first_chunk_at = None
+        self.chunks = 0
+        self.chars = 0
+        self.finished = False
+
+    def admitted(self):
+        """스케줄러 입장 시점을 기록합니다 (재시도 시 마지막 입장 시점)."""
+        self.admitted_at = time.perf_counter()
+
+    def chunk(self, text: str):
+        if self.first_chunk_at is None:
+            self.first_chunk_at = time.perf_counter()
+        self.chunks += 1
+        self.chars += len(text or "")
+
+    def finish(self, usage: dict | None = None, error: str = "") -> dict | None:
+        """기록을 완성해 메트릭 로그에 추가합니다. 두 번째 호출부터는 무시합니다."""
+        if self.finished:
+            return None
+        self.finished = True
+        now = time.perf_counter()
+        duration = now - self.started
+        usage = usage or {}
+        admitted_at = self.admitted_at or self.started
+        # TTFT와 초당 글자 수는 입장 이후 기준 (대기열 시간은 queue_wait로 따로 기록)
+        generating = now - admitted_at
+        record = {
+            "ts": time.time(),
+            "phase": self.phase,
+            "case_id": self.case_id,
+            "model": self.model,
+            "kind": self.kind,
+            "queue_wait": round(admitted_at - self.started, 4),
+            "ttft": round(self.first_chunk_at - admitted_at, 4) if self.first_chunk_at else None,
+            "duration": round(duration, 4),
+            "chunks": self.chunks,
+            "chars": self.chars,
+            "chars_per_sec": round(self.chars / generating, 1) if generating > 0 and self.chars else 0.0,
+            "prompt_tokens": usage.get("prompt_tokens"),
+            "output_tokens": usage.get("output_tokens"),
+            "thinking_tokens": usage.get("thinking_tokens"),
+            "error": error,
+        }
+        record_latency(self.phase, self.model, duration)
+        append_metric(record)
+        return record
+
+
+def _file_sig() -> tuple[int, int] | None:
+    try:
+        stat = os.stat(METRICS_FILE)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_size
+
+
+def _tail_records(limit: int) -> list[dict]:
+    """파일 끝에서부터 거꾸로 읽어 마지막 limit건을 반환합니다 (파일 전체를 읽지 않음)."""
+    try:
+        with open(METRICS_FILE, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            data = b""
+            while pos > 0 and data.count(b"\n") <= limit:
+                step = min(TAIL_BLOCK, pos)
+                pos -= step
+                f.seek(pos)
+                data = f.read(step) + data
+    except OSError:
+        return []
+    lines = data.splitlines()
+    if pos > 0:
+        lines = lines[1:]  # 블록 경계에서 잘린 첫 줄
+    records = []
+    for line in lines[-limit:]:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+    return records
+
+
+def _rotate_if_large():
+    """파일이 MAX_FILE_BYTES를 넘으면 이전 파일로 돌립니다 (호출자가 _write_lock 보유)."""
+    try:
+        if METRICS_FILE.stat().st_size > MAX_FILE_BYTES:
+            os.replace(METRICS_FILE, ROTATED_FILE)
+    except OSError:
+        pass
+
+
+def append_metric(record: dict):
+    """메트릭 한 줄을 JSONL 로그에 추가합니다. 기록 실패는 호출을 방해하지 않습니다."""
+    global _recent_sig
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    try:
+        with _write_lock:
+            METRICS_FILE.parent.mkdir(parents=True, exist_ok=True)
+            _rotate_if_large()
+            before = _file_sig()
+            with open(METRICS_FILE, "a", encoding="utf-8") as f:
+                f.write(line)
+            # 메모리의 최근 기록이 파일과 맞았을 때만 이어 붙임 (아니면 다음 조회 때 파일에서 다시 읽음)
+            if _recent_sig is not None and _recent_sig == before:
+                _recent.append(record)
+                _recent_sig = _file_sig()
+            else:
+                _recent_sig = None
+    except OSError:
+        pass
+
+
+def load_metrics(since: float | None = None, limit: int = SUMMARY_WINDOW) -> list[dict]:
+    """최근 메트릭 기록을 불러옵니다 (오래된 것부터).
+
+    Args:
+        since: 이 시각(epoch 초) 이후 기록만
+        limit: 최대 기록 수 (파일 끝에서부터)
+    """
+    global _recent_sig
+    if limit > SUMMARY_WINDOW:
+        records = _tail_records(limit)
+    else:
+        with _write_lock:
+            sig = _file_sig()
+            if sig is None:
+                _recent.clear()
+                _recent_sig = None
+                return []
+            if sig != _recent_sig:
+                _recent.clear()
+                _recent.extend(_tail_records(SUMMARY_WINDOW))
+                _recent_sig = sig
+            records = list(_recent)[-limit:]
+    if since is not None:
+        records = [r for r in records if r.get("ts", 0) >= since]
+    return records
+
+
+def percentile(values: list[float], q: float) -> float | None:
+    """q(0~100) 백분위수 (선형 보간). 값이 없으면 None."""
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+    pos = (len(values) - 1) * q / 100
+    lower = int(pos)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (pos - lower)
+
+
+def summarize(records: list[dict]) -> list[dict]:
+    """단계별 p50/p95 요약.
+
+    Returns:
+        [{"phase", "count", "errors", "ttft_p50", "ttft_p95", "duration_p50", "duration_p95",
+          "cps_p50", "prompt_tokens", "output_tokens"}, ...] (호출 수 내림차순)
+    """
+    by_phase: dict[str, list[dict]] = {}
+    for r in records:
+        by_phase.setdefault(r.get("phase", "default"), []).append(r)
+
+    rows = []
+    for phase, items in by_phase.items():
+        ok = [r for r in items if not r.get("error")]
+        ttft = [r["ttft"] for r in ok]
+        duration = [r["duration"] for r in ok]
+        cps = [r["chars_per_sec"] for r in ok if r.get("chars_per_sec")]
+        rows.append({
+            "phase": phase,
+            "count": len(items),
+            "errors": len(items) - len(ok),
+            "ttft_p50": percentile(ttft, 50),
+            "ttft_p95": percentile(ttft, 95),
+            "duration_p50": percentile(duration, 50),
+            "duration_p95": percentile(duration, 95),
+            "cps_p50": percentile(cps, 50),
+            "prompt_tokens": sum(r.get("prompt_tokens") or 0 for r in items),
+            "output_tokens": sum(r.get("output_tokens") or 0 for r in items),
+        })
+    rows.sort(key=lambda r: r["count"], reverse=True)
+    return rows
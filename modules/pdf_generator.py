@@ -6,7 +6,9 @@ tkinter 의존성 없이 독립적으로 동작하며, PDF bytes를 반환합니
 import json
 from pathlib import Path
 
-import fitz  # PyMuPDF
+from modules.lazy import lazy_import
+
+fitz = lazy_import("fitz")  # PyMuPDF — 첫 사용 시 import
 
 # ── 경로 설정 ──────────────────────────────────────────────
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+PDF 미리보기 모듈 - 생성된 PDF를 다운로드하지 않고 화면에서 확인할 수 있도록 쪽 이미지를 만듭니다.
+
+- 전용 작업 스레드 1개가 PyMuPDF로 렌더링합니다 (PyMuPDF는 한 문서를 여러 스레드에서 동시에 다룰 수 없음).
+  요청 처리 스레드는 큐에 넣고 캐시만 읽습니다.
+- 썸네일은 저해상도(THUMB_DPI)로 모든 쪽을, 확대 이미지는 사용자가 고른 쪽만 ZOOM_DPI로 만듭니다.
+  확대 요청은 썸네일보다 먼저 처리됩니다.
+- 이미지는 (문서 내용 해시, 쪽, DPI) 키로 프로세스 전체에서 공유하며 용량 상한을 넘으면 오래된 것부터 지웁니다.
+- show_pdf_preview()는 완성된 썸네일부터 보여 주고, 모두 끝날 때까지 미리보기 영역만(fragment) 주기적으로 다시 그립니다.
+
+secrets.toml 설정 예:
+    PREVIEW_CACHE_MB = 64
+"""
+import hashlib
+import itertools
+import logging
+import queue
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+
+from modules.lazy import lazy_import
+from modules.settings import get_setting
+
+fitz = lazy_import("fitz")  # PyMuPDF — 첫 렌더링 때 import
+
+logger = logging.getLogger(__name__)
+
+THUMB_DPI = 40
+ZOOM_DPI = 150
+DEFAULT_CACHE_MB = 64
+# 확대 이미지를 기다리는 최대 시간 (초)
+ZOOM_TIMEOUT = 10.0
+# 썸네일이 덜 끝났을 때 미리보기 영역을 다시 그리는 간격 (초)
+POLL_SECONDS = 0.5
+THUMBS_PER_ROW = 4
+# 쪽 수·오류를 기억할 문서 수
+MAX_DOCS = 64
+
+# 작업 우선순위 (작을수록 먼저)
+ZOOM_PRIORITY = 0
+THUMB_PRIORITY = 1
+
+_images: "OrderedDict[tuple, bytes]" = OrderedDict()
+_images_bytes = 0
+# 문서 해시 → {"pages": 쪽 수 | None, "error": 열기·썸네일 실패 메시지 (확대 실패는 기록하지 않음)}
+_docs: "OrderedDict[str, dict]" = OrderedDict()
+# 큐에 있거나 렌더링 중인 (문서, 쪽, DPI) → 완료 이벤트
+_pending: dict[tuple, threading.Event] = {}
+_lock = threading.Lock()
+_queue: "queue.PriorityQueue[tuple]" = queue.PriorityQueue()
+_seq = itertools.count()
+_worker: threading.Thread | None = None
+
+
+def _budget_bytes() -> int:
+    return int(float(get_setting("PREVIEW_CACHE_MB", DEFAULT_CACHE_MB)) * 1024 * 1024)
+
+
+def document_key(pdf_bytes: bytes) -> str:
+    """문서 내용 해시 (캐시 키)."""
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+def _remember(key: tuple, png: bytes):
+    global _images_bytes
+    budget = _budget_bytes()
+    if len(png) > budget // 4:
+        return
+    with _lock:
+        if key in _images:
+            return
+        _images[key] = png
+        _images_bytes += len(png)
+        while _images_bytes > budget and _images:
+            _, old = _images.popitem(last=False)
+            _images_bytes -= len(old)
+
+
+def _cached(key: tuple) -> bytes | None:
+    with _lock:
+        png = _images.get(key)
+        if png is not None:
+            _images.move_to_end(key)
+        return png
+
+
+def _doc_state(doc: str) -> dict:
+    """문서 상태 항목 (호출자가 _lock 보유)."""
+    state = _docs.get(doc)
+    if state is None:
+        state = _docs[doc] = {"pages": None, "error": ""}
+        while len(_docs) > MAX_DOCS:
+            _docs.popitem(last=False)
+    else:
+        _docs.move_to_end(doc)
+    return state
+
+
+def _enqueue(priority: int, doc: str, page: int | None, dpi: int, pdf_bytes: bytes) -> threading.Event:
+    """렌더링 작업을 큐에 넣습니다. 같은 작업이 이미 있으면 그 완료 이벤트를 반환합니다.
+    page=None은 문서를 열어 쪽 수를 알아낸 뒤 모든 쪽의 썸네일 작업을 넣는 작업입니다."""
+    global _worker
+    task = (doc, page, dpi)
+    with _lock:
+        event = _pending.get(task)
+        if event is not None:
+            return event
+        event = _pending[task] = threading.Event()
+        if _worker is None:
+            _worker = threading.Thread(target=_work, name="pdf-preview", daemon=True)
+            _worker.start()
+    _queue.put((priority, next(_seq), task, pdf_bytes))
+    return event
+
+
+def _work():
+    open_key, open_doc = None, None
+    while True:
+        _, _, task, pdf_bytes = _queue.get()
+        doc, page, dpi = task
+        try:
+            if open_key != doc:
+                if open_doc is not None:
+                    open_doc.close()
+                open_key, open_doc = None, None
+                open_doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+                open_key = doc
+            if page is None:
+                with _lock:
+                    _doc_state(doc)["pages"] = open_doc.page_count
+                for n in range(open_doc.page_count):
+                    _enqueue(THUMB_PRIORITY, doc, n, THUMB_DPI, pdf_bytes)
+            elif _cached(task) is None:
+                pix = open_doc[page].get_pixmap(dpi=dpi)
+                _remember(task, pix.tobytes("png"))
+        except Exception as e:
+            # 확대 이미지 실패는 그 요청만 실패 (render_zoom이 None) — 문서 전체를 실패로 표시하지 않음
+            if page is None or dpi == THUMB_DPI:
+                with _lock:
+                    _doc_state(doc)["error"] = str(e) or type(e).__name__
+            logger.warning("pdf preview %s page %s @%sdpi failed: %s", doc[:12], page, dpi, e)
+        finally:
+            with _lock:
+                event = _pending.pop(task, None)
+            if event is not None:
+                event.set()
+
+
+def request_thumbnails(pdf_bytes: bytes) -> str:
+    """모든 쪽의 썸네일 렌더링을 요청하고(이미 있거나 진행 중인 쪽은 건너뜀) 문서 키를 반환합니다."""
+    doc = document_key(pdf_bytes)
+    with _lock:
+        pages = _doc_state(doc)["pages"]
+    if pages is None:
+        _enqueue(THUMB_PRIORITY, doc, None, THUMB_DPI, pdf_bytes)
+        return doc
+    for page in range(pages):
+        if _cached((doc, page, THUMB_DPI)) is None:
+            _enqueue(THUMB_PRIORITY, doc, page, THUMB_DPI, pdf_bytes)
+    return doc
+
+
+def thumbnail_state(doc: str) -> dict:
+    """썸네일 진행 상황 (렌더링하지 않음).
+
+    Returns:
+        {"pages": 쪽 수 | None(아직 모름), "thumbs": [PNG bytes | None, ...], "done": 모두 준비됨, "error": 오류 메시지}
+    """
+    with _lock:
+        state = dict(_docs.get(doc) or {"pages": None, "error": ""})
+    thumbs = [_cached((doc, page, THUMB_DPI)) for page in range(state["pages"] or 0)]
+    done = bool(state["error"]) or (state["pages"] is not None and all(t is not None for t in thumbs))
+    return {"pages": state["pages"], "thumbs": thumbs, "done": done, "error": state["error"]}
+
+
+def render_zoom(pdf_bytes: bytes, page: int, dpi: int = ZOOM_DPI, timeout: float = ZOOM_TIMEOUT) -> bytes | None:
+    """한 쪽을 고해상도로 렌더링합니다 (캐시 우선, 썸네일 작업보다 먼저 처리). 실패했거나 시간 안에 못 끝나면 None."""
+    doc = document_key(pdf_bytes)
+    png = _cached((doc, page, dpi))
+    if png is None:
+        _enqueue(ZOOM_PRIORITY, doc, page, dpi, pdf_bytes).wait(timeout)
+        png = _cached((doc, page, dpi))
+    return png
+
+
+def cache_info() -> dict:
+    """{"entries", "bytes", "budget"}"""
+    with _lock:
+        return {"entries": len(_images), "bytes": _images_bytes, "budget": _budget_bytes()}
+
+
+def show_pdf_preview(pdf_bytes: bytes, key: str):
+    """PDF 미리보기: 저해상도 썸네일 격자 + 고른 쪽 확대 보기.
+
+    썸네일이 다 준비될 때까지는 이 영역만 POLL_SECONDS마다 다시 그리고, 끝나면 한 번 전체를 다시 그려 멈춥니다.
+
+    Args:
+        key: 페이지 안에서 미리보기를 구분하는 이름 (위젯 키 접두어)
+    """
+    doc = request_thumbnails(pdf_bytes)
+    polling = not thumbnail_state(doc)["done"]
+
+    @st.fragment(run_every=POLL_SECONDS if polling else None, key=f"{key}_preview")
+    def preview():
+        request_thumbnails(pdf_bytes)
+        state = thumbnail_state(doc)
+        if state["error"]:
+            st.warning(f"미리보기를 만들 수 없습니다: {state['error']}")
+            return
+        if state["pages"] is None:
+            st.caption("미리보기 준비 중…")
+            return
+        if polling and state["done"]:
+            st.rerun(scope="app")
+
+        ready = sum(t is not None for t in state["thumbs"])
+        st.caption(f"{state['pages']}쪽" + ("" if state["done"] else f" · 미리보기 {ready}/{state['pages']}"))
+        for row in range(0, state["pages"], THUMBS_PER_ROW):
+            cols = st.columns(THUMBS_PER_ROW)
+            for page, col in zip(range(row, min(row + THUMBS_PER_ROW, state["pages"])), cols):
+                with col:
+                    if state["thumbs"][page] is not None:
+                        st.image(state["thumbs"][page], caption=f"{page + 1}쪽", width="stretch")
+                    else:
+                        st.caption(f"{page + 1}쪽 준비 중…")
+
+        zoom_page = st.selectbox(
+            "확대해서 보기", [None, *range(state["pages"])],
+            format_func=lambda p: "선택 안 함" if p is None else f"{p + 1}쪽",
+            key=f"{key}_zoom",
+        )
+        if zoom_page is not None:
+            with st.spinner(f"{zoom_page + 1}쪽 확대 이미지를 만드는 중…"):
+                png = render_zoom(pdf_bytes, zoom_page)
+            if png is None:
+                st.warning("확대 이미지를 만들지 못했습니다. 잠시 후 다시 선택해 주세요.")
+            else:
+                st.image(png, caption=f"{zoom_page + 1}쪽 ({ZOOM_DPI} DPI)", width="stretch")
+
+    preview()
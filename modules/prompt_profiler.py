@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+프롬프트 프로파일러 - AI 호출 직전에 요청을 세그먼트(프롬프트 MD 파일, 참고자료 PDF, 입력 폼,
+첨부자료, 대화 메시지)별로 나누어 글자 수와 추정 토큰 수를 집계합니다.
+어느 부분이 요청을 무겁게 만드는지 확인하고, 설정된 토큰 예산을 넘으면 경고합니다.
+
+secrets.toml 설정 예:
+    PROMPT_TOKEN_BUDGET = 150000
+"""
+import logging
+
+from modules.llm_scheduler import estimate_tokens
+from modules.settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOKEN_BUDGET = 200_000
+
+GROUP_LABELS = {
+    "prompt_file": "프롬프트 파일",
+    "reference": "참고자료",
+    "form": "입력 폼·지시",
+    "attachment": "첨부자료",
+    "history": "대화",
+}
+
+
+def get_token_budget() -> int:
+    """요청당 추정 입력 토큰 예산 (설정 PROMPT_TOKEN_BUDGET)."""
+    return int(get_setting("PROMPT_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET))
+
+
+def _row(group: str, name: str, text: str) -> dict:
+    return {"group": group, "name": name, "chars": len(text), "tokens": estimate_tokens(text) if text else 0}
+
+
+def profile_prompt(system_segments: list[dict], messages: list[dict],
+                   attachments: list[str] | None = None, attachment_names: list[str] | None = None) -> dict:
+    """요청의 세그먼트별 크기를 집계합니다.
+
+    Args:
+        system_segments: report_prompt_builder.load_prompt_segments() 형식의 시스템 프롬프트 세그먼트
+        messages: 전송할 대화 히스토리
+        attachments: 첫 user 메시지에 포함된 첨부자료 텍스트 (첨부자료를 별도 세그먼트로 분리)
+        attachment_names: 첨부자료 표시 이름
+
+    Returns:
+        {"rows": [{"group", "name", "chars", "tokens", "share"}], "total_chars", "total_tokens",
+         "budget", "over_budget", "groups": {group: tokens}}
+    """
+    rows = [_row(seg["kind"], seg["name"], seg["text"]) for seg in system_segments]
+
+    names = attachment_names or []
+    for i, msg in enumerate(messages):
+        content = msg["content"]
+        if i == 0 and attachments:
+            for j, text in enumerate(attachments):
+                if text and text in content:
+                    name = names[j] if j < len(names) else f"첨부자료 {j + 1}"
+                    rows.append(_row("attachment", name, text))
+                    content = content.replace(text, "", 1)
+            rows.append(_row("form", "자료입력 메시지", content))
+        else:
+            role = "AI" if msg["role"] in ("model", "assistant") else "사용자"
+            rows.append(_row("history", f"#{i + 1} {role}", content))
+
+    total_tokens = sum(r["tokens"] for r in rows)
+    for r in rows:
+        r["share"] = r["tokens"] / total_tokens if total_tokens else 0.0
+
+    groups: dict[str, int] = {}
+    for r in rows:
+        groups[r["group"]] = groups.get(r["group"], 0) + r["tokens"]
+
+    budget = get_token_budget()
+    return {
+        "rows": rows,
+        "total_chars": sum(r["chars"] for r in rows),
+        "total_tokens": total_tokens,
+        "budget": budget,
+        "over_budget": total_tokens > budget,
+        "groups": groups,
+    }
+
+
+def log_profile(profile: dict, label: str):
+    """프로파일 요약을 로그로 남깁니다. 예산 초과 시 warning 레벨."""
+    top = sorted(profile["rows"], key=lambda r: r["tokens"], reverse=True)[:5]
+    summary = ", ".join(f"{r['name']}={r['tokens']:,}" for r in top)
+    level = logging.WARNING if profile["over_budget"] else logging.INFO
+    logger.log(
+        level,
+        "prompt profile [%s]: ~%d tokens (%d chars, budget %d) top: %s",
+        label, profile["total_tokens"], profile["total_chars"], profile["budget"], summary,
+    )
@@ -1,16 +1,26 @@
 # -*- coding: utf-8 -*-
 """
 Gemini AI 클라이언트 모듈 - Google Gemini API를 사용하여 손해사정 보고서를 생성합니다.
+실제 호출은 llm_backends의 백엔드(live/record/replay/stub)가 담당합니다.
 """
 import base64
-from typing import Generator
+import threading
+from typing import Callable, Generator
 
-import fitz  # PyMuPDF
-import streamlit as st
-from google import genai
-from google.genai import types
+from modules.lazy import lazy_import
+from modules.llm_backends import get_backend, make_request, needs_api_key
+from modules.llm_scheduler import PDF_PAGE_TOKENS, estimate_tokens, get_scheduler
+from modules.llm_telemetry import CallMeter
+from modules.report_model_router import get_route
 
-# 기본 모델 설정
+# 무거운 의존성은 첫 사용 시 import (페이지 첫 렌더링을 막지 않도록)
+fitz = lazy_import("fitz")  # PyMuPDF
+st = lazy_import("streamlit")
+
+# OCR 지시문
+OCR_INSTRUCTION = "이 PDF 문서의 모든 텍스트를 원문 그대로 추출해주세요. 추가 설명 없이 문서 내용만 출력하세요."
+
+# 기본 모델 설정 (단계 미지정 호출용)
 DEFAULT_MODEL = "gemini-2.5-flash"
 DEFAULT_MAX_TOKENS = 65536
 
@@ -26,8 +36,10 @@ def get_api_key() -> str | None:
         return _DEFAULT_KEY
 
 
-def get_client(api_key: str | None = None) -> genai.Client:
+def get_client(api_key: str | None = None) -> "genai.Client":
     """Gemini API 클라이언트를 생성합니다."""
+    from google import genai
+
     key = api_key or get_api_key()
     if not key:
         raise ValueError("Gemini API 키가 설정되지 않았습니다.")
@@ -38,9 +50,15 @@ def send_message(
     system_prompt: str,
     messages: list[dict],
     api_key: str | None = None,
-    model: str = DEFAULT_MODEL,
-    max_tokens: int = DEFAULT_MAX_TOKENS,
+    model: str | None = None,
+    max_tokens: int | None = None,
     stream: bool = True,
+    step: str | None = None,
+    temperature: float | None = None,
+    response_schema: dict | None = None,
+    session: str | None = None,
+    on_wait: Callable[[int, int], None] | None = None,
+    cancel: threading.Event | None = None,
 ) -> Generator[str, None, None] | str:
     """Gemini API로 메시지를 전송합니다.
 
@@ -48,59 +66,127 @@ def send_message(
         system_prompt: 시스템 프롬프트 (MD 파일 통합본)
         messages: 대화 히스토리 [{"role": "user"|"model", "content": "..."}]
         api_key: API 키 (None이면 secrets에서 로드)
-        model: 사용할 모델명
-        max_tokens: 최대 토큰 수
+        model: 사용할 모델명 (None이면 단계 라우팅 → 기본 모델)
+        max_tokens: 최대 토큰 수 (None이면 단계 라우팅 → 기본값)
         stream: 스트리밍 여부
+        step: 작업 단계 (report_model_router.STEPS 중 하나). 라우팅과 호출 계측 태그에 사용
+        temperature: 샘플링 온도 (None이면 단계 라우팅 → 0.3)
+        response_schema: 지정 시 JSON 응답 모드로 호출 (Gemini response_schema 형식)
+        session: 스케줄러 공정 대기열 키 겸 계측 태그 (사건 ID 등)
+        on_wait: 스케줄러 대기 중 (순번, 전체 대기 수)를 받는 콜백
+        cancel: 설정되면 스케줄러 입장·호출 시작 전에 llm_scheduler.CallCancelled로 중단
 
     Returns:
         스트리밍 시 Generator[str], 아닐 시 str
     """
-    client = get_client(api_key)
-
-    # 대화 히스토리를 Gemini 형식으로 변환
-    contents = []
-    for msg in messages:
-        role = msg["role"]
-        # Gemini는 "user"와 "model" 역할만 사용
-        if role == "assistant":
-            role = "model"
-        contents.append(
-            types.Content(
-                role=role,
-                parts=[types.Part.from_text(text=msg["content"])],
-            )
-        )
-
-    config = types.GenerateContentConfig(
-        system_instruction=system_prompt,
-        max_output_tokens=max_tokens,
-        temperature=0.3,
-    )
+    route = get_route(step) if step else {
+        "model": DEFAULT_MODEL, "max_tokens": DEFAULT_MAX_TOKENS, "temperature": 0.3,
+    }
+    model = model or route["model"]
+    max_tokens = max_tokens or route["max_tokens"]
+    temperature = route["temperature"] if temperature is None else temperature
+
+    config = {"max_output_tokens": max_tokens, "temperature": temperature}
+    if response_schema is not None:
+        config["response_mime_type"] = "application/json"
+        config["response_schema"] = response_schema
+    request = make_request(model, system_prompt, messages, config)
+    backend = get_backend()
+    key = _resolve_key(api_key)
+
+    # 모든 호출은 공용 스케줄러(동시 실행 상한·RPM/TPM·공정 대기열·재시도)를 거칩니다
+    scheduler = get_scheduler()
+    est_tokens = estimate_tokens(system_prompt, *(m["content"] for m in messages))
+
+    # 호출 계측 (TTFT·처리량·토큰 수 → data/llm_metrics.jsonl)
+    meter = CallMeter(step or "default", model, session, kind="stream" if stream else "generate")
+    usage = {}
+
+    def _admitted(call):
+        meter.admitted()
+        return call()
 
     if stream:
-        # 제너레이터 안에서 클라이언트를 직접 사용하여 닫힘 방지
         def _stream_generator():
-            c = genai.Client(api_key=api_key or get_api_key())
-            response_stream = c.models.generate_content_stream(
-                model=model,
-                contents=contents,
-                config=config,
-            )
-            for chunk in response_stream:
-                if chunk.text:
-                    yield chunk.text
+            error = ""
+            try:
+                for chunk in scheduler.stream(
+                    lambda: _admitted(lambda: backend.stream(request, key, usage)),
+                    session=session, est_tokens=est_tokens, on_wait=on_wait, cancel=cancel,
+                ):
+                    meter.chunk(chunk)
+                    yield chunk
+            except GeneratorExit:
+                error = "cancelled"
+                raise
+            except Exception as e:
+                error = str(e)
+                raise
+            finally:
+                meter.finish(usage, error=error)
 
         return _stream_generator()
     else:
-        response = client.models.generate_content(
-            model=model,
-            contents=contents,
-            config=config,
-        )
-        return response.text
+        error = ""
+        try:
+            text = scheduler.call(
+                lambda: _admitted(lambda: backend.generate(request, key, usage)),
+                session=session, est_tokens=est_tokens, on_wait=on_wait, cancel=cancel,
+            )
+            meter.chunk(text)
+            return text
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            meter.finish(usage, error=error)
+
+
+def _resolve_key(api_key: str | None) -> str:
+    """실제 API를 호출하는 모드에서만 키를 요구합니다 (replay/stub은 키 없이 동작)."""
+    key = api_key or get_api_key()
+    if not key and needs_api_key():
+        raise ValueError("Gemini API 키가 설정되지 않았습니다.")
+    return key or ""
+
+
+def ocr_pdf(pdf_bytes: bytes, page_count: int = 1, api_key: str | None = None,
+            session: str | None = None) -> str:
+    """Gemini에 PDF 파일을 직접 전송하여 텍스트를 추출합니다 (1회 API 호출, 스케줄러 경유).
+
+    Raises:
+        Exception: API 호출 실패 (재시도 후에도 실패한 경우)
+    """
+    route = get_route("extraction")
+    request = make_request(
+        route["model"],
+        "",
+        [{"role": "user", "content": OCR_INSTRUCTION}],
+        {"max_output_tokens": route["max_tokens"], "temperature": route["temperature"]},
+        attachments=[{"mime_type": "application/pdf", "data": pdf_bytes}],
+    )
+    backend = get_backend()
+    key = _resolve_key(api_key)
+    meter = CallMeter("extraction", route["model"], session, kind="ocr")
+    usage = {}
+
+    def _call():
+        meter.admitted()
+        return backend.generate(request, key, usage)
+
+    error = ""
+    try:
+        text = get_scheduler().call(_call, session=session, est_tokens=max(1, page_count) * PDF_PAGE_TOKENS)
+        meter.chunk(text)
+        return text
+    except Exception as e:
+        error = str(e)
+        raise
+    finally:
+        meter.finish(usage, error=error)
 
 
-def extract_text_from_pdf(pdf_bytes: bytes) -> str:
+def extract_text_from_pdf(pdf_bytes: bytes, session: str | None = None) -> str:
     """PDF에서 텍스트를 추출합니다. PyMuPDF 실패 시 Gemini에 PDF 직접 전송 (1회 호출)."""
     doc = fitz.open(stream=pdf_bytes, filetype="pdf")
 
@@ -109,6 +195,7 @@ def extract_text_from_pdf(pdf_bytes: bytes) -> str:
     for page in doc:
         raw_texts.append(page.get_text())
     raw = "\n".join(raw_texts)
+    page_count = doc.page_count
     doc.close()
 
     # 한글이 충분히 포함되어 있으면 PyMuPDF 결과 사용
@@ -118,19 +205,6 @@ def extract_text_from_pdf(pdf_bytes: bytes) -> str:
 
     # 한글 추출 실패 → Gemini에 PDF 파일 직접 전송 (1회 API 호출)
     try:
-        client = genai.Client(api_key=get_api_key())
-        response = client.models.generate_content(
-            model=DEFAULT_MODEL,
-            contents=[
-                types.Content(role="user", parts=[
-                    types.Part.from_bytes(data=pdf_bytes, mime_type="application/pdf"),
-                    types.Part.from_text(
-                        text="이 PDF 문서의 모든 텍스트를 원문 그대로 추출해주세요. "
-                             "추가 설명 없이 문서 내용만 출력하세요."
-                    ),
-                ])
-            ],
-        )
-        return response.text
+        return ocr_pdf(pdf_bytes, page_count, session=session)
     except Exception as e:
         return f"[PDF 텍스트 추출 실패: {e}]"
@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+"""
+보고서 작업(job) 모듈 - 초안·수정 생성을 Streamlit 스크립트 실행과 분리된 서버 측 워커 스레드에서 실행합니다.
+스트리밍 출력은 주기적으로 SQLite 작업 저장소에 체크포인트되므로, 새로고침·연결 끊김 후에도
+같은 case ID로 돌아온 페이지가 진행 중이거나 완료된 작업에 다시 붙을 수 있습니다.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Generator
+
+from modules.llm_scheduler import CallCancelled
+from modules.report_ai_client import send_message
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DATA_DIR = PROJECT_ROOT / "data"
+DB_PATH = DATA_DIR / "report_jobs.sqlite3"
+
+# 체크포인트 주기: 1초 또는 새 텍스트 4000자마다
+CHECKPOINT_INTERVAL = 1.0
+CHECKPOINT_CHARS = 4000
+
+# 중단된 작업을 이어서 작성할 때 보내는 지시
+CONTINUE_INSTRUCTION = (
+    "직전 응답이 중간에 끊겼습니다. 이미 작성한 부분을 반복하지 말고, "
+    "끊긴 지점 바로 다음 글자부터 이어서 끝까지 작성하세요."
+)
+
+# 상태: queued → running → done | failed | cancelled
+# 서버 재시작으로 워커가 사라진 running/queued 작업은 interrupted로 표시됩니다.
+FINISHED = ("done", "failed", "cancelled", "interrupted")
+
+_init_lock = threading.Lock()
+_initialized = False
+
+# 이 프로세스에서 실행 중인 작업의 실시간 버퍼 {job_id: {"chunks": [...], "cond": Condition, "cancel": Event}}
+_live: dict[str, dict] = {}
+_live_lock = threading.Lock()
+
+
+def _connect() -> sqlite3.Connection:
+    """DB 연결을 엽니다. 프로세스 최초 호출 시 스키마를 만들고 고아 작업을 정리합니다."""
+    global _initialized
+    if not _initialized:
+        with _init_lock:
+            if not _initialized:
+                DATA_DIR.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(DB_PATH, timeout=30)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS jobs ("
+                    " job_id TEXT PRIMARY KEY,"
+                    " case_id TEXT NOT NULL,"
+                    " kind TEXT NOT NULL,"
+                    " fingerprint TEXT NOT NULL,"
+                    " status TEXT NOT NULL,"
+                    " output TEXT NOT NULL DEFAULT '',"
+                    " error TEXT NOT NULL DEFAULT '',"
+                    " request TEXT NOT NULL DEFAULT '',"
+                    " created_at REAL NOT NULL,"
+                    " updated_at REAL NOT NULL)"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_case ON jobs (case_id, kind, created_at)")
+                # 이전 프로세스에서 실행 중이던 작업은 워커가 없으므로 중단 처리
+                conn.execute(
+                    "UPDATE jobs SET status = 'interrupted', updated_at = ? "
+                    "WHERE status IN ('queued', 'running')",
+                    (time.time(),),
+                )
+                conn.commit()
+                conn.close()
+                _initialized = True
+    return sqlite3.connect(DB_PATH, timeout=30)
+
+
+def request_fingerprint(kind: str, messages: list[dict]) -> str:
+    """작업 종류 + 대화 히스토리의 해시. 같은 요청의 작업을 찾는 데 사용합니다."""
+    h = hashlib.sha256(kind.encode("utf-8"))
+    h.update(json.dumps(messages, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _row_to_job(row) -> dict:
+    keys = ("job_id", "case_id", "kind", "fingerprint", "status", "output", "error", "request",
+            "created_at", "updated_at")
+    job = dict(zip(keys, row))
+    job["request"] = json.loads(job["request"]) if job["request"] else {}
+    return job
+
+
+def _update(job_id: str, **fields):
+    fields["updated_at"] = time.time()
+    assignments = ", ".join(f"{k} = ?" for k in fields)
+    conn = _connect()
+    try:
+        conn.execute(f"UPDATE jobs SET {assignments} WHERE job_id = ?", (*fields.values(), job_id))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def get_job(job_id: str) -> dict | None:
+    """작업 레코드를 반환합니다. 없으면 None."""
+    conn = _connect()
+    try:
+        row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+    finally:
+        conn.close()
+    return _row_to_job(row) if row else None
+
+
+def find_job(case_id: str, kind: str, fingerprint: str | None = None) -> dict | None:
+    """사건의 가장 최근 작업을 찾습니다. fingerprint를 주면 같은 요청의 작업만 찾습니다.
+
+    실패·취소된 작업은 제외합니다.
+    """
+    sql = "SELECT * FROM jobs WHERE case_id = ? AND kind = ? AND status NOT IN ('failed', 'cancelled')"
+    params = [case_id, kind]
+    if fingerprint:
+        sql += " AND fingerprint = ?"
+        params.append(fingerprint)
+    sql += " ORDER BY created_at DESC LIMIT 1"
+    conn = _connect()
+    try:
+        row = conn.execute(sql, params).fetchone()
+    finally:
+        conn.close()
+    return _row_to_job(row) if row else None
+
+
+def _run_job(job_id: str, system_prompt: str, messages: list[dict], api_key: str | None,
+             step: str, prefix: str):
+    """워커 스레드 본체: 스트림을 받아 실시간 버퍼에 쌓고 주기적으로 체크포인트합니다."""
+    live = _live[job_id]
+    output = prefix
+    last_checkpoint = time.perf_counter()
+    pending = 0
+    stream = None
+    try:
+        _update(job_id, status="running")
+        case_id = get_job(job_id)["case_id"]
+        # 취소는 대기열에서 기다리는 동안에도 반영 (입장·호출 전에 CallCancelled)
+        stream = send_message(system_prompt, messages, api_key=api_key, stream=True, step=step, session=case_id,
+                              cancel=live["cancel"])
+        for chunk in stream:
+            if live["cancel"].is_set():
+                break
+            output += chunk
+            pending += len(chunk)
+            with live["cond"]:
+                live["chunks"].append(chunk)
+                live["cond"].notify_all()
+            if pending >= CHECKPOINT_CHARS or time.perf_counter() - last_checkpoint >= CHECKPOINT_INTERVAL:
+                _update(job_id, output=output)
+                last_checkpoint = time.perf_counter()
+                pending = 0
+        status = "cancelled" if live["cancel"].is_set() else "done"
+        _update(job_id, status=status, output=output)
+    except CallCancelled:
+        _update(job_id, status="cancelled", output=output)
+    except Exception as e:
+        _update(job_id, status="failed", output=output, error=str(e))
+    finally:
+        if stream is not None:
+            stream.close()
+        with live["cond"]:
+            live["done"] = True
+            live["cond"].notify_all()
+        with _live_lock:
+            _live.pop(job_id, None)
+
+
+def start_job(case_id: str, kind: str, system_prompt: str, messages: list[dict],
+              api_key: str | None = None, step: str = "drafting", prefix: str = "",
+              fingerprint: str | None = None) -> str:
+    """작업을 등록하고 워커 스레드를 시작합니다.
+
+    Args:
+        case_id: 사건 ID (페이지 재접속 시 작업을 찾는 키)
+        kind: 작업 종류 ("draft", "revision" 등)
+        system_prompt: 시스템 프롬프트
+        messages: 전송할 대화 히스토리
+        api_key: API 키 (워커 스레드에서 secrets 접근을 피하려면 명시 전달)
+        step: 모델 라우팅 단계
+        prefix: 출력 앞에 붙일 텍스트 (중단된 작업을 이어 쓸 때 기존 출력)
+        fingerprint: 작업 검색 키 (기본값: kind + messages 해시)
+
+    Returns:
+        job_id
+    """
+    job_id = uuid.uuid4().hex
+    now = time.time()
+    request = {"step": step}
+    conn = _connect()
+    try:
+        conn.execute(
+            "INSERT INTO jobs (job_id, case_id, kind, fingerprint, status, output, request, created_at, updated_at)"
+            " VALUES (?, ?, ?, ?, 'queued', ?, ?, ?, ?)",
+            (job_id, case_id, kind, fingerprint or request_fingerprint(kind, messages), prefix,
+             json.dumps(request), now, now),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    with _live_lock:
+        _live[job_id] = {
+            "chunks": [prefix] if prefix else [],
+            "cond": threading.Condition(),
+            "cancel": threading.Event(),
+            "done": False,
+        }
+    threading.Thread(
+        target=_run_job,
+        args=(job_id, system_prompt, [dict(m) for m in messages], api_key, step, prefix),
+        name=f"report-job-{kind}",
+        daemon=True,
+    ).start()
+    return job_id
+
+
+def resume_job(job: dict, system_prompt: str, messages: list[dict], api_key: str | None = None) -> str:
+    """중단된(interrupted) 작업을 기존 출력에 이어서 작성하는 새 작업을 시작합니다.
+
+    새 작업은 원래 작업과 같은 fingerprint를 가지므로 find_job으로 다시 찾을 수 있습니다.
+    """
+    continued = messages + [
+        {"role": "model", "content": job["output"]},
+        {"role": "user", "content": CONTINUE_INSTRUCTION},
+    ]
+    return start_job(
+        job["case_id"], job["kind"], system_prompt, continued, api_key=api_key,
+        step=job["request"].get("step", "drafting"), prefix=job["output"],
+        fingerprint=job["fingerprint"],
+    )
+
+
+def cancel_job(job_id: str):
+    """작업을 취소합니다. 이미 끝난 작업은 그대로 둡니다."""
+    with _live_lock:
+        live = _live.get(job_id)
+    if live:
+        live["cancel"].set()
+        return
+    job = get_job(job_id)
+    if job and job["status"] not in FINISHED:
+        _update(job_id, status="cancelled")
+
+
+def cancel_case_jobs(case_id: str, kind: str | None = None):
+    """사건의 진행 중인 작업을 모두 취소합니다."""
+    sql = "SELECT job_id FROM jobs WHERE case_id = ? AND status IN ('queued', 'running')"
+    params = [case_id]
+    if kind:
+        sql += " AND kind = ?"
+        params.append(kind)
+    conn = _connect()
+    try:
+        job_ids = [r[0] for r in conn.execute(sql, params).fetchall()]
+    finally:
+        conn.close()
+    for job_id in job_ids:
+        cancel_job(job_id)
+
+
+def follow_job(job_id: str, poll_interval: float = 0.5) -> Generator[str, None, None]:
+    """작업 출력을 처음부터 스트리밍합니다. send_message(stream=True)와 같은 방식으로 사용합니다.
+
+    이 프로세스에서 실행 중인 작업은 실시간 버퍼를, 그 외에는 체크포인트된 출력을 따라갑니다.
+
+    Raises:
+        RuntimeError: 작업이 실패·취소·중단된 경우 (이미 전달한 출력 이후)
+    """
+    with _live_lock:
+        live = _live.get(job_id)
+
+    if live:
+        index = 0
+        while True:
+            with live["cond"]:
+                while index >= len(live["chunks"]) and not live["done"]:
+                    live["cond"].wait(timeout=poll_interval)
+                pending = live["chunks"][index:]
+                index = len(live["chunks"])
+                finished = live["done"]
+            yield from pending
+            if finished and index >= len(live["chunks"]):
+                break
+        sent = "".join(live["chunks"])
+    else:
+        sent = ""
+        while True:
+            job = get_job(job_id)
+            if job is None:
+                raise RuntimeError(f"작업을 찾을 수 없습니다: {job_id}")
+            if len(job["output"]) > len(sent):
+                yield job["output"][len(sent):]
+                sent = job["output"]
+            if job["status"] in FINISHED:
+                break
+            time.sleep(poll_interval)
+
+    job = get_job(job_id)
+    if job["status"] == "done":
+        if len(job["output"]) > len(sent):
+            yield job["output"][len(sent):]
+        return
+    if job["status"] == "failed":
+        raise RuntimeError(job["error"] or "작업이 실패했습니다.")
+    if job["status"] == "interrupted":
+        raise RuntimeError("서버 재시작으로 작업이 중단되었습니다.")
+    raise RuntimeError("작업이 취소되었습니다.")
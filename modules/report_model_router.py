@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+모델 라우팅 모듈 - 보고서 작업 단계별로 모델, 최대 토큰, temperature를 지정합니다.
+단계별 실제 응답 시간을 기록하여 품질이 허용하는 범위에서 더 빠른 모델을 고를 수 있게 합니다.
+
+secrets.toml 설정 예:
+    [report_models.verification]
+    model = "gemini-2.5-flash-lite"
+    max_tokens = 8192
+    temperature = 0.2
+"""
+import threading
+from collections import deque
+
+from modules.settings import get_setting
+
+# ── 작업 단계 ───────────────────────────────────────────────
+STEPS = ("extraction", "verification", "drafting", "review", "revision")
+STEP_LABELS = {
+    "extraction": "자료 추출(OCR)",
+    "verification": "검증",
+    "drafting": "초안작성",
+    "review": "검수",
+    "revision": "수정",
+}
+
+# ── 기본 라우팅 테이블 ─────────────────────────────────────
+# 짧은 응답만 필요한 단계(검증·검수)는 토큰 상한을 낮추고,
+# 원문 전사인 OCR은 경량 모델 + temperature 0으로 처리합니다.
+# (gemini-2.5 계열은 thinking 토큰도 max_output_tokens에 포함되므로 상한에 여유를 둡니다.)
+DEFAULT_ROUTES = {
+    "extraction":   {"model": "gemini-2.5-flash-lite", "max_tokens": 65536, "temperature": 0.0},
+    "verification": {"model": "gemini-2.5-flash",      "max_tokens": 16384, "temperature": 0.2},
+    "drafting":     {"model": "gemini-2.5-flash",      "max_tokens": 65536, "temperature": 0.3},
+    "review":       {"model": "gemini-2.5-flash",      "max_tokens": 16384, "temperature": 0.1},
+    "revision":     {"model": "gemini-2.5-flash",      "max_tokens": 65536, "temperature": 0.3},
+}
+
+# 단계별 최근 응답 시간 보관 개수
+LATENCY_HISTORY = 200
+
+_latencies: dict[tuple[str, str], deque] = {}
+_latency_lock = threading.Lock()
+
+
+def get_route(step: str) -> dict:
+    """단계의 라우팅 설정을 반환합니다. secrets.toml의 [report_models.<step>] 값이 기본값을 덮어씁니다."""
+    if step not in DEFAULT_ROUTES:
+        raise ValueError(f"알 수 없는 작업 단계입니다: {step}")
+
+    route = dict(DEFAULT_ROUTES[step])
+    overrides = get_setting("report_models", {}) or {}
+    step_override = overrides.get(step, {}) if isinstance(overrides, dict) else {}
+    for key in ("model", "max_tokens", "temperature"):
+        if key in step_override:
+            route[key] = step_override[key]
+
+    route["max_tokens"] = int(route["max_tokens"])
+    route["temperature"] = float(route["temperature"])
+    return route
+
+
+def get_routing_table() -> dict:
+    """전체 단계의 현재 라우팅 설정."""
+    return {step: get_route(step) for step in STEPS}
+
+
+def record_latency(step: str, model: str, seconds: float):
+    """단계·모델별 응답 시간을 기록합니다."""
+    with _latency_lock:
+        history = _latencies.setdefault((step, model), deque(maxlen=LATENCY_HISTORY))
+        history.append(seconds)
+
+
+def latency_summary() -> list[dict]:
+    """단계·모델별 응답 시간 요약.
+
+    Returns:
+        [{"step", "model", "count", "avg", "p50", "max"}, ...] (단계 순서대로)
+    """
+    with _latency_lock:
+        snapshot = {k: list(v) for k, v in _latencies.items()}
+
+    order = {step: i for i, step in enumerate(STEPS)}
+    rows = []
+    for (step, model), values in sorted(snapshot.items(), key=lambda kv: (order.get(kv[0][0], 99), kv[0][1])):
+        if not values:
+            continue
+        ordered = sorted(values)
+        rows.append({
+            "step": step,
+            "model": model,
+            "count": len(values),
+            "avg": sum(values) / len(values),
+            "p50": ordered[len(ordered) // 2],
+            "max": ordered[-1],
+        })
+    return rows
@@ -2,184 +2,728 @@
 """
 PDF 변환 모듈 - fpdf2로 마크다운을 PDF로 변환합니다.
 한글 폰트(malgun.ttf)를 사용하며 표, 제목, 인용문 등을 지원합니다.
+
+변환은 두 단계입니다.
+- tokenize(): 마크다운을 한 번 훑어 블록 토큰(제목, 목록, 표 등)으로 나누고 인라인 서식을 제거합니다.
+- _Renderer: 토큰을 순서대로 그리며 현재 글꼴·글자색을 기억해 바뀔 때만 set_font 등을 호출합니다.
+
+render_report_pdf()는 페이지 넘김 기준으로 나눈 섹션마다 (변환한 문서, 쪽 범위, 찍힌 쪽 번호)를 내용 해시로
+캐싱합니다. 처음 변환은 markdown_to_pdf()처럼 전체를 한 문서에 한 번에 그리고(쪽 범위만 기억), 수정 요청으로
+일부 섹션만 바뀌면 그 섹션과 쪽 번호가 밀린 뒤 섹션만 한 문서에 최종 쪽 번호로 이어서 그린 뒤 PyMuPDF로
+캐시된 쪽들과 이어 붙입니다. 한글 TTF(수 MB)의 파싱·서브셋·임베드는 변환 1회에 한 번입니다.
+변환 시간은 문서 1개당 고정 비용(폰트 로드·출력)과 글자 수에 비례하는 조판 시간으로 따로 측정하며,
+병렬 변환으로 줄어드는 예상 시간(조판 시간만 작업자 수로 나뉨)이 임계값을 넘을 때만 프로세스 풀에서 나눠 변환합니다.
+
+secrets.toml 설정 예:
+    PDF_RENDER_WORKERS = 1            # 프로세스 풀 크기 (기본 1 = 병렬 변환 안 함)
+    PDF_PARALLEL_MIN_SECONDS = 1.0    # 병렬 변환으로 줄어드는 예상 시간이 이 값 이상일 때만 병렬 변환
+    SECTION_CACHE_MIN_SECONDS = 0.2   # 캐시로 아낄 예상 조판 시간이 이 값 이상일 때만 섹션 캐시 사용
 """
+import hashlib
+import itertools
+import logging
+import multiprocessing
 import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+
+from modules.lazy import lazy_import
+from modules.settings import get_setting
+
+fitz = lazy_import("fitz")  # PyMuPDF
+
+logger = logging.getLogger(__name__)
+
+# 변환 결과 모양이 바뀌면 올립니다 (export_cache 키에 포함)
+EXPORTER_VERSION = "5"
 
 PROJECT_ROOT = Path(__file__).parent.parent
 FONT_PATH = str(PROJECT_ROOT / "assets" / "fonts" / "malgun.ttf")
 
+FONT_FAMILY = "malgun"
+BODY_SIZE = 11
+TABLE_SIZE = 9
+TABLE_WIDTH = 170
+
+# 제목 수준 → (위 여백, 글자 크기, 줄 높이, 아래 여백)
+HEADING_STYLES = {
+    1: (4, 16, 9, 2),
+    2: (3, 13, 8, 1),
+    3: (2, 11, 7, 1),
+}
+
+BLACK = (0, 0, 0)
+QUOTE_COLOR = (80, 80, 80)
+FOOTER_COLOR = (150, 150, 150)
+RULE_COLOR = (200, 200, 200)
+HEADER_FILL = (240, 240, 240)
+# multi_cell 뒤 커서를 다음 줄 왼쪽 여백으로 (fpdf2 기본값은 셀 오른쪽이라 연속된 문단이 폭 0으로 실패함)
+NEXT_LINE = {"new_x": XPos.LMARGIN, "new_y": YPos.NEXT}
+
+# HTML 태그 정리 (한 번에 치환): 페이지 넘김 div·<hr> → 페이지 넘김 줄, 나머지 빈 div 쌍·div 태그 제거,
+# <br> → 줄바꿈. 프롬프트는 섹션 앞에 <div style="page-break-before: always;"></div>를 넣도록 안내합니다.
+_HTML_RE = re.compile(
+    r"(<div[^>]*page-break[^>]*>\s*</div>)|<div[^>]*>\s*</div>|<div[^>]*>|</div>|<(br)\s*/?>|<(hr)[^>]*>",
+    re.IGNORECASE,
+)
+PAGE_BREAK = "---PAGE_BREAK---"
+# 인라인 서식: 코드(`...`)는 그대로, 굵게(**...**)·기울임(*...*)은 안쪽 서식까지 제거
+_INLINE_RE = re.compile(r"`(.+?)`|\*\*(.+?)\*\*|\*(.+?)\*")
+_NUMBERED_RE = re.compile(r"(\d+)\.\s(.+)")
+_RULES = frozenset(("---", "***", "___"))
+
 
 class ReportPDF(FPDF):
     """손해사정서용 PDF 클래스"""
 
-    def __init__(self):
+    def __init__(self, page_numbers: bool = True):
         super().__init__()
-        self.add_font("malgun", "", FONT_PATH)
-        self.add_font("malgun", "B", FONT_PATH)
+        self.page_numbers = page_numbers
+        # footer에 찍는 번호 = 이 문서의 쪽 번호 + page_offset (섹션을 최종 위치의 번호로 그릴 때)
+        self.page_offset = 0
+        # 굵게도 같은 TTF이므로 한 번만 등록 (등록마다 폰트 전체를 파싱하고, 출력 때 따로 서브셋·임베드함)
+        self.add_font(FONT_FAMILY, "", FONT_PATH)
         self.set_auto_page_break(auto=True, margin=20)
         self.set_margins(20, 20, 20)
 
+    def set_font(self, family=None, style="", size=0):
+        if family == FONT_FAMILY and isinstance(style, str):
+            style = style.replace("B", "")
+        super().set_font(family, style, size)
+
     def header(self):
         pass
 
     def footer(self):
+        if not self.page_numbers:
+            return
         self.set_y(-15)
-        self.set_font("malgun", "", 8)
-        self.set_text_color(150, 150, 150)
-        self.cell(0, 10, f"- {self.page_no()} -", align="C")
-        self.set_text_color(0, 0, 0)
+        self.set_font(FONT_FAMILY, "", 8)
+        self.set_text_color(*FOOTER_COLOR)
+        self.cell(0, 10, f"- {self.page_no() + self.page_offset} -", align="C")
+        self.set_text_color(*BLACK)
+
 
+# ── 토큰화 ──────────────────────────────────────────────
 
-def _clean_bold(text: str) -> str:
-    """마크다운 bold(**...**) 제거"""
-    return re.sub(r"\*\*(.+?)\*\*", r"\1", text)
+def _html_repl(m: re.Match) -> str:
+    page_break, br, hr = m.groups()
+    if page_break:
+        return f"\n{PAGE_BREAK}\n"
+    if br:
+        return "\n"
+    if hr:
+        return PAGE_BREAK
+    return ""
+
+
+def _inline_repl(m: re.Match) -> str:
+    code, bold, italic = m.groups()
+    if code is not None:
+        return code
+    return _INLINE_RE.sub(_inline_repl, bold if bold is not None else italic)
 
 
 def _clean_inline(text: str) -> str:
     """마크다운 인라인 서식 제거"""
-    text = re.sub(r"\*\*(.+?)\*\*", r"\1", text)
-    text = re.sub(r"\*(.+?)\*", r"\1", text)
-    text = re.sub(r"`(.+?)`", r"\1", text)
+    if "*" in text or "`" in text:
+        text = _INLINE_RE.sub(_inline_repl, text)
     return text.strip()
 
 
-def markdown_to_pdf(md_text: str) -> bytes:
-    """마크다운 텍스트를 PDF bytes로 변환합니다."""
-    # HTML 태그 정리
-    text = re.sub(r"<div[^>]*>\s*</div>", "", md_text)
-    text = re.sub(r"<div[^>]*>", "", text)
-    text = re.sub(r"</div>", "", text)
-    text = re.sub(r"<br\s*/?>", "\n", text)
-    text = re.sub(r"<hr[^>]*>", "---PAGE_BREAK---", text)
-
-    pdf = ReportPDF()
-    pdf.add_page()
-    pdf.set_font("malgun", "", 11)
+def tokenize(md_text: str) -> list[tuple]:
+    """마크다운을 블록 토큰 목록으로 변환합니다.
 
-    lines = text.split("\n")
-    i = 0
-    while i < len(lines):
+    토큰 형식:
+        ("blank",) ("page_break",) ("rule",) ("heading", 수준, 텍스트) ("quote", 텍스트)
+        ("bullet", 텍스트) ("numbered", 번호, 텍스트) ("table", [[셀, ...], ...]) ("text", 텍스트)
+    """
+    lines = _HTML_RE.sub(_html_repl, md_text).split("\n")
+    tokens = []
+    append = tokens.append
+    i, n = 0, len(lines)
+    while i < n:
         line = lines[i].rstrip()
+        i += 1
+        stripped = line.lstrip()
 
-        # 빈 줄
-        if not line.strip():
-            pdf.ln(3)
-            i += 1
+        if not stripped:
+            append(("blank",))
             continue
-
-        # 페이지 넘김
         if "PAGE_BREAK" in line or "page-break" in line.lower():
-            pdf.add_page()
-            i += 1
+            append(("page_break",))
             continue
-
-        # 구분선
-        if line.strip() in ("---", "***", "___"):
-            pdf.ln(2)
-            pdf.set_draw_color(200, 200, 200)
-            pdf.line(20, pdf.get_y(), 190, pdf.get_y())
-            pdf.ln(4)
-            i += 1
+        if stripped in _RULES:
+            append(("rule",))
             continue
 
-        # 제목 H1
-        if line.startswith("# "):
-            title = _clean_inline(line[2:])
-            pdf.ln(4)
-            pdf.set_font("malgun", "B", 16)
-            pdf.multi_cell(0, 9, title)
-            pdf.set_font("malgun", "", 11)
-            pdf.ln(2)
-            i += 1
+        first = line[0]
+        if first == "#":
+            level = len(line) - len(line.lstrip("#"))
+            if level in HEADING_STYLES and line[level:level + 1] == " ":
+                append(("heading", level, _clean_inline(line[level + 1:])))
+                continue
+        elif first == ">" and line.startswith("> "):
+            append(("quote", _clean_inline(line[2:])))
             continue
 
-        # 제목 H2
-        if line.startswith("## "):
-            title = _clean_inline(line[3:])
-            pdf.ln(3)
-            pdf.set_font("malgun", "B", 13)
-            pdf.multi_cell(0, 8, title)
-            pdf.set_font("malgun", "", 11)
-            pdf.ln(1)
-            i += 1
+        lead = stripped[0]
+        if lead in "-*" and len(stripped) > 1 and stripped[1].isspace():
+            append(("bullet", _clean_inline(stripped[2:])))
             continue
-
-        # 제목 H3
-        if line.startswith("### "):
-            title = _clean_inline(line[4:])
-            pdf.ln(2)
-            pdf.set_font("malgun", "B", 11)
-            pdf.multi_cell(0, 7, title)
-            pdf.set_font("malgun", "", 11)
-            pdf.ln(1)
-            i += 1
+        if lead.isdigit():
+            m = _NUMBERED_RE.match(stripped)
+            if m:
+                append(("numbered", m.group(1), _clean_inline(m.group(2))))
+                continue
+        if lead == "|":
+            rows = []
+            row_text = stripped
+            while True:
+                cells = [c.strip() for c in row_text.split("|")[1:-1]]
+                # 구분선 행 건너뛰기
+                if cells and not all(set(c) <= set("-: ") for c in cells):
+                    rows.append([_clean_inline(c) for c in cells])
+                if i >= n:
+                    break
+                row_text = lines[i].strip()
+                if not row_text.startswith("|"):
+                    break
+                i += 1
+            if rows:
+                append(("table", rows))
             continue
 
-        # 인용문
-        if line.startswith("> "):
-            pdf.set_text_color(80, 80, 80)
-            pdf.set_x(25)
-            pdf.multi_cell(165, 6, _clean_inline(line[2:]))
-            pdf.set_text_color(0, 0, 0)
-            i += 1
-            continue
+        clean = _clean_inline(line)
+        if clean:
+            append(("text", clean))
+    return tokens
 
-        # 리스트 항목
-        if re.match(r"^[-*]\s", line.strip()):
-            item = _clean_inline(line.strip()[2:])
-            pdf.cell(8, 6, "  -")
-            pdf.multi_cell(0, 6, item)
-            i += 1
-            continue
 
-        # 번호 리스트
-        m = re.match(r"^(\d+)\.\s(.+)", line.strip())
-        if m:
-            num, item = m.group(1), _clean_inline(m.group(2))
-            pdf.cell(10, 6, f"  {num}.")
-            pdf.multi_cell(0, 6, item)
-            i += 1
-            continue
+# ── 렌더링 ──────────────────────────────────────────────
 
-        # 테이블
-        if line.strip().startswith("|"):
-            table_rows = []
-            while i < len(lines) and lines[i].strip().startswith("|"):
-                row_text = lines[i].strip()
-                cells = [c.strip() for c in row_text.split("|")[1:-1]]
-                # 구분선 행 건너뛰기
-                if cells and not all(set(c) <= set("-: ") for c in cells):
-                    table_rows.append(cells)
-                i += 1
+class _Renderer:
+    """토큰을 PDF에 그립니다. 글꼴·글자색이 실제로 바뀔 때만 fpdf 상태를 갱신합니다."""
 
-            if table_rows:
-                num_cols = max(len(r) for r in table_rows)
-                col_w = 170 / num_cols
-                pdf.set_font("malgun", "", 9)
-
-                for row_idx, row in enumerate(table_rows):
-                    for col_idx in range(num_cols):
-                        cell_text = _clean_inline(row[col_idx]) if col_idx < len(row) else ""
-                        if row_idx == 0:
-                            pdf.set_font("malgun", "B", 9)
-                            pdf.set_fill_color(240, 240, 240)
-                            pdf.cell(col_w, 7, cell_text, border=1, fill=True)
-                            pdf.set_font("malgun", "", 9)
-                        else:
-                            pdf.cell(col_w, 7, cell_text, border=1)
-                    pdf.ln()
-
-                pdf.set_font("malgun", "", 11)
+    def __init__(self, pdf: ReportPDF):
+        self.pdf = pdf
+        self.font = None
+        self.color = BLACK
+
+    # fpdf는 add_page() 때 footer가 바꾼 글꼴·글자색을 되돌리므로 여기서 기억한 상태가 그대로 유효합니다.
+    def set_font(self, style: str, size: float):
+        font = (style, size)
+        if font != self.font:
+            self.pdf.set_font(FONT_FAMILY, style, size)
+            self.font = font
+
+    def set_color(self, color: tuple):
+        if color != self.color:
+            self.pdf.set_text_color(*color)
+            self.color = color
+
+    def render(self, tokens: list[tuple]):
+        pdf = self.pdf
+        self.set_font("", BODY_SIZE)
+        for token in tokens:
+            kind = token[0]
+            if kind == "text":
+                pdf.multi_cell(0, 6, token[1], **NEXT_LINE)
+            elif kind == "blank":
+                pdf.ln(3)
+            elif kind == "heading":
+                self._heading(token[1], token[2])
+            elif kind == "bullet":
+                pdf.cell(8, 6, "  -")
+                pdf.multi_cell(0, 6, token[1], **NEXT_LINE)
+            elif kind == "numbered":
+                pdf.cell(10, 6, f"  {token[1]}.")
+                pdf.multi_cell(0, 6, token[2], **NEXT_LINE)
+            elif kind == "table":
+                self._table(token[1])
+            elif kind == "quote":
+                self.set_color(QUOTE_COLOR)
+                pdf.set_x(25)
+                pdf.multi_cell(165, 6, token[1], **NEXT_LINE)
+                self.set_color(BLACK)
+            elif kind == "rule":
                 pdf.ln(2)
+                pdf.set_draw_color(*RULE_COLOR)
+                pdf.line(20, pdf.get_y(), 190, pdf.get_y())
+                pdf.ln(4)
+            elif kind == "page_break":
+                pdf.add_page()
+
+    def _heading(self, level: int, title: str):
+        space_before, size, height, space_after = HEADING_STYLES[level]
+        pdf = self.pdf
+        pdf.ln(space_before)
+        self.set_font("B", size)
+        pdf.multi_cell(0, height, title, **NEXT_LINE)
+        self.set_font("", BODY_SIZE)
+        pdf.ln(space_after)
+
+    def _table(self, rows: list[list[str]]):
+        pdf = self.pdf
+        num_cols = max(len(r) for r in rows)
+        col_w = TABLE_WIDTH / num_cols
+
+        self.set_font("B", TABLE_SIZE)
+        pdf.set_fill_color(*HEADER_FILL)
+        header = rows[0]
+        for col_idx in range(num_cols):
+            pdf.cell(col_w, 7, header[col_idx] if col_idx < len(header) else "", border=1, fill=True)
+        pdf.ln()
+
+        self.set_font("", TABLE_SIZE)
+        for row in rows[1:]:
+            for col_idx in range(num_cols):
+                pdf.cell(col_w, 7, row[col_idx] if col_idx < len(row) else "", border=1)
+            pdf.ln()
+
+        self.set_font("", BODY_SIZE)
+        pdf.ln(2)
+
+
+def markdown_to_pdf(md_text: str) -> bytes:
+    """마크다운 텍스트를 PDF bytes로 변환합니다."""
+    pdf = ReportPDF()
+    pdf.add_page()
+    _Renderer(pdf).render(tokenize(md_text))
+    return bytes(pdf.output())
+
+
+# ── 변환 시간 추정 ──────────────────────────────────────────────
+
+# 측정값이 없을 때 쓰는 초기값 (한글 TTF 3~4MB, 표가 섞인 보고서 기준)
+# 변환 시간 ≈ 문서당 고정 비용 + 글자 수 × 글자당 조판 시간
+INITIAL_FIXED_SECONDS = 0.5
+INITIAL_SECONDS_PER_CHAR = 1.2e-5
+RATE_SMOOTHING = 0.3
+# 이보다 글자 수가 적은 배치는 글자당 시간 평균에 넣지 않음 (빈 섹션은 나머지 오차가 글자당 시간을 부풀림)
+MIN_RATE_CHARS = 1000
+
+_fixed_seconds = INITIAL_FIXED_SECONDS
+_seconds_per_char = INITIAL_SECONDS_PER_CHAR
+_rate_lock = threading.Lock()
+
+
+def _section_size(section: list[tuple]) -> int:
+    """변환 작업량 추정치 (토큰 표현의 글자 수)."""
+    return len(repr(section))
+
+
+def _record_rate(chars: int, fixed: float, seconds: float):
+    """배치 1회 측정값으로 고정 비용과 글자당 조판 시간(각각 지수 이동 평균)을 갱신합니다.
+
+    Args:
+        chars: 배치의 섹션 크기 합
+        fixed: 고정 비용으로 잰 시간 (문서 생성·폰트 로드·출력)
+        seconds: 배치 전체 소요 시간
+    """
+    global _fixed_seconds, _seconds_per_char
+    with _rate_lock:
+        _fixed_seconds += RATE_SMOOTHING * (fixed - _fixed_seconds)
+        if chars >= MIN_RATE_CHARS:
+            per_char = max(seconds - fixed, 0.0) / chars
+            _seconds_per_char += RATE_SMOOTHING * (per_char - _seconds_per_char)
+
+
+def estimate_render_seconds(sections: list[list[tuple]]) -> float:
+    """섹션들을 한 프로세스(한 배치)에서 변환할 때의 예상 시간(초)."""
+    return _fixed_seconds + sum(_section_size(s) for s in sections) * _seconds_per_char
+
+
+# ── 섹션 캐시 ──────────────────────────────────────────────
+
+# 섹션 캐시 상한 (바이트, 조각이 가리키는 변환 문서 크기의 합)
+FRAGMENT_CACHE_BUDGET = 64 * 1024 * 1024
+# 캐시된 섹션으로 아낄 예상 조판 시간이 이 값보다 작으면 (처음 변환, 짧은 보고서) 캐시를 쓰지 않고
+# 전체를 한 번에 그립니다. 조각을 이어 붙이는 비용(100쪽 약 0.03초, 400쪽 약 0.4초)과 측정 오차를 넘는 값
+DEFAULT_SECTION_CACHE_MIN_SECONDS = 0.2
+
+# 섹션 키 → 조각 {"batch": 변환 문서 id, "data": 변환 문서 PDF bytes, "doc_pages": 변환 문서 쪽 수,
+#                 "first"/"last": 변환 문서 안의 쪽 범위(0부터), "numbered_from": 찍힌 쪽 번호의 시작(0부터) | None}
+# 조각은 따로 잘라 두지 않고 변환한 문서와 쪽 범위로 기억합니다 (처음 변환에 자르는 비용이 들지 않음).
+_fragments: "OrderedDict[str, dict]" = OrderedDict()
+# 변환 문서 id → [PDF bytes, 가리키는 조각 수]
+_batches: dict[int, list] = {}
+_batch_ids = itertools.count()
+_fragments_bytes = 0
+_fragments_lock = threading.Lock()
+
+
+def split_sections(tokens: list[tuple]) -> list[list[tuple]]:
+    """토큰 목록을 페이지 넘김 기준으로 나눕니다. 각 섹션은 새 페이지에서 시작합니다."""
+    sections = [[]]
+    for token in tokens:
+        if token[0] == "page_break":
+            sections.append([])
+        else:
+            sections[-1].append(token)
+    return sections
+
+
+def _section_key(section: list[tuple]) -> str:
+    return hashlib.sha256(f"{FONT_PATH}\n{section!r}".encode("utf-8")).hexdigest()
+
+
+def _fragment_pages(fragment: dict) -> int:
+    return fragment["last"] - fragment["first"] + 1
+
+
+def _cached_fragment(key: str) -> dict | None:
+    with _fragments_lock:
+        fragment = _fragments.get(key)
+        if fragment is not None:
+            _fragments.move_to_end(key)
+        return fragment
+
+
+def _release_batch(batch: int):
+    """조각 하나가 변환 문서를 더 가리키지 않음 (호출자가 _fragments_lock 보유)."""
+    global _fragments_bytes
+    entry = _batches[batch]
+    entry[1] -= 1
+    if entry[1] == 0:
+        del _batches[batch]
+        _fragments_bytes -= len(entry[0])
+
+
+def _remember_batch(data: bytes, doc_pages: int, ranges: list[tuple]) -> list[dict]:
+    """변환한 문서와 섹션별 쪽 범위를 캐시에 넣고 섹션별 조각 목록을 반환합니다.
+
+    Args:
+        ranges: [(섹션 키, 첫 쪽, 끝 쪽, 쪽 번호 시작 | None), ...]
+    """
+    global _fragments_bytes
+    batch = next(_batch_ids)
+    fragments = [
+        {"batch": batch, "data": data, "doc_pages": doc_pages, "first": first, "last": last,
+         "numbered_from": numbered_from}
+        for _, first, last, numbered_from in ranges
+    ]
+    if not ranges or len(data) > FRAGMENT_CACHE_BUDGET // 4:
+        return fragments
+    with _fragments_lock:
+        _batches[batch] = [data, 0]
+        _fragments_bytes += len(data)
+        for (key, *_), fragment in zip(ranges, fragments):
+            old = _fragments.get(key)
+            _fragments[key] = fragment
+            _fragments.move_to_end(key)
+            _batches[batch][1] += 1
+            if old is not None:
+                _release_batch(old["batch"])
+        while _fragments_bytes > FRAGMENT_CACHE_BUDGET and _fragments:
+            _, old = _fragments.popitem(last=False)
+            _release_batch(old["batch"])
+    return fragments
+
+
+def cache_info() -> dict:
+    """섹션 조각 캐시 {"entries", "bytes", "budget"}"""
+    with _fragments_lock:
+        return {"entries": len(_fragments), "bytes": _fragments_bytes, "budget": FRAGMENT_CACHE_BUDGET}
+
+
+def clear_cache():
+    """섹션 조각 캐시를 비웁니다."""
+    global _fragments_bytes
+    with _fragments_lock:
+        _fragments.clear()
+        _batches.clear()
+        _fragments_bytes = 0
+
+
+def _render_numbered(sections: list[list[tuple]], keys: list[str],
+                     cached: list[dict | None]) -> tuple[list[dict], int]:
+    """섹션을 순서대로 보며, 캐시된 조각 중 쪽 번호가 이번 위치와 맞는(또는 번호가 없는) 것은 그대로 쓰고
+    나머지는 한 문서에 이어서(각각 새 페이지에서) 최종 쪽 번호를 찍으며 그립니다.
+    폰트 로드·서브셋은 새로 그리는 섹션 수와 관계없이 한 번입니다.
+
+    Returns:
+        (섹션별 조각 목록, 새로 그린 섹션 수)
+    """
+    started = time.perf_counter()
+    pdf = renderer = None
+    fixed, chars, start = 0.0, 0, 0
+    # 새로 그린 섹션: (parts 안 위치, 섹션 키, 변환 문서의 첫 쪽, 쪽 번호 시작)
+    parts, drawn = [], []
+    for section, key, hit in zip(sections, keys, cached):
+        if hit is not None and hit["numbered_from"] in (None, start):
+            parts.append(hit)
+            start += _fragment_pages(hit)
             continue
+        if pdf is None:
+            setup_started = time.perf_counter()
+            pdf = ReportPDF()
+            renderer = _Renderer(pdf)
+            fixed += time.perf_counter() - setup_started
+        pdf.add_page()
+        first = pdf.page_no() - 1
+        pdf.page_offset = start - first
+        renderer.render(section)
+        chars += _section_size(section)
+        drawn.append((len(parts), key, first, start))
+        parts.append(None)
+        start += pdf.page_no() - first
+    if pdf is None:
+        return parts, 0
+
+    doc_pages = pdf.page_no()
+    lasts = [first - 1 for _, _, first, _ in drawn[1:]] + [doc_pages - 1]
+    output_started = time.perf_counter()
+    data = bytes(pdf.output())
+    fixed += time.perf_counter() - output_started
+    fragments = _remember_batch(data, doc_pages, [
+        (key, first, last, numbered_from) for (_, key, first, numbered_from), last in zip(drawn, lasts)
+    ])
+    for (index, *_), fragment in zip(drawn, fragments):
+        parts[index] = fragment
+    _record_rate(chars, fixed, time.perf_counter() - started)
+    return parts, len(drawn)
 
-        # 일반 텍스트
-        clean = _clean_inline(line)
-        if clean:
-            pdf.multi_cell(0, 6, clean)
-        i += 1
 
+@lru_cache(maxsize=4)
+def _page_number_stamp(capacity: int) -> bytes:
+    """쪽 번호 footer만 있는 빈 페이지 capacity장 (번호 없이 변환한 조각 위에 겹쳐 찍는 용도)."""
+    pdf = ReportPDF()
+    for _ in range(capacity):
+        pdf.add_page()
     return bytes(pdf.output())
+
+
+def _merge_fragments(fragments: list[dict]) -> tuple[bytes, int]:
+    """조각을 순서대로 이어 붙입니다. (PDF bytes, 페이지 수)를 반환합니다.
+
+    조각들이 한 변환 문서의 처음부터 끝까지를 차례로 덮고 번호도 맞으면(처음 변환) 그 문서를 그대로 반환합니다.
+    쪽 번호 없이 변환한 조각(병렬 변환)의 쪽에만 번호를 찍고, 문서 간 같은 내용의 스트림은 합칩니다 (garbage=4).
+    """
+    head, tail = fragments[0], fragments[-1]
+    if (
+        head["first"] == 0 and head["numbered_from"] == 0 and tail["last"] == tail["doc_pages"] - 1
+        and all(f["batch"] == head["batch"] and f["numbered_from"] == f["first"] for f in fragments)
+        and all(prev["last"] + 1 == f["first"] for prev, f in zip(fragments, fragments[1:]))
+    ):
+        return head["data"], head["doc_pages"]
+
+    with fitz.open() as doc:
+        sources, unnumbered = {}, []
+        try:
+            for fragment in fragments:
+                source = sources.get(fragment["batch"])
+                if source is None:
+                    source = sources[fragment["batch"]] = fitz.open(stream=fragment["data"], filetype="pdf")
+                if fragment["numbered_from"] is None:
+                    unnumbered.extend(range(doc.page_count, doc.page_count + _fragment_pages(fragment)))
+                doc.insert_pdf(source, from_page=fragment["first"], to_page=fragment["last"])
+        finally:
+            for source in sources.values():
+                source.close()
+        if unnumbered:
+            # 쪽 번호 판은 2의 거듭제곱 장수로 만들어 둠 — 쪽 수가 조금 바뀔 때마다 폰트를 다시 읽지 않도록
+            capacity = 1 << max(doc.page_count - 1, 0).bit_length()
+            with fitz.open(stream=_page_number_stamp(capacity), filetype="pdf") as stamp:
+                for number in unnumbered:
+                    page = doc[number]
+                    page.show_pdf_page(page.rect, stamp, number)
+        return doc.tobytes(garbage=4, deflate=True), doc.page_count
+
+
+# ── 병렬 변환 ──────────────────────────────────────────────
+
+# scripts/bench_pdf_export.py --parallel 측정값 기준:
+# 시작된 풀의 작업 왕복 비용은 작업당 약 30ms, 풀 시작(spawn)은 약 1.5~2초
+DEFAULT_PARALLEL_MIN_SECONDS = 1.0
+POOL_START_SECONDS = 1.5
+# 다중 코어에서 이득이 측정되기 전까지 프로세스 풀은 끔 (단일 코어 측정에서는 약 1배)
+DEFAULT_RENDER_WORKERS = 1
+
+_pool: ProcessPoolExecutor | None = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def estimate_parallel_saving(sections: list[list[tuple]], workers: int) -> float:
+    """작업자 workers개로 나눠 변환할 때 줄어드는 예상 시간(초, 풀 시작·왕복 비용 제외).
+    고정 비용은 작업자마다 동시에 한 번씩 들므로 조판 시간만 나뉩니다."""
+    if workers <= 1:
+        return 0.0
+    return sum(_section_size(s) for s in sections) * _seconds_per_char * (1 - 1 / workers)
+
+
+def get_render_workers() -> int:
+    """병렬 변환 프로세스 수 (설정 PDF_RENDER_WORKERS, 기본 1 = 병렬 변환 안 함).
+
+    코어 2개 이상에서 풀 + 이어 붙이기가 markdown_to_pdf()보다 빠르다는 측정
+    (scripts/bench_pdf_export.py --parallel)이 있을 때만 늘립니다.
+    """
+    return max(1, int(get_setting("PDF_RENDER_WORKERS", DEFAULT_RENDER_WORKERS)))
+
+
+def _render_batch(sections: list[list[tuple]]) -> tuple[bytes, list[tuple[int, int]], float, float]:
+    """섹션들을 한 문서에 쪽 번호 없이(번호는 이어 붙일 때 찍음) 각각 새 페이지에서 이어서 그립니다.
+
+    Returns:
+        (PDF bytes, 섹션별 (첫 쪽, 끝 쪽), 고정 비용(문서 생성·폰트 로드·출력) 초, 전체 소요 초)
+    """
+    started = time.perf_counter()
+    pdf = ReportPDF(page_numbers=False)
+    renderer = _Renderer(pdf)
+    fixed = time.perf_counter() - started
+    starts = []
+    for section in sections:
+        pdf.add_page()
+        starts.append(pdf.page_no() - 1)
+        renderer.render(section)
+    ranges = list(zip(starts, [start - 1 for start in starts[1:]] + [pdf.page_no() - 1]))
+    output_started = time.perf_counter()
+    data = bytes(pdf.output())
+    fixed += time.perf_counter() - output_started
+    return data, ranges, fixed, time.perf_counter() - started
+
+
+def _render_batch_job(sections: list[list[tuple]], font_path: str) -> tuple[bytes, list[tuple[int, int]], float, float]:
+    """프로세스 풀 작업: 부모와 같은 폰트로 섹션 묶음을 변환합니다 (반환값은 _render_batch()와 같음)."""
+    global FONT_PATH
+    FONT_PATH = font_path
+    return _render_batch(sections)
+
+
+def _chunk_sections(sections: list[list[tuple]], chunks: int) -> list[tuple[int, int]]:
+    """섹션을 작업량이 비슷한 연속 구간 chunks개로 나눕니다. [(시작, 끝), ...] (끝 제외)."""
+    sizes = [_section_size(section) for section in sections]
+    target = sum(sizes) / chunks
+    bounds, start, acc = [], 0, 0
+    for i, size in enumerate(sizes):
+        acc += size
+        remaining_chunks = chunks - len(bounds) - 1
+        if remaining_chunks and acc >= target and len(sections) - (i + 1) >= remaining_chunks:
+            bounds.append((start, i + 1))
+            start, acc = i + 1, 0
+    bounds.append((start, len(sections)))
+    return bounds
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """프로세스 공용 변환 풀. Streamlit 서버의 스레드와 fork가 섞이지 않도록 spawn으로 시작합니다."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+
+def _discard_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _render_serial(sections: list[list[tuple]]) -> list[tuple]:
+    data, ranges, fixed, seconds = _render_batch(sections)
+    _record_rate(sum(_section_size(section) for section in sections), fixed, seconds)
+    return [(data, ranges)]
+
+
+def _render_parallel(sections: list[list[tuple]], workers: int) -> list[tuple]:
+    pool = _get_pool(workers)
+    # 작업자마다 연속된 섹션 묶음 하나 (폰트 로드는 묶음당 한 번)
+    chunks = _chunk_sections(sections, workers)
+    futures = [pool.submit(_render_batch_job, sections[start:end], FONT_PATH) for start, end in chunks]
+    results = []
+    for (start, end), future in zip(chunks, futures):
+        data, ranges, fixed, seconds = future.result()
+        _record_rate(sum(_section_size(section) for section in sections[start:end]), fixed, seconds)
+        results.append((data, ranges))
+    return results
+
+
+def _prefer_parallel(sections: list[list[tuple]]) -> bool:
+    """병렬 변환으로 줄어드는 예상 시간이 임계값(PDF_PARALLEL_MIN_SECONDS, 풀 시작 전이면
+    POOL_START_SECONDS 추가) 이상이고 작업자가 2개 이상인지."""
+    workers = min(get_render_workers(), len(sections))
+    threshold = float(get_setting("PDF_PARALLEL_MIN_SECONDS", DEFAULT_PARALLEL_MIN_SECONDS))
+    if _pool is None:
+        # 풀을 처음 띄우는 비용까지 상쇄될 만큼 길 때만
+        threshold += POOL_START_SECONDS
+    return workers > 1 and estimate_parallel_saving(sections, workers) >= threshold
+
+
+def render_fragments(sections: list[list[tuple]], parallel: bool | None = None) -> tuple[list[tuple], bool]:
+    """섹션들을 쪽 번호 없이 변환합니다. ([(PDF bytes, 섹션별 (첫 쪽, 끝 쪽)), ...], 병렬 변환 여부)를 반환합니다.
+    변환 문서는 섹션 순서대로이며, 병렬이면 작업자마다 하나입니다.
+
+    Args:
+        parallel: None이면 _prefer_parallel() 기준
+    """
+    workers = min(get_render_workers(), len(sections))
+    if parallel is None:
+        parallel = _prefer_parallel(sections)
+    if parallel and workers > 1:
+        try:
+            return _render_parallel(sections, workers), True
+        except Exception as e:
+            # 풀이 깨졌거나(BrokenProcessPool) 시작할 수 없는 환경 → 이번 변환은 현재 프로세스에서
+            logger.warning("parallel pdf rendering failed, falling back to in-process: %s", e)
+            _discard_pool()
+    return _render_serial(sections), False
+
+
+def render_report_pdf(md_text: str, stats: dict | None = None) -> bytes:
+    """마크다운을 섹션 캐시를 거쳐 PDF bytes로 변환합니다 (결과는 markdown_to_pdf()와 같은 모양).
+
+    새로 그릴 섹션이 있는데 캐시된 섹션으로 아낄 예상 조판 시간이 SECTION_CACHE_MIN_SECONDS보다 작으면
+    (처음 변환·짧은 보고서) 캐시를 쓰지 않고 전체를 한 번에 그립니다 — 이때 결과는 markdown_to_pdf()와 같은 한 문서이고,
+    섹션별 쪽 범위만 캐시에 기억합니다.
+
+    Args:
+        md_text: 보고서 마크다운
+        stats: 넘기면 {"sections": 섹션 수, "rendered": 새로 변환한 섹션 수, "pages": 전체 페이지 수,
+               "parallel": 병렬 변환 여부}를 채웁니다.
+    """
+    sections = split_sections(tokenize(md_text))
+    keys = [_section_key(section) for section in sections]
+    cached = [_cached_fragment(key) for key in keys]
+
+    hit_chars = sum(_section_size(section) for section, hit in zip(sections, cached) if hit is not None)
+    min_saving = float(get_setting("SECTION_CACHE_MIN_SECONDS", DEFAULT_SECTION_CACHE_MIN_SECONDS))
+    if None in cached and hit_chars * _seconds_per_char < min_saving:
+        cached = [None] * len(sections)
+
+    parallel, pooled = False, 0
+    missing = [i for i, hit in enumerate(cached) if hit is None]
+    if missing and _prefer_parallel([sections[i] for i in missing]):
+        # 번호 없이 변환한 조각은 어느 위치에서나 쓸 수 있음 (이어 붙일 때 번호를 찍음)
+        batches, parallel = render_fragments([sections[i] for i in missing], parallel=True)
+        pending = iter(missing)
+        for data, ranges in batches:
+            indexes = [next(pending) for _ in ranges]
+            fragments = _remember_batch(data, ranges[-1][1] + 1, [
+                (keys[i], first, last, None) for i, (first, last) in zip(indexes, ranges)
+            ])
+            for i, fragment in zip(indexes, fragments):
+                cached[i] = fragment
+        pooled = len(missing)
+
+    fragments, drawn = _render_numbered(sections, keys, cached)
+    result, pages = _merge_fragments(fragments)
+    rendered = pooled + drawn
+    logger.info("report pdf: %d sections, %d rendered%s, %d pages",
+                len(sections), rendered, " (parallel)" if parallel else "", pages)
+    if stats is not None:
+        stats.update(sections=len(sections), rendered=rendered, pages=pages, parallel=parallel)
+    return result
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+사전 검증 모듈 - 02_PROCESS.md Phase 1의 결정적(규칙 기반) 항목을 API 호출 없이 즉시 점검합니다.
+입력 폼(report_data)과 첨부자료 추출 텍스트만 사용하며, 결과는 report_verification과 같은 형식입니다.
+규칙만으로 판단할 수 없는 경우에만 needs_model=True로 표시하여 AI 검증을 요청합니다.
+"""
+import re
+from datetime import date
+
+# ── 정규식 ──────────────────────────────────────────────────
+# 2024.03.15 / 2024-3-15 / 2024/03/15 / 2024. 3. 15. / 2024년 3월 15일 / 24.03.15 / 20240315
+_DATE_PATTERNS = [
+    re.compile(r"(?<!\d)(\d{4})\s*년\s*(\d{1,2})\s*월\s*(\d{1,2})\s*일"),
+    re.compile(r"(?<!\d)(\d{4})\s*[.\-/]\s*(\d{1,2})\s*[.\-/]\s*(\d{1,2})(?!\d)"),
+    re.compile(r"(?<!\d)(\d{2})\s*[.\-/]\s*(\d{1,2})\s*[.\-/]\s*(\d{1,2})(?!\d)"),
+    re.compile(r"(?<!\d)(\d{4})(\d{2})(\d{2})(?!\d)"),
+]
+# KCD(한국표준질병사인분류) 코드: S22.0, M48.56, S32 등
+_KCD = re.compile(r"(?<![A-Za-z0-9])([A-Z]\d{2}(?:\.\d{1,2})?)(?![0-9])")
+# 각도: 15도, 12.5°, 20˚
+_ANGLE = re.compile(r"(\d{1,3}(?:\.\d+)?)\s*(?:도(?![a-zA-Z가-힣])|°|˚)")
+# 압박률: 압박률 35%, 35% 압박
+_COMPRESSION = re.compile(r"압박\s*률?\s*[:：]?\s*(\d{1,3}(?:\.\d+)?)\s*%|(\d{1,3}(?:\.\d+)?)\s*%\s*(?:의\s*)?압박")
+_RRN = re.compile(r"(?<!\d)\d{6}\s*-\s*[1-4]")
+_PHONE = re.compile(r"(?<!\d)01[016789]\s*-?\s*\d{3,4}\s*-?\s*\d{4}(?!\d)")
+_POLICY_NO = re.compile(r"증권\s*번호")
+_OPEN_ENDED = re.compile(r"(\d{2,3})\s*세\s*만기|종신")
+
+# 자료 종류 판별 키워드 (첨부 파일명 + 본문)
+DISABILITY_DOC_KEYWORDS = ("장해진단서", "후유장해", "장해평가", "장해 진단")
+TERMS_KEYWORDS = ("약관", "장해분류표")
+DIAGNOSIS_KEYWORDS = ("진단명", "상병명", "압박골절", "골절")
+
+# 추출 실패 표시 (report_ai_client / 페이지 업로드 처리에서 붙이는 문구)
+_EXTRACTION_FAILED = ("텍스트 추출 실패", "이미지가 업로드되었습니다")
+
+
+def _to_date(year: int, month: int, day: int) -> date | None:
+    if year < 100:
+        year += 2000 if year <= date.today().year % 100 else 1900
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def find_dates(text: str) -> list[date]:
+    """텍스트에서 날짜를 모두 찾아 등장 순서대로 반환합니다."""
+    found = []
+    taken = []
+    for pattern in _DATE_PATTERNS:
+        for m in pattern.finditer(text or ""):
+            if any(s <= m.start() < e for s, e in taken):
+                continue
+            d = _to_date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+            if d:
+                found.append((m.start(), d))
+                taken.append((m.start(), m.end()))
+    return [d for _, d in sorted(found)]
+
+
+def parse_date(text: str) -> date | None:
+    """텍스트의 첫 번째 날짜를 반환합니다. 없으면 None."""
+    dates = find_dates(text)
+    return dates[0] if dates else None
+
+
+def parse_period(text: str) -> tuple[date, date] | None:
+    """보험기간 문자열에서 (시작일, 종료일)을 반환합니다. 두 날짜를 찾지 못하면 None."""
+    dates = find_dates(text)
+    if len(dates) < 2:
+        return None
+    start, end = dates[0], dates[1]
+    if end < start:
+        start, end = end, start
+    return start, end
+
+
+def find_kcd_codes(text: str) -> list[str]:
+    """KCD 코드를 중복 없이 등장 순서대로 반환합니다."""
+    codes = []
+    for m in _KCD.finditer(text or ""):
+        if m.group(1) not in codes:
+            codes.append(m.group(1))
+    return codes
+
+
+def find_angles(text: str) -> list[float]:
+    """각도 표기(예: 15도, 12.5°)의 수치를 반환합니다."""
+    return [float(m.group(1)) for m in _ANGLE.finditer(text or "")]
+
+
+def find_compression_rates(text: str) -> list[float]:
+    """압박률(%) 표기의 수치를 반환합니다."""
+    return [float(m.group(1) or m.group(2)) for m in _COMPRESSION.finditer(text or "")]
+
+
+def _issue(item: str, detail: str) -> dict:
+    return {"item": item, "detail": detail}
+
+
+def precheck_case(data: dict, uploaded_texts: list[str] | None = None,
+                  uploaded_names: list[str] | None = None) -> dict:
+    """입력 폼과 첨부자료 텍스트로 필수 정보를 규칙 기반 점검합니다.
+
+    Args:
+        data: 페이지의 report_data (build_user_message 입력과 동일)
+        uploaded_texts: 첨부자료 추출 텍스트 목록
+        uploaded_names: 첨부 파일명 목록
+
+    Returns:
+        report_verification.parse_verification과 같은 형식의 dict에
+        "needs_model"(AI 검증 필요 여부), "facts"(추출된 코드·날짜·수치)를 더한 결과
+    """
+    texts = uploaded_texts or []
+    names = uploaded_names or []
+    attachments = "\n".join(texts)
+    corpus = "\n".join([attachments, data.get("additional_info", ""), data.get("accident_desc", "")])
+    doc_index = "\n".join(names) + "\n" + corpus
+
+    missing, ambiguous, conflicting, questions = [], [], [], []
+
+    # 1. 피보험자 인적사항
+    if not data.get("insured_name"):
+        missing.append(_issue("피보험자 성명", "입력 폼에 성명이 없습니다."))
+    if not data.get("insured_birth") and not _RRN.search(attachments):
+        missing.append(_issue("피보험자 생년월일", "입력 폼과 첨부자료에서 생년월일/주민번호를 찾지 못했습니다."))
+    elif data.get("insured_birth") and not parse_date(data["insured_birth"]) and not _RRN.search(data["insured_birth"]):
+        ambiguous.append(_issue("피보험자 생년월일", f"'{data['insured_birth']}'을(를) 날짜로 해석할 수 없습니다."))
+    if not data.get("insured_address"):
+        missing.append(_issue("피보험자 주소", "입력 폼에 주소가 없습니다."))
+    if not data.get("insured_phone") and not _PHONE.search(attachments):
+        missing.append(_issue("피보험자 연락처", "입력 폼과 첨부자료에서 연락처를 찾지 못했습니다."))
+
+    # 2. 사고정보
+    accident_date = parse_date(data.get("accident_date", ""))
+    if not data.get("accident_date"):
+        missing.append(_issue("사고일시", "입력 폼에 사고일시가 없습니다."))
+    elif accident_date is None:
+        ambiguous.append(_issue("사고일시", f"'{data['accident_date']}'을(를) 날짜로 해석할 수 없습니다."))
+    elif accident_date > date.today():
+        conflicting.append(_issue("사고일시", f"사고일({accident_date:%Y.%m.%d})이 오늘 이후입니다."))
+    if not data.get("accident_place"):
+        missing.append(_issue("사고장소", "입력 폼에 사고장소가 없습니다."))
+    if not data.get("accident_desc"):
+        missing.append(_issue("사고경위", "입력 폼에 사고경위가 없습니다."))
+
+    # 3. 보험계약사항 + 보험기간의 사고일 포함 여부
+    contracts = data.get("contracts") or []
+    if not contracts:
+        if _POLICY_NO.search(attachments):
+            ambiguous.append(_issue("보험계약사항", "입력 폼에는 없으나 첨부자료에 증권 정보가 있어 AI 확인이 필요합니다."))
+        else:
+            missing.append(_issue("보험계약사항", "입력된 보험계약이 없고 첨부자료에서도 증권번호를 찾지 못했습니다."))
+    field_labels = {"product": "보험종목", "policy_no": "증권번호", "period": "보험기간", "coverage": "담보내역"}
+    for i, c in enumerate(contracts, 1):
+        prefix = f"계약 {i}({c.get('company', '')})"
+        for key, label in field_labels.items():
+            if not c.get(key):
+                missing.append(_issue(f"{prefix} {label}", "입력되지 않았습니다."))
+        if not c.get("period"):
+            continue
+        period = parse_period(c["period"])
+        if period is None:
+            if _OPEN_ENDED.search(c["period"]) and parse_date(c["period"]):
+                start = parse_date(c["period"])
+                if accident_date and accident_date < start:
+                    conflicting.append(_issue(
+                        f"{prefix} 보험기간",
+                        f"사고일({accident_date:%Y.%m.%d})이 보험 개시일({start:%Y.%m.%d}) 이전입니다.",
+                    ))
+            else:
+                ambiguous.append(_issue(f"{prefix} 보험기간", f"'{c['period']}'에서 시작일·종료일을 해석할 수 없습니다."))
+        elif accident_date and not (period[0] <= accident_date <= period[1]):
+            conflicting.append(_issue(
+                f"{prefix} 보험기간",
+                f"사고일({accident_date:%Y.%m.%d})이 보험기간"
+                f"({period[0]:%Y.%m.%d} ~ {period[1]:%Y.%m.%d}) 밖에 있습니다.",
+            ))
+
+    # 4. 의료정보 (KCD 코드 / 진단명)
+    kcd_codes = find_kcd_codes(corpus)
+    if not kcd_codes:
+        if any(k in corpus for k in DIAGNOSIS_KEYWORDS):
+            ambiguous.append(_issue("진단명", "진단명 언급은 있으나 KCD 코드를 찾지 못했습니다."))
+        else:
+            missing.append(_issue("진단명·치료기록", "첨부자료에서 KCD 코드나 진단명을 찾지 못했습니다."))
+
+    # 5. 약관
+    if not any(k in doc_index for k in TERMS_KEYWORDS):
+        missing.append(_issue("약관", "관련 약관 또는 장해분류표 자료가 첨부되지 않았습니다."))
+
+    # 6. 장해평가 자료
+    if not any(k in doc_index for k in DISABILITY_DOC_KEYWORDS):
+        missing.append(_issue("장해진단서", "장해진단서 등 장해평가 자료가 첨부되지 않았습니다."))
+
+    for entry in missing:
+        questions.append(f"{entry['item']} 정보를 제공해 주시기 바랍니다.")
+    for entry in conflicting:
+        questions.append(f"{entry['item']}: {entry['detail']} 어느 정보를 기준으로 할지 확인 부탁드립니다.")
+
+    # 누락·상충은 즉시 질의하고, 규칙으로 판단할 수 없는 경우(모호, 이미지·추출 실패 자료)만 AI에 넘김
+    unreadable = [t for t in texts if any(m in t for m in _EXTRACTION_FAILED)]
+    needs_model = not missing and not conflicting and bool(ambiguous or unreadable)
+
+    issues = len(missing) + len(ambiguous) + len(conflicting)
+    if issues:
+        summary = f"자동 사전검증에서 확인이 필요한 사항 {issues}건이 발견되었습니다."
+    elif unreadable:
+        summary = f"규칙 점검은 통과했으나 텍스트를 읽을 수 없는 첨부자료 {len(unreadable)}건이 있어 AI 확인이 필요합니다."
+    else:
+        summary = "자동 사전검증 결과 필수 정보가 모두 확인되었습니다."
+
+    return {
+        "status": "incomplete" if issues or unreadable else "complete",
+        "summary": summary,
+        "missing": missing,
+        "ambiguous": ambiguous,
+        "conflicting": conflicting,
+        "questions": questions,
+        "parse_error": False,
+        "needs_model": needs_model,
+        "facts": {
+            "accident_date": accident_date.isoformat() if accident_date else "",
+            "kcd_codes": kcd_codes,
+            "angles": find_angles(corpus),
+            "compression_rates": find_compression_rates(corpus),
+        },
+    }
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+프롬프트 조립기 - 시스템 프롬프트를 원본 파일별 세그먼트(프롬프트 MD 6종, 참고자료 PDF)로 나누어
+각각 내용 해시로 캐싱하고, 바뀐 파일의 세그먼트만 다시 만듭니다.
+
+- 파일 감시: 백그라운드 스레드가 주기적으로 (수정시각, 크기)를 확인하고, 달라진 파일만 다시 읽어
+  내용 해시가 바뀌었을 때 세그먼트를 무효화합니다. 프로세스 재시작 없이 MD 수정·PDF 추가가 반영됩니다.
+- 오늘 날짜: 조립된 본문과 분리된 동적 접미사라 날짜가 바뀌어도 본문을 다시 만들지 않습니다.
+- 새 참고자료 PDF의 OCR은 잠금 밖에서 하므로, 그동안 다른 세션은 이전 프롬프트를 기다림 없이 받습니다.
+
+secrets.toml 설정 예:
+    PROMPT_WATCH_INTERVAL = 2.0   # 파일 확인 주기(초)
+"""
+import hashlib
+import logging
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+from modules.report_prompt_builder import (
+    PROMPT_DIR,
+    PROMPT_FILES,
+    REFERENCE_DIR,
+    _join_references,
+    _load_cache,
+    _reference_part,
+    _reference_text,
+    _save_cache,
+    join_prompt_segments,
+)
+from modules.settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WATCH_INTERVAL = 2.0
+
+
+def date_suffix(today: date | None = None) -> str:
+    """시스템 프롬프트 끝에 붙는 오늘 날짜 안내."""
+    today_str = (today or datetime.now()).strftime("%Y년 %m월 %d일")
+    return f"\n\n---\n\n# 현재 날짜\n오늘 날짜: {today_str}\n손해사정서의 작성 날짜로 위 날짜를 사용하세요."
+
+
+class PromptAssembler:
+    """원본 파일별 세그먼트 캐시 + 조립 결과 메모이제이션."""
+
+    def __init__(self, prompt_dir: Path = PROMPT_DIR, reference_dir: Path = REFERENCE_DIR,
+                 check_interval: float = DEFAULT_WATCH_INTERVAL):
+        self.prompt_dir = prompt_dir
+        self.reference_dir = reference_dir
+        self.check_interval = check_interval
+        # _lock: 세그먼트 읽기·교체 (짧게만 잡음), _refresh_lock: 다시 만들기(파일 읽기·OCR)를 한 번에 하나만
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        # 원본 경로 → {"stat": (mtime_ns, size) | None, "sha256", "segment"}
+        self._entries: dict[str, dict] = {}
+        self._order: list[str] = []
+        self._base = None
+        self._base_version = -1
+        self._last_check = 0.0
+        self._watcher = None
+        self._stop = threading.Event()
+        self.version = 0
+        self.rebuilt = 0
+        self.reused = 0
+
+    def _sources(self) -> list[tuple[str, Path]]:
+        sources = [("prompt_file", self.prompt_dir / fname) for fname in PROMPT_FILES]
+        if self.reference_dir.exists():
+            sources.extend(("reference", p) for p in sorted(self.reference_dir.glob("*.pdf")))
+        return sources
+
+    def refresh(self) -> list[str]:
+        """원본 파일을 확인해 바뀐 세그먼트만 다시 만듭니다. 바뀐 파일명 목록을 반환합니다.
+
+        파일 읽기·참고자료 OCR(새 PDF면 수십 초)은 self._lock 밖에서 하고, 새 세그먼트로 바꿔 끼울 때만
+        잠급니다 — 그동안 다른 세션의 system_prompt()는 이전 세그먼트로 바로 응답합니다.
+        """
+        with self._refresh_lock:
+            return self._refresh()
+
+    def _refresh(self) -> list[str]:
+        """refresh() 본체 (호출자가 _refresh_lock 보유)."""
+        with self._lock:
+            entries = dict(self._entries)
+        changed = []
+        order = []
+        updates = {}
+        touched = []
+        ocr_cache = None
+        ocr_cache_dirty = False
+
+        for kind, path in self._sources():
+            key = str(path)
+            order.append(key)
+            try:
+                stat = path.stat()
+                signature = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                signature = None
+
+            entry = entries.get(key)
+            if entry is not None and entry["stat"] == signature:
+                continue
+
+            data = path.read_bytes() if signature else b""
+            digest = hashlib.sha256(data).hexdigest()
+            if entry is not None and entry["sha256"] == digest:
+                # 수정시각만 바뀜 (touch, 같은 내용으로 저장)
+                touched.append((key, signature))
+                continue
+
+            if kind == "prompt_file":
+                text = data.decode("utf-8") if signature else f"[WARNING: {path.name} 파일을 찾을 수 없습니다]"
+            else:
+                if ocr_cache is None:
+                    ocr_cache = _load_cache()
+                text, updated = _reference_text(path, ocr_cache, digest)
+                ocr_cache_dirty = ocr_cache_dirty or updated
+                text = _reference_part(path.name, text)
+
+            updates[key] = {
+                "stat": signature,
+                "sha256": digest,
+                "segment": {"kind": kind, "name": path.name, "text": text, "sha256": digest},
+            }
+            changed.append(path.name)
+
+        if ocr_cache_dirty:
+            _save_cache(ocr_cache)
+
+        with self._lock:
+            for key, signature in touched:
+                self._entries[key]["stat"] = signature
+            self._entries.update(updates)
+            for key in [k for k in self._entries if k not in order]:
+                changed.append(self._entries.pop(key)["segment"]["name"])
+            self._order = order
+            self._last_check = time.monotonic()
+            self.reused += len(touched)
+            self.rebuilt += len(updates)
+            if changed:
+                self.version += 1
+                logger.info("prompt segments rebuilt (v%d): %s", self.version, ", ".join(changed))
+        return changed
+
+    def _ensure_fresh(self):
+        """확인 주기가 지났으면 다시 확인합니다. 호출자는 self._lock을 잡고 있지 않아야 합니다.
+        처음 조립은 기다리고, 그 뒤에는 다른 스레드(감시 스레드 등)가 다시 만드는 중이면 현재 세그먼트를 씁니다."""
+        if not self._entries:
+            self.refresh()
+        elif time.monotonic() - self._last_check >= self.check_interval:
+            if self._refresh_lock.acquire(blocking=False):
+                try:
+                    self._refresh()
+                finally:
+                    self._refresh_lock.release()
+
+    def segments(self) -> list[dict]:
+        """현재 세그먼트 목록 (report_prompt_builder.load_prompt_segments()와 같은 형식 + sha256)."""
+        self._ensure_fresh()
+        with self._lock:
+            return [self._entries[key]["segment"] for key in self._order]
+
+    def base_prompt(self) -> str:
+        """날짜를 제외한 시스템 프롬프트. 세그먼트가 바뀌었을 때만 다시 결합합니다."""
+        self._ensure_fresh()
+        with self._lock:
+            if self._base_version != self.version:
+                self._base = join_prompt_segments([self._entries[key]["segment"] for key in self._order])
+                self._base_version = self.version
+            return self._base
+
+    def system_prompt(self, today: date | None = None) -> str:
+        """오늘 날짜를 붙인 시스템 프롬프트."""
+        return self.base_prompt() + date_suffix(today)
+
+    def reference_text(self) -> str:
+        """참고자료 세그먼트만 결합한 텍스트 (검수 법적 적합성 영역용)."""
+        return _join_references([s["text"] for s in self.segments() if s["kind"] == "reference"])
+
+    # ── 파일 감시 ──
+    def start_watcher(self):
+        """백그라운드 감시 스레드를 시작합니다 (이미 실행 중이면 무시)."""
+        with self._lock:
+            if self._watcher is not None and self._watcher.is_alive():
+                return
+            self._stop.clear()
+            self._watcher = threading.Thread(target=self._watch, name="prompt-watcher", daemon=True)
+            self._watcher.start()
+
+    def stop_watcher(self):
+        self._stop.set()
+
+    def _watch(self):
+        while not self._stop.wait(self.check_interval):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("prompt watcher refresh failed")
+
+    def status(self) -> dict:
+        """UI 표시용 상태 (버전, 세그먼트 수, 재생성·재사용 횟수, 감시 여부)."""
+        return {
+            "version": self.version,
+            "segments": len(self._order),
+            "rebuilt": self.rebuilt,
+            "reused": self.reused,
+            "watching": self._watcher is not None and self._watcher.is_alive(),
+        }
+
+
+_assembler: PromptAssembler | None = None
+_assembler_lock = threading.Lock()
+
+
+def get_assembler() -> PromptAssembler:
+    """프로세스 공용 조립기. 최초 호출 시 파일 감시를 시작합니다."""
+    global _assembler
+    if _assembler is None:
+        with _assembler_lock:
+            if _assembler is None:
+                interval = float(get_setting("PROMPT_WATCH_INTERVAL", DEFAULT_WATCH_INTERVAL))
+                assembler = PromptAssembler(check_interval=interval)
+                assembler.start_watcher()
+                _assembler = assembler
+    return _assembler
@@ -6,7 +6,9 @@
 import json
 from pathlib import Path
 
-import fitz  # PyMuPDF
+from modules.lazy import lazy_import
+
+fitz = lazy_import("fitz")  # PyMuPDF — 첫 사용 시 import
 
 PROJECT_ROOT = Path(__file__).parent.parent
 PROMPT_DIR = PROJECT_ROOT / "prompts" / "report"
@@ -23,6 +25,27 @@ PROMPT_FILES = [
     "06_CHECKLIST.md",
 ]
 
+# 참고자료 묶음 머리말
+REFERENCE_HEADER = (
+    "# 보고서 작성 참고자료\n\n"
+    "아래는 손해사정서 작성 시 참고해야 할 법률, 약관, 판례 자료입니다.\n\n"
+)
+
+# 초안 작성 지시 (할루시네이션 방지 강화)
+DRAFT_INSTRUCTION = (
+    "이제 손해사정서 초안을 작성하세요.\n\n"
+    "## 절대 준수 사항\n"
+    "- **제공된 자료에 명시된 수치·금액·날짜만 사용하세요.** 자료에 없는 금액이나 정보를 절대 추측하지 마세요.\n"
+    "- 보험가입금액, 증권번호, 보험기간 등은 제공된 자료의 원본 수치를 그대로 사용하세요.\n"
+    "- 제공되지 않은 정보는 반드시 '정보 미제공'으로 표시하세요. 임의로 채우지 마세요.\n"
+    "- 담보내역, 보험금액은 첨부자료(보험증권)에 기재된 그대로만 기재하세요.\n\n"
+    "## 작성 형식\n"
+    "- 03_DOCUMENT_STRUCTURE.md의 구조(첫 페이지 공문 → Ⅰ~Ⅵ 섹션)를 정확히 따르세요.\n"
+    "- 04_TONE_AND_STYLE.md의 문체·서식 규칙을 준수하세요.\n"
+    "- 마크다운 형식으로 작성하되, Typora에서 PDF 변환이 가능하도록 구성하세요.\n"
+    "- 각 주요 섹션 앞에 <div style=\"page-break-before: always;\"></div>를 삽입하세요."
+)
+
 
 def _extract_pdf_text_pymupdf(pdf_path: Path) -> str:
     """PyMuPDF로 텍스트 추출 시도. 한글 비율이 낮으면 빈 문자열 반환."""
@@ -36,31 +59,19 @@ def _extract_pdf_text_pymupdf(pdf_path: Path) -> str:
 
 
 def _extract_pdf_text_gemini(pdf_path: Path) -> str:
-    """Gemini에 PDF 파일을 직접 전송하여 텍스트 추출 (1회 API 호출)."""
-    from google import genai
-    from google.genai import types
-    from modules.report_ai_client import get_api_key, DEFAULT_MODEL
+    """Gemini에 PDF 파일을 직접 전송하여 텍스트 추출 (1회 API 호출, 스케줄러 경유)."""
+    from modules.llm_backends import needs_api_key
+    from modules.report_ai_client import get_api_key, ocr_pdf
 
     api_key = get_api_key()
-    if not api_key:
+    if not api_key and needs_api_key():
         return "[API 키 미설정 - OCR 불가]"
 
-    pdf_bytes = pdf_path.read_bytes()
+    doc = fitz.open(pdf_path)
+    page_count = doc.page_count
+    doc.close()
     try:
-        client = genai.Client(api_key=api_key)
-        response = client.models.generate_content(
-            model=DEFAULT_MODEL,
-            contents=[
-                types.Content(role="user", parts=[
-                    types.Part.from_bytes(data=pdf_bytes, mime_type="application/pdf"),
-                    types.Part.from_text(
-                        text="이 PDF 문서의 모든 텍스트를 원문 그대로 추출해주세요. "
-                             "추가 설명 없이 문서 내용만 출력하세요."
-                    ),
-                ])
-            ],
-        )
-        return response.text
+        return ocr_pdf(pdf_path.read_bytes(), page_count, api_key=api_key)
     except Exception as e:
         return f"[PDF 텍스트 추출 실패: {e}]"
 
@@ -80,62 +91,97 @@ def _save_cache(cache: dict):
     CACHE_FILE.write_text(json.dumps(cache, ensure_ascii=False, indent=2), encoding="utf-8")
 
 
-def _load_reference_pdfs() -> str:
-    """참고자료 폴더의 PDF를 읽어 텍스트로 변환. 캐시 사용."""
+def _reference_text(pdf_path: Path, cache: dict, digest: str | None = None) -> tuple[str, bool]:
+    """참고자료 PDF 1개의 텍스트를 반환합니다. (텍스트, 캐시 갱신 여부)
+
+    캐시 항목의 수정시간 또는 내용 해시(digest)가 같으면 캐시를 사용합니다.
+    """
+    fname = pdf_path.name
+    mtime = str(pdf_path.stat().st_mtime)
+    entry = cache.get(fname, {})
+    if entry.get("mtime") == mtime or (digest and entry.get("sha256") == digest):
+        return entry["text"], False
+
+    # PyMuPDF 시도 → 실패 시 Gemini Vision OCR
+    text = _extract_pdf_text_pymupdf(pdf_path)
+    if not text:
+        text = _extract_pdf_text_gemini(pdf_path)
+    cache[fname] = {"mtime": mtime, "text": text}
+    if digest:
+        cache[fname]["sha256"] = digest
+    return text, True
+
+
+def _load_reference_texts() -> list[tuple[str, str]]:
+    """참고자료 폴더의 PDF를 읽어 [(파일명, 텍스트)]로 반환. 캐시 사용."""
     if not REFERENCE_DIR.exists():
-        return ""
+        return []
 
     cache = _load_cache()
-    parts = []
+    texts = []
     updated = False
 
     for pdf_path in sorted(REFERENCE_DIR.glob("*.pdf")):
-        fname = pdf_path.name
-        # 캐시에 있고 파일 수정시간이 같으면 캐시 사용
-        mtime = str(pdf_path.stat().st_mtime)
-        if fname in cache and cache[fname].get("mtime") == mtime:
-            text = cache[fname]["text"]
-        else:
-            # PyMuPDF 시도 → 실패 시 Gemini Vision OCR
-            text = _extract_pdf_text_pymupdf(pdf_path)
-            if not text:
-                text = _extract_pdf_text_gemini(pdf_path)
-            cache[fname] = {"mtime": mtime, "text": text}
-            updated = True
-
-        parts.append(f"### 참고자료: {fname}\n\n{text}")
+        text, changed = _reference_text(pdf_path, cache)
+        updated = updated or changed
+        texts.append((pdf_path.name, text))
 
     if updated:
         _save_cache(cache)
+    return texts
+
+
+def _reference_part(fname: str, text: str) -> str:
+    return f"### 참고자료: {fname}\n\n{text}"
 
+
+def _join_references(parts: list[str]) -> str:
     if not parts:
         return ""
-    return (
-        "# 보고서 작성 참고자료\n\n"
-        "아래는 손해사정서 작성 시 참고해야 할 법률, 약관, 판례 자료입니다.\n\n"
-        + "\n\n---\n\n".join(parts)
-    )
+    return REFERENCE_HEADER + "\n\n---\n\n".join(parts)
 
 
-def load_prompt_files() -> str:
-    """6개 프롬프트 MD 파일 + 참고자료 PDF를 읽어 하나의 시스템 프롬프트 문자열로 결합합니다."""
-    parts = []
+def _load_reference_pdfs() -> str:
+    """참고자료 폴더의 PDF를 읽어 텍스트로 변환. 캐시 사용."""
+    return _join_references([_reference_part(f, t) for f, t in _load_reference_texts()])
+
+
+def load_prompt_segments() -> list[dict]:
+    """시스템 프롬프트를 구성하는 세그먼트 목록을 반환합니다.
+
+    Returns:
+        [{"kind": "prompt_file"|"reference", "name": 파일명, "text": 본문}, ...]
+        (PROMPT_FILES 순서, 이어서 참고자료 PDF 파일명 순서)
+    """
+    segments = []
     for fname in PROMPT_FILES:
         fpath = PROMPT_DIR / fname
         if fpath.exists():
-            parts.append(fpath.read_text(encoding="utf-8"))
+            text = fpath.read_text(encoding="utf-8")
         else:
-            parts.append(f"[WARNING: {fname} 파일을 찾을 수 없습니다]")
-    prompt = "\n\n---\n\n".join(parts)
+            text = f"[WARNING: {fname} 파일을 찾을 수 없습니다]"
+        segments.append({"kind": "prompt_file", "name": fname, "text": text})
+    for fname, text in _load_reference_texts():
+        segments.append({"kind": "reference", "name": fname, "text": _reference_part(fname, text)})
+    return segments
+
+
+def join_prompt_segments(segments: list[dict]) -> str:
+    """세그먼트 목록을 하나의 시스템 프롬프트 문자열로 결합합니다."""
+    prompt = "\n\n---\n\n".join(s["text"] for s in segments if s["kind"] == "prompt_file")
 
     # 참고자료 PDF 텍스트 추가
-    ref_text = _load_reference_pdfs()
+    ref_text = _join_references([s["text"] for s in segments if s["kind"] == "reference"])
     if ref_text:
         prompt += "\n\n---\n\n" + ref_text
-
     return prompt
 
 
+def load_prompt_files() -> str:
+    """6개 프롬프트 MD 파일 + 참고자료 PDF를 읽어 하나의 시스템 프롬프트 문자열로 결합합니다."""
+    return join_prompt_segments(load_prompt_segments())
+
+
 def build_user_message(data: dict, uploaded_texts: list[str] | None = None) -> str:
     """폼 입력값 + 업로드 문서 텍스트를 사용자 메시지 형식으로 구성합니다."""
     lines = ["# 손해사정서 작성 요청\n"]
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+검수 엔진 모듈 - 06_CHECKLIST.md의 6개 영역을 영역별 전용 프롬프트로 동시에 점검합니다.
+영역마다 독립된 API 호출을 병렬로 실행하므로 검수 시간은 가장 느린 영역 1건의 시간과 같습니다.
+"""
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable
+
+from modules.report_ai_client import send_message
+from modules.report_prompt_assembler import get_assembler
+from modules.report_prompt_builder import PROMPT_DIR
+
+CHECKLIST_FILE = PROMPT_DIR / "06_CHECKLIST.md"
+
+# 영역 번호별 입력 자료 범위
+# sources: 입력 자료(폼 + 첨부자료) 포함 여부 / references: 참고자료(법률·약관·판례) 포함 여부
+AREA_INPUTS = {
+    1: {"sources": True, "references": False},   # 사실관계 정확성
+    2: {"sources": True, "references": False},   # 논리적 일관성
+    3: {"sources": True, "references": False},   # 계산 정확성
+    4: {"sources": False, "references": True},   # 법적 적합성
+    5: {"sources": False, "references": False},  # 형식적 완결성
+    6: {"sources": True, "references": False},   # 할루시네이션 검증
+}
+
+_AREA_HEADER = re.compile(r"^##\s+(\d+)\.\s+(.+)$")
+_CHECK_ITEM = re.compile(r"^-\s+\[[ xX]\]\s+(.+)$")
+_VERDICT = re.compile(r"판정\s*[:：]\s*\**\s*(미통과|통과)")
+
+
+def load_checklist_areas() -> list[dict]:
+    """06_CHECKLIST.md를 영역 단위로 분해합니다.
+
+    Returns:
+        [{"number": 1, "title": "사실관계 정확성", "items": ["...", ...]}, ...]
+    """
+    if not CHECKLIST_FILE.exists():
+        return []
+
+    areas = []
+    current = None
+    for line in CHECKLIST_FILE.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        m = _AREA_HEADER.match(line)
+        if m:
+            current = {"number": int(m.group(1)), "title": m.group(2).strip(), "items": []}
+            areas.append(current)
+            continue
+        if current is None:
+            continue
+        if line.startswith("---") or line.startswith("# "):
+            current = None
+            continue
+        m = _CHECK_ITEM.match(line)
+        if m:
+            current["items"].append(m.group(1).strip())
+    return [a for a in areas if a["items"]]
+
+
+def build_area_prompt(area: dict) -> str:
+    """영역 1개만 점검하는 소형 시스템 프롬프트를 구성합니다."""
+    items = "\n".join(f"- {item}" for item in area["items"])
+    return (
+        "당신은 손해사정서 품질 검수 담당자입니다.\n"
+        f"아래 손해사정서 초안을 **'{area['number']}. {area['title']}'** 영역에 한해서만 점검합니다.\n"
+        "다른 영역의 문제는 보고하지 마십시오.\n\n"
+        f"## 점검 항목\n{items}\n\n"
+        "## 응답 형식\n"
+        "첫 줄에 반드시 `판정: 통과` 또는 `판정: 미통과` 중 하나만 쓰십시오.\n"
+        "이어서 점검 항목별 확인 결과를 글머리표로 간결하게 적고,\n"
+        "미통과 항목은 초안의 해당 문장을 인용하여 구체적인 수정 사항을 제시하십시오.\n"
+        "제공된 자료로 확인할 수 없는 내용은 추측하지 말고 '확인 불가'로 표시하십시오."
+    )
+
+
+def build_area_message(area: dict, draft: str, source_text: str, reference_text: str) -> str:
+    """영역별 점검 요청 메시지(초안 + 필요한 근거 자료)를 구성합니다."""
+    inputs = AREA_INPUTS.get(area["number"], {"sources": True, "references": False})
+    parts = []
+    if inputs["sources"] and source_text:
+        parts.append(f"# 제공된 입력 자료\n\n{source_text}")
+    if inputs["references"] and reference_text:
+        parts.append(reference_text)
+    parts.append(f"# 검수 대상 손해사정서 초안\n\n{draft}")
+    return "\n\n---\n\n".join(parts)
+
+
+def parse_verdict(text: str) -> bool | None:
+    """응답의 판정 줄을 해석합니다. 통과=True, 미통과=False, 판정 불명=None."""
+    m = _VERDICT.search(text or "")
+    if not m:
+        return None
+    return m.group(1) == "통과"
+
+
+def _check_area(area: dict, draft: str, source_text: str, reference_text: str,
+                api_key: str | None, session: str | None = None) -> dict:
+    """영역 1개를 점검합니다. 예외는 결과 dict의 error로 기록합니다."""
+    result = {
+        "number": area["number"],
+        "title": area["title"],
+        "passed": None,
+        "findings": "",
+        "error": "",
+    }
+    try:
+        findings = send_message(
+            build_area_prompt(area),
+            [{"role": "user", "content": build_area_message(area, draft, source_text, reference_text)}],
+            api_key=api_key,
+            stream=False,
+            step="review",
+            session=session,
+        )
+        result["findings"] = (findings or "").strip()
+        result["passed"] = parse_verdict(result["findings"])
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def run_review(
+    draft: str,
+    source_text: str = "",
+    api_key: str | None = None,
+    on_result: Callable[[dict], None] | None = None,
+    session: str | None = None,
+) -> list[dict]:
+    """체크리스트 6개 영역을 동시에 점검합니다.
+
+    Args:
+        draft: 검수 대상 초안 (마크다운)
+        source_text: 입력 자료 원문 (폼 입력 + 첨부자료 텍스트)
+        api_key: API 키 (워커 스레드에서 secrets 접근을 피하려면 명시 전달)
+        on_result: 영역별 결과가 도착할 때마다 호출되는 콜백 (호출 스레드에서 실행)
+        session: 스케줄러 공정 대기열 키 (사건 ID)
+
+    Returns:
+        영역 번호순으로 정렬된 결과 dict 리스트
+    """
+    areas = load_checklist_areas()
+    if not areas:
+        return []
+
+    reference_text = ""
+    if any(AREA_INPUTS.get(a["number"], {}).get("references") for a in areas):
+        reference_text = get_assembler().reference_text()
+
+    results = []
+    with ThreadPoolExecutor(max_workers=len(areas)) as pool:
+        futures = [
+            pool.submit(_check_area, area, draft, source_text, reference_text, api_key, session)
+            for area in areas
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if on_result:
+                on_result(result)
+
+    results.sort(key=lambda r: r["number"])
+    return results
+
+
+def _verdict_label(result: dict) -> str:
+    if result["error"]:
+        return "⚠️ 오류"
+    if result["passed"] is None:
+        return "❔ 판정 불명"
+    return "✅ 통과" if result["passed"] else "❌ 미통과"
+
+
+def format_review_report(results: list[dict]) -> str:
+    """영역별 결과를 하나의 검수 보고서(마크다운)로 취합합니다."""
+    if not results:
+        return "체크리스트(06_CHECKLIST.md)를 찾을 수 없어 검수를 수행하지 못했습니다."
+
+    passed = sum(1 for r in results if r["passed"] is True)
+    lines = [
+        "# 품질 검수 결과",
+        "",
+        f"**{len(results)}개 영역 중 {passed}개 통과**",
+        "",
+        "| 영역 | 판정 |",
+        "|---|---|",
+    ]
+    for r in results:
+        lines.append(f"| {r['number']}. {r['title']} | {_verdict_label(r)} |")
+
+    for r in results:
+        lines.append("")
+        lines.append(f"## {r['number']}. {r['title']} — {_verdict_label(r)}")
+        lines.append("")
+        if r["error"]:
+            lines.append(f"검수 호출 실패: {r['error']}")
+        else:
+            body = _VERDICT.sub("", r["findings"], count=1).strip()
+            lines.append(body or "(세부 내용 없음)")
+
+    return "\n".join(lines)
+
+
+def all_passed(results: list[dict]) -> bool:
+    """모든 영역이 통과했는지 여부."""
+    return bool(results) and all(r["passed"] is True for r in results)
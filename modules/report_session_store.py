@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+"""
+세션 저장소 모듈 - 보고서 작업의 대용량 텍스트(대화 히스토리, 첨부자료 텍스트, 초안, 검수 결과)를
+SQLite에 압축 저장하고 st.session_state에는 핸들(해시)만 보관합니다.
+같은 내용은 한 번만 저장되며(content-addressed), 읽을 때 필요한 것만 불러옵니다.
+
+정리(collect_garbage): 첨부자료·대화에는 개인정보(주민번호, 의무기록)가 들어 있으므로 무기한 보관하지 않습니다.
+- CASE_RETENTION_DAYS 동안 갱신되지 않은 사건 상태는 삭제합니다.
+- 남은 사건 상태 어디에서도 참조하지 않는 blob(첫 메시지 재작성·수정 요청으로 대체된 이전 버전 등)은 삭제합니다.
+  방금 저장했지만 아직 사건 상태에 기록되기 전인 blob을 지우지 않도록 BLOB_GRACE_SECONDS 이내 것은 남깁니다.
+- 삭제한 내용은 secure_delete로 0으로 덮어씁니다.
+
+secrets.toml 설정 예:
+    CASE_RETENTION_DAYS = 180
+"""
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+
+from modules.settings import get_setting
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DATA_DIR = PROJECT_ROOT / "data"
+DB_PATH = DATA_DIR / "report_sessions.sqlite3"
+
+# 프로세스 공용 읽기 캐시 상한 (압축 해제된 텍스트의 문자 수)
+CACHE_BUDGET_CHARS = 32 * 1024 * 1024
+
+DEFAULT_RETENTION_DAYS = 180
+# 참조되지 않아도 이 시간 안에 저장(put_text)된 blob은 남김
+BLOB_GRACE_SECONDS = 60 * 60
+# save_case_state가 대체된 blob을 바로 지우지 않는 최근 저장 범위
+RELEASE_GUARD_SECONDS = 5
+# collect_garbage() 자동 실행 최소 간격 (force=True면 무시)
+GC_INTERVAL_SECONDS = 60 * 60
+
+_HANDLE_RE = re.compile(r"[0-9a-f]{32}")
+
+_cache: "OrderedDict[str, str]" = OrderedDict()
+_cache_chars = 0
+_cache_lock = threading.Lock()
+_init_lock = threading.Lock()
+_initialized = False
+_gc_lock = threading.Lock()
+_last_gc = 0.0
+
+
+def _connect() -> sqlite3.Connection:
+    """DB 연결을 엽니다. 최초 호출 시 스키마를 생성합니다."""
+    global _initialized
+    if not _initialized:
+        with _init_lock:
+            if not _initialized:
+                DATA_DIR.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(DB_PATH, timeout=30)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS blobs ("
+                    " handle TEXT PRIMARY KEY,"
+                    " data BLOB NOT NULL,"
+                    " size INTEGER NOT NULL,"
+                    " created_at REAL NOT NULL)"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS cases ("
+                    " case_id TEXT PRIMARY KEY,"
+                    " state TEXT NOT NULL,"
+                    " updated_at REAL NOT NULL)"
+                )
+                conn.commit()
+                conn.close()
+                _initialized = True
+    return sqlite3.connect(DB_PATH, timeout=30)
+
+
+def _remember(handle: str, text: str):
+    """읽기 캐시에 추가하고 예산을 넘으면 오래된 항목부터 제거합니다."""
+    global _cache_chars
+    size = len(text)
+    if size > CACHE_BUDGET_CHARS // 4:
+        return
+    with _cache_lock:
+        if handle in _cache:
+            _cache.move_to_end(handle)
+            return
+        _cache[handle] = text
+        _cache_chars += size
+        while _cache_chars > CACHE_BUDGET_CHARS and _cache:
+            _, old = _cache.popitem(last=False)
+            _cache_chars -= len(old)
+
+
+def _forget(handles):
+    """삭제된 blob을 읽기 캐시에서도 제거합니다."""
+    global _cache_chars
+    with _cache_lock:
+        for handle in handles:
+            text = _cache.pop(handle, None)
+            if text is not None:
+                _cache_chars -= len(text)
+
+
+def text_handle(text: str) -> str:
+    """텍스트의 핸들(SHA-256 앞 32자)을 계산합니다."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def put_text(text: str) -> str:
+    """텍스트를 압축 저장하고 핸들을 반환합니다. 빈 문자열은 빈 핸들("")을 반환합니다.
+
+    이미 있는 내용이면 저장 시각(created_at)만 갱신합니다 — 정리 작업이 참조 기록 직전의 blob을 지우지 않도록.
+    """
+    if not text:
+        return ""
+    handle = text_handle(text)
+    conn = _connect()
+    try:
+        touched = conn.execute(
+            "UPDATE blobs SET created_at = ? WHERE handle = ?", (time.time(), handle)
+        ).rowcount
+        if not touched:
+            raw = text.encode("utf-8")
+            conn.execute(
+                "INSERT OR IGNORE INTO blobs (handle, data, size, created_at) VALUES (?, ?, ?, ?)",
+                (handle, zlib.compress(raw, 6), len(raw), time.time()),
+            )
+        conn.commit()
+    finally:
+        conn.close()
+    _remember(handle, text)
+    return handle
+
+
+def get_text(handle: str) -> str:
+    """핸들로 텍스트를 불러옵니다. 빈 핸들은 빈 문자열입니다.
+
+    Raises:
+        KeyError: 저장소에 없는 핸들
+    """
+    if not handle:
+        return ""
+    with _cache_lock:
+        if handle in _cache:
+            _cache.move_to_end(handle)
+            return _cache[handle]
+
+    conn = _connect()
+    try:
+        row = conn.execute("SELECT data FROM blobs WHERE handle = ?", (handle,)).fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        raise KeyError(f"세션 저장소에 없는 핸들입니다: {handle}")
+    text = zlib.decompress(row[0]).decode("utf-8")
+    _remember(handle, text)
+    return text
+
+
+def put_messages(messages: list[dict]) -> list[dict]:
+    """대화 히스토리를 저장하고 핸들 목록 [{"role", "ref"}]을 반환합니다."""
+    return [{"role": m["role"], "ref": put_text(m["content"])} for m in messages]
+
+
+def get_messages(refs: list[dict]) -> list[dict]:
+    """핸들 목록을 대화 히스토리 [{"role", "content"}]로 복원합니다."""
+    return [{"role": r["role"], "content": get_text(r["ref"])} for r in refs]
+
+
+def store_stats() -> dict:
+    """저장소 통계 (blob 수, 원본/압축 바이트, DB 파일 크기, 읽기 캐시 문자 수)."""
+    if not DB_PATH.exists():
+        return {"blobs": 0, "raw_bytes": 0, "stored_bytes": 0, "file_bytes": 0, "cache_chars": _cache_chars}
+    conn = _connect()
+    try:
+        count, raw, stored = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM blobs"
+        ).fetchone()
+    finally:
+        conn.close()
+    return {
+        "blobs": count,
+        "raw_bytes": raw,
+        "stored_bytes": stored,
+        "file_bytes": DB_PATH.stat().st_size,
+        "cache_chars": _cache_chars,
+    }
+
+
+# ── 사건(case) 상태 스냅샷 ─────────────────────────────────
+# 페이지 새로고침 후에도 case ID(URL ?case=)로 작업 상태를 복원할 수 있도록
+# session_state의 작은 값(단계, 입력값, 핸들)만 JSON으로 저장합니다.
+
+def save_case_state(case_id: str, state: dict):
+    """사건 상태 스냅샷을 저장합니다 (덮어쓰기).
+
+    이전 스냅샷에는 있었지만 새 스냅샷에서 빠진 blob(재작성된 메시지의 이전 버전 등)은
+    다른 사건이 참조하지 않으면 바로 삭제합니다. 방금(RELEASE_GUARD_SECONDS 이내) 저장된 blob은
+    다른 세션이 같은 내용을 저장한 직후일 수 있으므로 collect_garbage에 맡깁니다.
+    """
+    now = time.time()
+    conn = _connect()
+    released = []
+    try:
+        conn.execute("PRAGMA secure_delete=ON")
+        row = conn.execute("SELECT state FROM cases WHERE case_id = ?", (case_id,)).fetchone()
+        dropped = _state_handles(json.loads(row[0])) - _state_handles(state) if row else set()
+        conn.execute(
+            "INSERT OR REPLACE INTO cases (case_id, state, updated_at) VALUES (?, ?, ?)",
+            (case_id, json.dumps(state, ensure_ascii=False), now),
+        )
+        for handle in dropped:
+            if conn.execute("SELECT 1 FROM cases WHERE instr(state, ?) > 0 LIMIT 1", (handle,)).fetchone():
+                continue
+            if conn.execute("DELETE FROM blobs WHERE handle = ? AND created_at < ?",
+                            (handle, now - RELEASE_GUARD_SECONDS)).rowcount:
+                released.append(handle)
+        conn.commit()
+    finally:
+        conn.close()
+    _forget(released)
+
+
+def load_case_state(case_id: str) -> dict | None:
+    """사건 상태 스냅샷을 불러옵니다. 없으면 None."""
+    conn = _connect()
+    try:
+        row = conn.execute("SELECT state FROM cases WHERE case_id = ?", (case_id,)).fetchone()
+    finally:
+        conn.close()
+    return json.loads(row[0]) if row else None
+
+
+def iter_case_states():
+    """저장된 모든 사건 상태를 (case_id, state, updated_at)로 순회합니다 (색인 재구성용)."""
+    if not DB_PATH.exists():
+        return
+    conn = _connect()
+    try:
+        rows = conn.execute("SELECT case_id, state, updated_at FROM cases ORDER BY updated_at").fetchall()
+    finally:
+        conn.close()
+    for case_id, state, updated_at in rows:
+        yield case_id, json.loads(state), updated_at
+
+
+# ── 정리 (보존 기간 + 참조 기반) ────────────────────────────
+
+def _state_handles(state) -> set[str]:
+    """사건 상태 안의 모든 blob 핸들 (메시지 ref, 첨부자료·초안 핸들 등 — 키 이름과 무관하게 수집)."""
+    if isinstance(state, dict):
+        return set().union(*(_state_handles(v) for v in state.values())) if state else set()
+    if isinstance(state, list):
+        return set().union(*(_state_handles(v) for v in state)) if state else set()
+    if isinstance(state, str) and _HANDLE_RE.fullmatch(state):
+        return {state}
+    return set()
+
+
+def retention_seconds() -> float:
+    """사건 보존 기간 (초, 설정 CASE_RETENTION_DAYS) — 사건 색인도 같은 기간을 씁니다."""
+    return float(get_setting("CASE_RETENTION_DAYS", DEFAULT_RETENTION_DAYS)) * 86400
+
+
+def collect_garbage(force: bool = False, now: float | None = None) -> dict:
+    """보존 기간이 지난 사건 상태와 어디에서도 참조하지 않는 blob을 삭제합니다.
+    force=False면 GC_INTERVAL_SECONDS에 한 번만 실행합니다. 실패는 로그만 남깁니다.
+
+    Returns:
+        {"expired": 삭제한 사건 ID 목록, "blobs": 삭제한 blob 수, "bytes": 삭제한 압축 바이트}
+    """
+    global _last_gc
+    result = {"expired": [], "blobs": 0, "bytes": 0}
+    now = now or time.time()
+    with _gc_lock:
+        if not DB_PATH.exists() or (not force and now - _last_gc < GC_INTERVAL_SECONDS):
+            return result
+        _last_gc = now
+        try:
+            conn = _connect()
+            try:
+                conn.execute("PRAGMA secure_delete=ON")
+                with conn:
+                    result["expired"] = [row[0] for row in conn.execute(
+                        "SELECT case_id FROM cases WHERE updated_at < ?", (now - retention_seconds(),)
+                    )]
+                    conn.executemany("DELETE FROM cases WHERE case_id = ?", [(c,) for c in result["expired"]])
+
+                    referenced = set()
+                    for (state,) in conn.execute("SELECT state FROM cases"):
+                        referenced |= _state_handles(json.loads(state))
+                    doomed = [
+                        (handle, stored) for handle, stored in conn.execute(
+                            "SELECT handle, LENGTH(data) FROM blobs WHERE created_at < ?", (now - BLOB_GRACE_SECONDS,)
+                        ) if handle not in referenced
+                    ]
+                    conn.executemany("DELETE FROM blobs WHERE handle = ?", [(h,) for h, _ in doomed])
+                # WAL에 남은 삭제 전 페이지도 비움
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            finally:
+                conn.close()
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning("session store cleanup failed: %s", e)
+            return result
+
+    _forget(handle for handle, _ in doomed)
+    result["blobs"] = len(doomed)
+    result["bytes"] = sum(stored for _, stored in doomed)
+    if result["expired"] or doomed:
+        logger.info("session store cleanup: %d cases expired, %d blobs (%d bytes) deleted",
+                    len(result["expired"]), result["blobs"], result["bytes"])
+    return result
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+자료 검증 모듈 - 검증 단계 응답을 JSON 스키마로 받아 구조화된 결과로 다룹니다.
+응답 문구를 키워드로 추측하지 않고 status 필드로 완료 여부를 판단합니다.
+"""
+import json
+import re
+
+from modules.report_ai_client import send_message
+
+# ── 응답 스키마 (Gemini response_schema 형식) ───────────────
+_ITEM_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "item": {"type": "STRING", "description": "해당 정보 항목 (예: 보험기간, 사고일시)"},
+        "detail": {"type": "STRING", "description": "누락·모호·상충 내용 설명 (상충 시 자료별 기재 내용 병기)"},
+    },
+    "required": ["item", "detail"],
+}
+
+VERIFICATION_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "status": {
+            "type": "STRING",
+            "enum": ["complete", "incomplete"],
+            "description": "필수 정보가 모두 충분하면 complete, 하나라도 누락·모호·상충이 있으면 incomplete",
+        },
+        "summary": {"type": "STRING", "description": "검증 결과 한두 문장 요약"},
+        "missing": {"type": "ARRAY", "items": _ITEM_SCHEMA},
+        "ambiguous": {"type": "ARRAY", "items": _ITEM_SCHEMA},
+        "conflicting": {"type": "ARRAY", "items": _ITEM_SCHEMA},
+        "questions": {
+            "type": "ARRAY",
+            "items": {"type": "STRING"},
+            "description": "사용자에게 확인할 질문 (05_DATA_PROTOCOL.md 질의 프로토콜 기준)",
+        },
+    },
+    "required": ["status", "summary", "missing", "ambiguous", "conflicting", "questions"],
+}
+
+VERIFY_INSTRUCTION = (
+    "위 자료를 검토하여 손해사정서 작성에 필요한 필수 정보가 모두 제공되었는지 확인하세요.\n"
+    "02_PROCESS.md의 Phase 1에 따라 필수정보(피보험자 인적사항, 보험계약사항, 사고정보, "
+    "의료정보, 약관, 장해평가)를 점검하세요.\n\n"
+    "결과는 지정된 JSON 스키마로만 응답하세요.\n"
+    "- 누락 항목은 missing, 모호한 항목은 ambiguous, 자료 간 상충은 conflicting에 기재하세요.\n"
+    "- 사용자에게 확인할 사항은 05_DATA_PROTOCOL.md의 질의 프로토콜 취지에 맞게 questions에 작성하세요.\n"
+    "- 위 세 목록이 모두 비어 있을 때만 status를 complete로 하세요."
+)
+
+ISSUE_KINDS = [
+    ("missing", "정보 확인 요청 (누락)"),
+    ("ambiguous", "명확화 요청 (모호)"),
+    ("conflicting", "정보 상충 확인 요청"),
+]
+
+_CODE_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def parse_verification(text: str) -> dict:
+    """검증 응답(JSON 문자열)을 정규화된 dict로 변환합니다.
+
+    JSON 해석에 실패하면 status=incomplete, parse_error=True로 반환하고 원문은 summary에 보존합니다.
+    """
+    result = {
+        "status": "incomplete",
+        "summary": "",
+        "missing": [],
+        "ambiguous": [],
+        "conflicting": [],
+        "questions": [],
+        "parse_error": False,
+    }
+    try:
+        data = json.loads(_CODE_FENCE.sub("", (text or "").strip()))
+        if not isinstance(data, dict):
+            raise ValueError("JSON 객체가 아닙니다.")
+    except (ValueError, TypeError):
+        result["summary"] = (text or "").strip()
+        result["parse_error"] = True
+        return result
+
+    result["status"] = "complete" if data.get("status") == "complete" else "incomplete"
+    result["summary"] = str(data.get("summary") or "")
+    for kind, _ in ISSUE_KINDS:
+        items = []
+        for entry in data.get(kind) or []:
+            if isinstance(entry, dict):
+                items.append({"item": str(entry.get("item", "")), "detail": str(entry.get("detail", ""))})
+            elif entry:
+                items.append({"item": str(entry), "detail": ""})
+        result[kind] = items
+    result["questions"] = [str(q) for q in data.get("questions") or [] if q]
+    return result
+
+
+def is_complete(result: dict) -> bool:
+    """검증 완료 여부. status가 complete이고 미해결 항목이 없어야 완료로 봅니다."""
+    return (
+        result.get("status") == "complete"
+        and not result.get("parse_error")
+        and not any(result.get(kind) for kind, _ in ISSUE_KINDS)
+    )
+
+
+def format_verification(result: dict) -> str:
+    """검증 결과를 대화 히스토리·화면 표시용 마크다운으로 변환합니다."""
+    if result.get("parse_error"):
+        return result.get("summary") or "검증 응답을 해석하지 못했습니다."
+
+    lines = []
+    if is_complete(result):
+        lines.append("**자료 검증 완료** — 초안 작성에 필요한 정보가 충분합니다.")
+    else:
+        lines.append("**자료 검증 결과 — 확인이 필요한 사항이 있습니다.**")
+    if result.get("summary"):
+        lines.append("")
+        lines.append(result["summary"])
+
+    for kind, label in ISSUE_KINDS:
+        items = result.get(kind) or []
+        if not items:
+            continue
+        lines.append("")
+        lines.append(f"#### {label}")
+        for i, entry in enumerate(items, 1):
+            detail = f": {entry['detail']}" if entry.get("detail") else ""
+            lines.append(f"{i}. **{entry['item']}**{detail}")
+
+    if result.get("questions"):
+        lines.append("")
+        lines.append("#### 질문")
+        for i, q in enumerate(result["questions"], 1):
+            lines.append(f"{i}. {q}")
+
+    return "\n".join(lines)
+
+
+def verify_case(system_prompt: str, messages: list[dict], api_key: str | None = None,
+                session: str | None = None, on_wait=None) -> dict:
+    """대화 히스토리 기준으로 자료 검증을 수행하고 구조화된 결과를 반환합니다.
+
+    session / on_wait는 send_message의 스케줄러 인자로 그대로 전달됩니다.
+    """
+    text = send_message(
+        system_prompt,
+        messages,
+        api_key=api_key,
+        stream=False,
+        step="verification",
+        response_schema=VERIFICATION_SCHEMA,
+        session=session,
+        on_wait=on_wait,
+    )
+    return parse_verification(text)
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""
+설정 모듈 - secrets.toml / 환경변수에서 운영 설정값을 읽습니다.
+"""
+import os
+
+
+def get_setting(name: str, default=None):
+    """설정값을 로드합니다. secrets.toml 우선, 없으면 환경변수 JISAN_<NAME>, 둘 다 없으면 기본값.
+
+    secrets.toml의 섹션(테이블)은 dict로 반환됩니다.
+    """
+    try:
+        import streamlit as st
+
+        value = st.secrets[name]
+        if hasattr(value, "to_dict"):
+            value = value.to_dict()
+        return value
+    except Exception:
+        pass
+
+    env_value = os.environ.get(f"JISAN_{name.upper()}")
+    if env_value is not None:
+        return env_value
+    return default
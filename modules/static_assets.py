@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+정적 자산 파이프라인 - assets/의 CSS를 최소화하고 내용 해시를 붙여 static/에 쓰고,
+페이지에는 <link> 한 줄만 넣습니다. Streamlit 정적 파일 서빙(.streamlit/config.toml의
+server.enableStaticServing)이 static/을 app/static/ 경로로 내보냅니다.
+
+- 파일명에 내용 해시가 들어가므로 CSS가 바뀌면 URL도 바뀝니다. 브라우저는 같은 URL을 다시 받지 않고
+  (ETag 재검증), 수정 직후에도 예전 캐시를 쓰지 않습니다.
+- rerun마다 보내는 것은 <link> 태그뿐이라 인라인 <style>을 매번 다시 보내지 않습니다.
+- 정적 파일 서빙이 꺼져 있거나 static/에 쓸 수 없으면 최소화한 CSS를 인라인 <style>로 넣습니다.
+
+배포 전 미리 빌드 (읽기 전용 파일시스템 등):
+    python -m modules.static_assets
+"""
+import hashlib
+import logging
+import re
+import threading
+from pathlib import Path
+
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+ASSETS_DIR = PROJECT_ROOT / "assets"
+# Streamlit은 메인 스크립트(Home.py) 옆의 static/ 폴더를 app/static/으로 서빙
+STATIC_DIR = PROJECT_ROOT / "static"
+STATIC_URL = "app/static"
+HASH_CHARS = 10
+
+_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_SPACE_RE = re.compile(r"\s+")
+# 앞뒤 공백이 의미 없는 구두점 (+, - 는 calc()에서 공백이 필요하므로 제외)
+_PUNCT_RE = re.compile(r"\s*([{};,>])\s*")
+
+# 자산 이름 → ((mtime_ns, size), 최소화한 CSS, static/ 파일명 | None)
+_built: dict[str, tuple[tuple[int, int], str, str | None]] = {}
+_lock = threading.Lock()
+
+
+def minify_css(css: str) -> str:
+    """주석과 불필요한 공백을 지웁니다."""
+    css = _COMMENT_RE.sub("", css)
+    css = _SPACE_RE.sub(" ", css)
+    css = _PUNCT_RE.sub(r"\1", css)
+    css = css.replace(": ", ":").replace(";}", "}")
+    return css.strip()
+
+
+def _write_static(stem: str, css: str) -> str:
+    """static/<stem>.<해시>.css를 쓰고 같은 자산의 예전 버전을 지웁니다. 파일명을 반환합니다."""
+    digest = hashlib.sha256(css.encode("utf-8")).hexdigest()[:HASH_CHARS]
+    target = STATIC_DIR / f"{stem}.{digest}.css"
+    if not target.exists():
+        STATIC_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(".tmp")
+        tmp.write_text(css, encoding="utf-8")
+        tmp.replace(target)
+        stale = re.compile(rf"{re.escape(stem)}\.[0-9a-f]{{{HASH_CHARS}}}\.css")
+        for old in STATIC_DIR.iterdir():
+            if old != target and stale.fullmatch(old.name):
+                old.unlink(missing_ok=True)
+        logger.info("static asset built: %s (%d bytes)", target.name, len(css))
+    return target.name
+
+
+def build_css(name: str) -> tuple[str, str | None]:
+    """assets/<name>을 빌드합니다. 원본이 바뀌지 않았으면 이전 결과를 그대로 씁니다.
+
+    Returns:
+        (최소화한 CSS, static/ 파일명 | 쓰기 실패 시 None)
+
+    Raises:
+        FileNotFoundError: assets/에 없는 자산
+    """
+    source = ASSETS_DIR / name
+    stat = source.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        cached = _built.get(name)
+    if cached is not None and cached[0] == signature and (cached[2] is None or (STATIC_DIR / cached[2]).exists()):
+        return cached[1], cached[2]
+
+    css = minify_css(source.read_text(encoding="utf-8"))
+    try:
+        file_name = _write_static(source.stem, css)
+    except OSError as e:
+        logger.warning("static asset %s not written, inlining: %s", name, e)
+        file_name = None
+    with _lock:
+        _built[name] = (signature, css, file_name)
+    return css, file_name
+
+
+def asset_url(name: str) -> str | None:
+    """빌드된 자산의 URL (app/static/<stem>.<해시>.css). 정적 서빙이 꺼져 있거나 쓰기 실패면 None."""
+    if not st.get_option("server.enableStaticServing"):
+        return None
+    _, file_name = build_css(name)
+    return None if file_name is None else f"{STATIC_URL}/{file_name}"
+
+
+def inject_css(name: str):
+    """페이지에 assets/<name> 스타일을 적용합니다 (<link> 한 줄, 불가능하면 인라인 <style>)."""
+    css, _ = build_css(name)
+    url = asset_url(name)
+    if url is not None:
+        st.markdown(f'<link rel="stylesheet" href="{url}">', unsafe_allow_html=True)
+    else:
+        st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
+
+
+if __name__ == "__main__":
+    for path in sorted(ASSETS_DIR.glob("*.css")):
+        minified, built = build_css(path.name)
+        print(f"{path.name}: {path.stat().st_size:,} B → {len(minified.encode('utf-8')):,} B  static/{built}")
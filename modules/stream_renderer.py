@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+스트리밍 렌더러 모듈 - AI 스트리밍 응답을 시간/크기 예산 단위로 모아 화면에 그립니다.
+완성된 마크다운 블록(빈 줄로 끝난 단락·표·목록)은 한 번만 그린 뒤 고정하고,
+아직 바뀌는 마지막 블록만 다시 그리므로 긴 초안에서도 렌더링 비용이 전체 길이에 비례하지 않습니다.
+"""
+import logging
+import re
+import time
+
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+# 기본 렌더링 예산: 0.3초마다 또는 새 텍스트 800자마다 1회
+DEFAULT_MIN_INTERVAL = 0.3
+DEFAULT_MIN_CHARS = 800
+CURSOR = "▌"
+
+# 빈 줄 뒤에 와도 앞 블록에 이어지는 줄: 들여쓴 줄(목록 안 단락·코드)과 목록 항목
+_CONTINUATION_RE = re.compile(r"[ \t]|[-*+][ \t]|\d+[.)][ \t]")
+
+
+def _last_block_boundary(text: str, start: int) -> int:
+    """text[start:]에서 고정 가능한 마지막 블록 경계(빈 줄 직후 위치)를 찾습니다.
+
+    코드 블록(```) 내부의 빈 줄은 경계로 보지 않습니다. 빈 줄 다음 줄이 들여쓰기나
+    목록 기호로 시작하면 느슨한 목록·이어지는 단락이므로 나누지 않고, 다음 줄이 아직
+    완성되지 않았으면 판단을 미룹니다. 경계가 없으면 start를 반환합니다.
+    """
+    boundary = start
+    candidate = None
+    in_fence = False
+    pos = start
+    while True:
+        nl = text.find("\n", pos)
+        if nl == -1:
+            break
+        line = text[pos:nl]
+        if not line.strip():
+            if not in_fence and pos > start:
+                candidate = nl + 1
+        else:
+            if candidate is not None and not _CONTINUATION_RE.match(line):
+                boundary = candidate
+            candidate = None
+            if line.lstrip().startswith("```"):
+                in_fence = not in_fence
+        pos = nl + 1
+    return boundary
+
+
+class StreamRenderer:
+    """청크를 받아 coalescing 렌더링하는 스트리밍 출력기.
+
+    사용 예:
+        renderer = StreamRenderer()
+        for chunk in stream:
+            renderer.write(chunk)
+        full_text = renderer.close()
+    """
+
+    def __init__(self, container=None, min_interval: float = DEFAULT_MIN_INTERVAL,
+                 min_chars: int = DEFAULT_MIN_CHARS, label: str = "stream"):
+        self._container = container if container is not None else st.container()
+        self._tail = self._container.empty()
+        self._min_interval = min_interval
+        self._min_chars = min_chars
+        self._label = label
+        self._parts: list[str] = []
+        self._text = ""
+        self._frozen_upto = 0
+        self._pending_chars = 0
+        self._last_render = 0.0
+        self._started = time.perf_counter()
+        self.chunks = 0
+        self.renders = 0
+        self.bytes_sent = 0
+        self.frozen_blocks = 0
+
+    @property
+    def text(self) -> str:
+        self._join()
+        return self._text
+
+    def _join(self):
+        if self._parts:
+            self._text += "".join(self._parts)
+            self._parts.clear()
+
+    def _render(self, placeholder, body: str):
+        placeholder.markdown(body)
+        self.renders += 1
+        self.bytes_sent += len(body.encode("utf-8"))
+
+    def write(self, chunk: str):
+        """청크를 추가합니다. 예산을 넘었을 때만 화면을 갱신합니다."""
+        if not chunk:
+            return
+        self._parts.append(chunk)
+        self.chunks += 1
+        self._pending_chars += len(chunk)
+        now = time.perf_counter()
+        if self._pending_chars >= self._min_chars or now - self._last_render >= self._min_interval:
+            self._flush(final=False)
+
+    def _flush(self, final: bool):
+        self._join()
+        boundary = len(self._text) if final else _last_block_boundary(self._text, self._frozen_upto)
+        nothing_left = boundary == self._frozen_upto
+
+        # 완성된 블록은 현재 꼬리 영역에 마지막으로 그린 뒤 고정하고, 새 꼬리 영역을 엽니다.
+        if boundary > self._frozen_upto:
+            self._render(self._tail, self._text[self._frozen_upto:boundary])
+            self.frozen_blocks += 1
+            self._frozen_upto = boundary
+            if not final:
+                self._tail = self._container.empty()
+
+        if not final:
+            self._render(self._tail, self._text[self._frozen_upto:] + CURSOR)
+        elif nothing_left and self.renders:
+            # 마지막 꼬리 영역에 남은 커서 제거
+            self._tail.empty()
+
+        self._pending_chars = 0
+        self._last_render = time.perf_counter()
+
+    def close(self) -> str:
+        """남은 텍스트를 그리고 커서를 제거합니다. 전체 텍스트를 반환합니다."""
+        self._flush(final=True)
+        stats = self.stats()
+        logger.info(
+            "stream render [%s]: %d chunks, %d renders, %d bytes sent, %d frozen blocks, %.1fs",
+            self._label, stats["chunks"], stats["renders"], stats["bytes_sent"],
+            stats["frozen_blocks"], stats["elapsed"],
+        )
+        return self._text
+
+    def stats(self) -> dict:
+        """렌더링 통계 (청크 수, 렌더 횟수, 전송 바이트, 고정 블록 수, 경과 시간)."""
+        return {
+            "chunks": self.chunks,
+            "renders": self.renders,
+            "bytes_sent": self.bytes_sent,
+            "text_bytes": len(self.text.encode("utf-8")),
+            "frozen_blocks": self.frozen_blocks,
+            "elapsed": time.perf_counter() - self._started,
+        }
+
+
+def render_stream(stream, container=None, label: str = "stream", **kwargs) -> tuple[str, dict]:
+    """스트림 전체를 StreamRenderer로 그리고 (전체 텍스트, 렌더링 통계)를 반환합니다."""
+    renderer = StreamRenderer(container, label=label, **kwargs)
+    for chunk in stream:
+        renderer.write(chunk)
+    text = renderer.close()
+    return text, renderer.stats()
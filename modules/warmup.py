@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+워밍업 모듈 - 서버 기동 직후 백그라운드 스레드에서 무거운 리소스를 미리 불러오고 검증합니다.
+배포 후 첫 사용자가 무거운 라이브러리 import, 폰트·템플릿 로딩, 프롬프트·참고자료 PDF 읽기(필요 시 OCR) 비용을
+치르지 않도록 합니다. 리소스별 소요 시간과 결과는 warmup_status()로 조회합니다.
+"""
+import importlib
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+TEMPLATE_DIR = PROJECT_ROOT / "templates"
+CONFIG_DIR = PROJECT_ROOT / "config"
+FONT_PATH = PROJECT_ROOT / "assets" / "fonts" / "malgun.ttf"
+
+# 미리 import할 무거운 라이브러리
+HEAVY_IMPORTS = ("fitz", "fpdf", "google.genai")
+
+# 리소스 상태: pending → running → ok | failed
+# 전체 상태: idle(시작 전) → warming → ready(모두 성공) | degraded(일부 실패)
+
+
+def _warm_imports() -> str:
+    loaded = []
+    for name in HEAVY_IMPORTS:
+        importlib.import_module(name)
+        loaded.append(name)
+    return ", ".join(loaded)
+
+
+def _warm_font() -> str:
+    import fitz
+
+    if not FONT_PATH.exists():
+        raise FileNotFoundError(f"폰트 파일이 없습니다: {FONT_PATH.relative_to(PROJECT_ROOT)}")
+    font = fitz.Font(fontfile=str(FONT_PATH))
+    return f"{FONT_PATH.name} ({font.name}, {FONT_PATH.stat().st_size // 1024:,} KB)"
+
+
+def _warm_templates() -> str:
+    import fitz
+
+    templates = sorted(TEMPLATE_DIR.glob("*.pdf")) if TEMPLATE_DIR.is_dir() else []
+    if not templates:
+        raise FileNotFoundError("templates 폴더에 PDF 템플릿이 없습니다.")
+    pages = 0
+    for path in templates:
+        with fitz.open(path) as doc:
+            pages += doc.page_count
+            # 첫 페이지 텍스트까지 읽어 파싱 가능한지 확인
+            doc[0].get_text()
+    for path in sorted(CONFIG_DIR.glob("*.json")):
+        json.loads(path.read_text(encoding="utf-8"))
+    return f"템플릿 {len(templates)}개 · {pages}페이지"
+
+
+def _warm_prompts() -> str:
+    from modules.report_prompt_assembler import get_assembler
+
+    segments = get_assembler().segments()
+    files = sum(1 for s in segments if s["kind"] == "prompt_file")
+    refs = [s for s in segments if s["kind"] == "reference"]
+    failed = [s["name"] for s in refs if "텍스트 추출 실패" in s["text"] or "OCR 불가" in s["text"]]
+    if failed:
+        raise RuntimeError(f"참고자료 텍스트 추출 실패: {', '.join(failed)}")
+    chars = sum(len(s["text"]) for s in segments)
+    return f"프롬프트 {files}개 · 참고자료 {len(refs)}개 · {chars:,}자"
+
+
+# (키, 표시 이름, 함수) — 순서대로 실행
+RESOURCES = [
+    ("imports", "라이브러리", _warm_imports),
+    ("font", "폰트", _warm_font),
+    ("templates", "템플릿", _warm_templates),
+    ("prompts", "프롬프트·참고자료", _warm_prompts),
+]
+
+_lock = threading.Lock()
+_thread: threading.Thread | None = None
+_done = threading.Event()
+_state = {
+    "started_at": None,
+    "finished_at": None,
+    "resources": {
+        key: {"key": key, "label": label, "status": "pending", "duration": None, "detail": "", "error": ""}
+        for key, label, _ in RESOURCES
+    },
+}
+
+
+def _run():
+    for key, _, func in RESOURCES:
+        entry = _state["resources"][key]
+        with _lock:
+            entry["status"] = "running"
+        started = time.perf_counter()
+        try:
+            detail = func()
+            status, error = "ok", ""
+        except Exception as e:
+            detail, status, error = "", "failed", str(e)
+            logger.warning("warmup %s failed: %s", key, e)
+        with _lock:
+            entry.update(status=status, duration=time.perf_counter() - started, detail=detail, error=error)
+        logger.info("warmup %s: %s in %.2fs", key, status, entry["duration"])
+    with _lock:
+        _state["finished_at"] = time.time()
+    _done.set()
+
+
+def start_warmup():
+    """워밍업 스레드를 시작합니다. 프로세스당 한 번만 실행되며 이후 호출은 무시됩니다."""
+    global _thread
+    with _lock:
+        if _thread is not None:
+            return
+        _state["started_at"] = time.time()
+        _thread = threading.Thread(target=_run, name="warmup", daemon=True)
+        _thread.start()
+
+
+def wait_ready(timeout: float | None = None) -> bool:
+    """워밍업이 끝날 때까지 기다립니다. 시간 내에 끝났으면 True."""
+    return _done.wait(timeout)
+
+
+def warmup_status() -> dict:
+    """워밍업 상태 스냅샷.
+
+    Returns:
+        {"state": "idle"|"warming"|"ready"|"degraded", "elapsed": 초 | None,
+         "resources": [{"key", "label", "status", "duration", "detail", "error"}, ...]}
+    """
+    with _lock:
+        resources = [dict(_state["resources"][key]) for key, _, _ in RESOURCES]
+        started, finished = _state["started_at"], _state["finished_at"]
+
+    if started is None:
+        state = "idle"
+    elif finished is None:
+        state = "warming"
+    elif all(r["status"] == "ok" for r in resources):
+        state = "ready"
+    else:
+        state = "degraded"
+    elapsed = None if started is None else (finished or time.time()) - started
+    return {"state": state, "elapsed": elapsed, "resources": resources}
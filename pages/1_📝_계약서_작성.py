@@ -1,7 +1,12 @@
 import streamlit as st
 import time
+import uuid
 from datetime import datetime
 
+from modules.artifact_store import save_artifact
+from modules.case_index import birth_only, index_case
+from modules.pdf_preview import show_pdf_preview
+
 # ★ 중요: modules 폴더의 PDF 생성 엔진을 가져옵니다.
 # (아직 modules/pdf_generator.py를 안 만들었다면 에러가 날 수 있으니, 
 #  우선은 아래 줄을 주석(#) 처리하고 테스트하세요.)
@@ -117,17 +122,46 @@ if st.button("🚀 계약서 PDF 생성하기", type="primary"):
                     작성날짜=contract_date.strftime("%m월 %d일"),
                 )
                 
+                file_name = f"계약서_{client_name}.pdf"
+                stored = save_artifact(pdf_bytes, "contract", file_name)
+
+                # 사건 검색 색인 (주민번호는 생년월일 6자리만)
+                index_case(
+                    uuid.uuid4().hex[:12], "contract", patient_name,
+                    {
+                        "생년월일": birth_only(patient_birth),
+                        "연락처": patient_phone,
+                        "주소": patient_address,
+                        "사고경위": accident_details,
+                        "계약자": client_name,
+                        "관계": client_relation,
+                        "계약자 연락처": client_phone,
+                        "수임료율": f"{fee_rate:g}%",
+                        "계약일자": contract_date.strftime("%Y-%m-%d"),
+                        "파일명": file_name,
+                    },
+                    artifact=stored["sha256"] if stored else None,
+                )
+
+                # 다운로드·미리보기는 아래에서 (다른 입력을 바꿔 다시 그려도 유지)
+                st.session_state['contract_pdf'] = (file_name, pdf_bytes)
+
                 # 성공 메시지
                 st.success(f"📄 {client_name}님의 계약서 생성이 완료되었습니다!")
                 st.balloons()
-                
-                # 다운로드 버튼 표시
-                st.download_button(
-                    label="📥 PDF 다운로드",
-                    data=pdf_bytes,
-                    file_name=f"계약서_{client_name}.pdf",
-                    mime="application/pdf"
-                )
             except Exception as e:
                 st.error(f"PDF 생성 중 오류가 발생했습니다: {e}")
-                st.info("💡 modules/pdf_generator.py 파일이 올바르게 설정되었는지 확인해주세요.")
\ No newline at end of file
+                st.info("💡 modules/pdf_generator.py 파일이 올바르게 설정되었는지 확인해주세요.")
+
+# 마지막으로 생성한 계약서: 다운로드 버튼 + 미리보기
+if 'contract_pdf' in st.session_state:
+    file_name, pdf_bytes = st.session_state['contract_pdf']
+    st.download_button(
+        label="📥 PDF 다운로드",
+        data=pdf_bytes,
+        file_name=file_name,
+        mime="application/pdf",
+        key="contract_download",
+    )
+    with st.expander(f"👀 미리보기 · {file_name}", expanded=True):
+        show_pdf_preview(pdf_bytes, key="contract")
\ No newline at end of file
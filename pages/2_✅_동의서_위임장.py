@@ -1,7 +1,12 @@
 import streamlit as st
 import time
+import uuid
 from datetime import datetime
 
+from modules.artifact_store import save_artifact
+from modules.case_index import birth_only, index_case
+from modules.pdf_preview import show_pdf_preview
+
 # ★ modules 폴더의 동의서 생성 엔진 연결
 try:
     from modules.consent_generator import create_consent_pdf
@@ -94,13 +99,37 @@ if st.button("🚀 위임장/동의서 PDF 생성", type="primary"):
                 # 파일명 생성 (예: 홍길동_동의서위임장_20260215.pdf)
                 today_str = datetime.now().strftime("%Y%m%d")
                 file_name = f"{p_name}_동의서위임장_{today_str}.pdf"
-                
-                st.download_button(
-                    label="📥 PDF 다운로드",
-                    data=pdf_bytes,
-                    file_name=file_name,
-                    mime="application/pdf"
+                stored = save_artifact(pdf_bytes, "consent", file_name)
+
+                # 사건 검색 색인 (주민번호는 생년월일 6자리만)
+                index_case(
+                    uuid.uuid4().hex[:12], "consent", p_name,
+                    {
+                        "생년월일": birth_only(p_birth),
+                        "연락처": p_phone,
+                        "주소": p_addr,
+                        "수임인": assignee_name,
+                        "관계": assignee_rel,
+                        "파일명": file_name,
+                    },
+                    artifact=stored["sha256"] if stored else None,
                 )
+
+                # 다운로드·미리보기는 아래에서 (다시 그려도 유지)
+                st.session_state['consent_pdf'] = (file_name, pdf_bytes)
             except Exception as e:
                 st.error(f"오류 발생: {e}")
-                st.info("modules/consent_generator.py 파일이 잘 생성되었는지 확인해주세요.")
\ No newline at end of file
+                st.info("modules/consent_generator.py 파일이 잘 생성되었는지 확인해주세요.")
+
+# 마지막으로 생성한 서류: 다운로드 버튼 + 미리보기
+if 'consent_pdf' in st.session_state:
+    file_name, pdf_bytes = st.session_state['consent_pdf']
+    st.download_button(
+        label="📥 PDF 다운로드",
+        data=pdf_bytes,
+        file_name=file_name,
+        mime="application/pdf",
+        key="consent_download",
+    )
+    with st.expander(f"👀 미리보기 · {file_name}", expanded=True):
+        show_pdf_preview(pdf_bytes, key="consent")
\ No newline at end of file
@@ -3,23 +3,71 @@
 페이지: 손해사정 보고서 — AI 자동 생성 (Gemini API)
 5단계 위저드: 자료입력 → 검증 → 초안작성 → 검수 → 완료
 """
+import uuid
+
 import streamlit as st
-from datetime import datetime
 
 st.set_page_config(page_title="손해사정 보고서(압박골절_개인보험)", page_icon="📊", layout="wide")
 
 # ── 모듈 임포트 ─────────────────────────────────────────────
 try:
-    from modules.report_prompt_builder import load_prompt_files, build_user_message
+    from modules.report_prompt_builder import build_user_message, DRAFT_INSTRUCTION
+    from modules.report_prompt_assembler import get_assembler
+    from modules.prompt_profiler import GROUP_LABELS, profile_prompt, log_profile
     from modules.report_ai_client import (
         get_api_key,
-        send_message,
         extract_text_from_pdf,
     )
+    from modules.report_review_engine import run_review, format_review_report, all_passed
+    from modules.report_verification import (
+        VERIFY_INSTRUCTION,
+        ISSUE_KINDS,
+        verify_case,
+        is_complete,
+        format_verification,
+    )
+    from modules.report_precheck import precheck_case
+    from modules.report_jobs import (
+        request_fingerprint,
+        find_job,
+        start_job,
+        resume_job,
+        cancel_case_jobs,
+        follow_job,
+    )
+    from modules.settings import get_setting
+    from modules.llm_scheduler import get_scheduler
+    from modules.llm_backends import get_mode as get_llm_mode
+    from modules.warmup import start_warmup
+    from modules.stream_renderer import render_stream
+    from modules.report_session_store import (
+        put_text,
+        get_text,
+        put_messages,
+        get_messages,
+        save_case_state,
+        load_case_state,
+        collect_garbage,
+    )
+    from modules.report_model_router import STEP_LABELS, get_routing_table, latency_summary
+    from modules.artifact_store import save_artifact
+    from modules.case_index import index_report_case, remove_cases
+    from modules.export_cache import (
+        FORMATS as EXPORT_FORMATS,
+        export_error,
+        export_available,
+        get_export,
+        lazy_export,
+        peek_export,
+    )
+    from modules.pdf_preview import show_pdf_preview
 except ImportError as e:
     st.error(f"모듈 로드 실패: {e}")
     st.stop()
 
+# 이 페이지로 바로 들어온 경우에도 리소스 사전 로딩 시작 (프로세스당 1회)
+start_warmup()
+
 # ── 상수 ─────────────────────────────────────────────────────
 PHASES = ["input", "verifying", "drafting", "reviewing", "complete"]
 PHASE_LABELS = {
@@ -31,20 +79,42 @@ PHASE_LABELS = {
 }
 
 # ── Session State 초기화 ──────────────────────────────────────
+# 대용량 텍스트(메시지, 첨부자료, 초안, 검수)는 세션 저장소에 두고 여기에는 핸들만 보관
 defaults = {
     "report_phase": "input",
     "report_messages": [],
     "report_data": {},
     "report_draft": "",
     "report_review": "",
+    "report_verification": {},
     "report_uploaded_texts": [],
     "report_uploaded_names": [],
     "report_contracts": [{}],
+    "report_case_id": "",
+    "report_pending_job": "",
 }
 for key, val in defaults.items():
     if key not in st.session_state:
         st.session_state[key] = val
 
+# 새로고침 후 복원할 사건 상태 키 (입력 위젯 상태인 report_contracts 제외)
+PERSISTED_KEYS = [k for k in defaults if k != "report_contracts"]
+
+# 보존 기간이 지난 사건·참조가 끊긴 텍스트 정리 (프로세스당 1시간에 한 번, 사건 복원 전에)
+remove_cases(collect_garbage()["expired"])
+
+# ── 사건 ID (URL ?case=) — 새로고침·재접속 시 상태 복원 ──────────
+case_param = st.query_params.get("case", "")
+if case_param and case_param != st.session_state["report_case_id"]:
+    saved_state = load_case_state(case_param)
+    if saved_state:
+        st.session_state.update(saved_state)
+        st.session_state["report_case_id"] = case_param
+    else:
+        del st.query_params["case"]
+elif st.session_state["report_case_id"] and not case_param:
+    st.query_params["case"] = st.session_state["report_case_id"]
+
 
 # ── API 키 확인 ───────────────────────────────────────────────
 api_key = get_api_key()
@@ -67,23 +137,121 @@ if not api_key:
 
 
 # ── 헬퍼 함수 ────────────────────────────────────────────────
+def persist_case():
+    """현재 사건 상태를 세션 저장소에 스냅샷하고 사건 검색 색인을 갱신합니다."""
+    case_id = st.session_state["report_case_id"]
+    if case_id:
+        state = {k: st.session_state[k] for k in PERSISTED_KEYS}
+        save_case_state(case_id, state)
+        index_report_case(case_id, state)
+
+
 def set_phase(phase: str):
     st.session_state["report_phase"] = phase
+    persist_case()
+    if phase == "complete":
+        # 완료 시점에 이 사건의 대체된 이전 텍스트(검증 지시 추가 전 메시지 등) 정리
+        remove_cases(collect_garbage(force=True)["expired"])
+
+
+def load_messages() -> list[dict]:
+    """세션 저장소에서 대화 히스토리를 불러옵니다. session_state에는 핸들만 있습니다."""
+    return get_messages(st.session_state["report_messages"])
+
+
+def save_messages(messages: list[dict]):
+    st.session_state["report_messages"] = put_messages(messages)
+    persist_case()
+
+
+def load_text(key: str) -> str:
+    return get_text(st.session_state[key])
+
+
+def save_text(key: str, text: str):
+    st.session_state[key] = put_text(text)
+    persist_case()
+
+
+def load_uploaded_texts() -> list[str]:
+    return [get_text(h) for h in st.session_state["report_uploaded_texts"]]
+
+
+def speculative_drafting_enabled() -> bool:
+    return str(get_setting("SPECULATIVE_DRAFTING", True)).lower() not in ("0", "false", "no", "off")
+
+
+def cancel_speculative_draft():
+    """진행 중인 추측 실행 초안 작업을 취소합니다."""
+    if st.session_state["report_case_id"]:
+        cancel_case_jobs(st.session_state["report_case_id"], kind="draft")
 
 
 def reset_all():
+    if st.session_state["report_case_id"]:
+        cancel_case_jobs(st.session_state["report_case_id"])
     for key in defaults:
         st.session_state[key] = type(defaults[key])()
     st.session_state["report_phase"] = "input"
     st.session_state["report_contracts"] = [{}]
+    st.session_state.pop("report_prompt_profile", None)
+    if "case" in st.query_params:
+        del st.query_params["case"]
+
+
+def get_prompt_segments() -> list[dict]:
+    """프롬프트 MD 파일·참고자료 세그먼트. 바뀐 파일만 다시 읽습니다 (report_prompt_assembler)."""
+    return get_assembler().segments()
 
 
-@st.cache_data(show_spinner="참고자료 및 프롬프트 로딩 중...")
 def get_system_prompt() -> str:
-    """시스템 프롬프트를 로드하고 오늘 날짜를 추가합니다. 캐싱됩니다."""
-    base = load_prompt_files()
-    today = datetime.now().strftime("%Y년 %m월 %d일")
-    return f"{base}\n\n---\n\n# 현재 날짜\n오늘 날짜: {today}\n손해사정서의 작성 날짜로 위 날짜를 사용하세요."
+    """시스템 프롬프트 (세그먼트 조립 결과 + 오늘 날짜)."""
+    return get_assembler().system_prompt()
+
+
+def profile_request(messages: list[dict], label: str):
+    """AI 호출 직전 요청의 세그먼트별 크기를 집계해 로그·사이드바에 표시합니다."""
+    profile = profile_prompt(
+        get_prompt_segments(),
+        messages,
+        load_uploaded_texts(),
+        st.session_state["report_uploaded_names"],
+    )
+    log_profile(profile, label)
+    st.session_state["report_prompt_profile"] = dict(profile, label=label)
+    show_prompt_profile()
+
+
+def show_prompt_profile():
+    """마지막으로 집계한 프롬프트 구성을 사이드바 패널에 그립니다."""
+    profile = st.session_state.get("report_prompt_profile")
+    if not profile:
+        return
+    with prompt_profile_slot.container():
+        with st.expander(f"프롬프트 구성 — {profile['label']}", expanded=profile["over_budget"]):
+            st.caption(
+                f"추정 **{profile['total_tokens']:,}** 토큰 · {profile['total_chars']:,}자 "
+                f"(예산 {profile['budget']:,} 토큰)"
+            )
+            if profile["over_budget"]:
+                st.warning("요청이 토큰 예산을 초과했습니다. 첨부자료나 대화 히스토리를 줄여보세요.")
+            st.caption(" · ".join(
+                f"{GROUP_LABELS.get(g, g)} {t:,}" for g, t in sorted(profile["groups"].items(), key=lambda x: -x[1])
+            ))
+            st.dataframe(
+                [
+                    {
+                        "구분": GROUP_LABELS.get(r["group"], r["group"]),
+                        "세그먼트": r["name"],
+                        "토큰(추정)": r["tokens"],
+                        "글자": r["chars"],
+                        "비중(%)": round(r["share"] * 100, 1),
+                    }
+                    for r in sorted(profile["rows"], key=lambda r: r["tokens"], reverse=True)
+                ],
+                hide_index=True,
+                use_container_width=True,
+            )
 
 
 # ── 진행 표시바 ───────────────────────────────────────────────
@@ -111,6 +279,49 @@ with st.sidebar:
         st.rerun()
     if current != "input":
         st.markdown(f"**현재 단계**: {PHASE_LABELS[current]}")
+    if get_llm_mode() != "live":
+        st.warning(f"LLM 백엔드: **{get_llm_mode()}** (실제 API를 호출하지 않거나 응답을 녹화합니다)")
+
+    with st.expander("단계별 모델 · 응답 시간"):
+        for step, route in get_routing_table().items():
+            st.caption(
+                f"**{STEP_LABELS[step]}** — `{route['model']}` · "
+                f"{route['max_tokens']:,} tok · T={route['temperature']}"
+            )
+        rows = latency_summary()
+        if rows:
+            st.dataframe(
+                [
+                    {
+                        "단계": STEP_LABELS.get(r["step"], r["step"]),
+                        "모델": r["model"],
+                        "호출": r["count"],
+                        "평균(s)": round(r["avg"], 1),
+                        "p50(s)": round(r["p50"], 1),
+                        "최대(s)": round(r["max"], 1),
+                    }
+                    for r in rows
+                ],
+                hide_index=True,
+                use_container_width=True,
+            )
+        else:
+            st.caption("아직 기록된 응답 시간이 없습니다.")
+
+    prompt_profile_slot = st.empty()
+    show_prompt_profile()
+
+    with st.expander("AI 호출 대기열"):
+        queue = get_scheduler().snapshot()
+        st.caption(
+            f"실행 중 {queue['active']}/{queue['limit']} · 대기 {len(queue['waiting'])}건 · "
+            f"재시도 {queue['retries']}회"
+        )
+        my_position = get_scheduler().session_position(st.session_state["report_case_id"] or "-")
+        if my_position:
+            st.caption(f"이 사건의 요청은 대기열 {my_position}번째입니다.")
+        if st.button("새로고침", key="queue_refresh", use_container_width=True):
+            st.rerun()
 
 
 # ══════════════════════════════════════════════════════════════
@@ -234,6 +445,10 @@ if current == "input":
         }
         st.session_state["report_data"] = data
 
+        # 새 사건 ID 발급 (URL에 기록되어 새로고침 후에도 같은 사건으로 복원)
+        st.session_state["report_case_id"] = uuid.uuid4().hex[:12]
+        st.query_params["case"] = st.session_state["report_case_id"]
+
         # 업로드 파일 처리
         uploaded_texts = []
         uploaded_names = []
@@ -248,7 +463,7 @@ if current == "input":
                 uploaded_names.append(f.name)
                 if f.type == "application/pdf":
                     try:
-                        text = extract_text_from_pdf(fbytes)
+                        text = extract_text_from_pdf(fbytes, session=st.session_state["report_case_id"])
                         uploaded_texts.append(f"[파일: {f.name}]\n{text}")
                     except Exception as ex:
                         uploaded_texts.append(
@@ -260,14 +475,12 @@ if current == "input":
                     )
             progress.empty()
 
-        st.session_state["report_uploaded_texts"] = uploaded_texts
+        st.session_state["report_uploaded_texts"] = [put_text(t) for t in uploaded_texts]
         st.session_state["report_uploaded_names"] = uploaded_names
 
         # 사용자 메시지 구성
         user_msg = build_user_message(data, uploaded_texts)
-        st.session_state["report_messages"] = [
-            {"role": "user", "content": user_msg}
-        ]
+        save_messages([{"role": "user", "content": user_msg}])
 
         set_phase("verifying")
         st.rerun()
@@ -280,42 +493,56 @@ elif current == "verifying":
     st.subheader("2단계: 자료 검증")
     st.caption("AI가 제공된 자료를 검토하고 누락/모호/상충 사항을 확인합니다.")
 
-    messages = st.session_state["report_messages"]
+    messages = load_messages()
     system_prompt = get_system_prompt()
 
-    # 아직 AI 검증 응답이 없으면 생성
+    # 아직 검증 응답이 없으면 생성
     if len(messages) == 1 or messages[-1]["role"] == "user":
-        verify_instruction = (
-            "위 자료를 검토하여 손해사정서 작성에 필요한 필수 정보가 모두 제공되었는지 확인하세요.\n"
-            "02_PROCESS.md의 Phase 1에 따라 필수정보(피보험자 인적사항, 보험계약사항, 사고정보, "
-            "의료정보, 약관, 장해평가)를 점검하세요.\n\n"
-            "누락·모호·상충이 있으면 05_DATA_PROTOCOL.md의 질의 프로토콜 형식으로 질문하세요.\n"
-            "모든 정보가 충분하면 '자료 검증이 완료되었습니다. 초안 작성을 시작하겠습니다.'라고 답하세요."
-        )
-
+        verification = None
         if len(messages) == 1:
-            # 처음 검증 요청 — 기존 user 메시지에 검증 지시 추가
-            messages[0]["content"] += f"\n\n---\n\n{verify_instruction}"
-        # else: 사용자가 추가 응답을 했으므로 그대로 진행
+            # 처음 검증 요청 — 규칙 기반 사전검증을 먼저 수행 (API 호출 없음)
+            precheck = precheck_case(
+                st.session_state["report_data"],
+                load_uploaded_texts(),
+                st.session_state["report_uploaded_names"],
+            )
+            if not precheck["needs_model"]:
+                verification = dict(precheck, source="local")
+            # 기존 user 메시지에 검증 지시 추가
+            messages[0]["content"] += f"\n\n---\n\n{VERIFY_INSTRUCTION}"
+        # else: 사용자가 추가 응답을 했으므로 AI 검증으로 진행
 
-        with st.chat_message("assistant"):
-            placeholder = st.empty()
-            full_response = ""
-            try:
-                stream = send_message(system_prompt, messages, stream=True)
-                for chunk in stream:
-                    full_response += chunk
-                    placeholder.markdown(full_response + "▌")
-                placeholder.markdown(full_response)
-            except Exception as ex:
-                st.error(f"AI 응답 생성 중 오류: {ex}")
-                st.stop()
+        if verification is None:
+            queue_notice = st.empty()
+
+            def _on_wait(position: int, total: int):
+                queue_notice.caption(f"⏳ AI 호출 대기 중 — {position}번째 (전체 대기 {total}건)")
 
-        messages.append({"role": "model", "content": full_response})
-        st.session_state["report_messages"] = messages
+            profile_request(messages, "검증")
+            with st.spinner("AI가 자료를 검증하고 있습니다..."):
+                try:
+                    verification = dict(
+                        verify_case(
+                            system_prompt, messages, api_key=api_key,
+                            session=st.session_state["report_case_id"], on_wait=_on_wait,
+                        ),
+                        source="model",
+                    )
+                except Exception as ex:
+                    st.error(f"AI 응답 생성 중 오류: {ex}")
+                    st.stop()
+            queue_notice.empty()
 
-    # 대화 히스토리 표시
-    for msg in messages:
+        messages.append({"role": "model", "content": format_verification(verification)})
+        save_messages(messages)
+        st.session_state["report_verification"] = verification
+        persist_case()
+
+    verification = st.session_state["report_verification"]
+
+    # 대화 히스토리 표시 (마지막 검증 결과는 아래에서 구조화하여 표시)
+    history = messages[:-1] if messages[-1]["role"] == "model" and verification else messages
+    for msg in history:
         role = msg["role"]
         if role == "user":
             with st.chat_message("user"):
@@ -330,12 +557,47 @@ elif current == "verifying":
             with st.chat_message("assistant"):
                 st.markdown(msg["content"])
 
-    # 자료 검증 완료 판단 + 다음 단계 전환
-    last_ai = messages[-1]["content"] if messages[-1]["role"] == "model" else ""
-    verification_done = any(
-        kw in last_ai
-        for kw in ["검증이 완료", "초안 작성을 시작", "충분합니다", "진행하겠습니다"]
-    )
+    # 최신 검증 결과 (구조화 표시)
+    verification_done = bool(verification) and is_complete(verification)
+    if verification:
+        with st.chat_message("assistant"):
+            if verification.get("source") == "local":
+                st.caption("⚡ 규칙 기반 자동 사전검증 결과 (AI 호출 없음)")
+            if verification.get("parse_error"):
+                st.warning("검증 응답을 해석하지 못했습니다. 아래 원문을 확인하세요.")
+                st.markdown(verification["summary"])
+            elif verification_done:
+                st.success("자료 검증 완료 — 초안 작성에 필요한 정보가 충분합니다.")
+                if verification["summary"]:
+                    st.markdown(verification["summary"])
+            else:
+                counts = {kind: len(verification[kind]) for kind, _ in ISSUE_KINDS}
+                st.warning(
+                    f"확인 필요 — 누락 {counts['missing']}건 · "
+                    f"모호 {counts['ambiguous']}건 · 상충 {counts['conflicting']}건"
+                )
+                if verification["summary"]:
+                    st.markdown(verification["summary"])
+                for kind, label in ISSUE_KINDS:
+                    if verification[kind]:
+                        st.markdown(f"**{label}**")
+                        for entry in verification[kind]:
+                            detail = f" — {entry['detail']}" if entry["detail"] else ""
+                            st.markdown(f"- **{entry['item']}**{detail}")
+                if verification["questions"]:
+                    st.markdown("**질문**")
+                    for i, q in enumerate(verification["questions"], 1):
+                        st.markdown(f"{i}. {q}")
+
+    # 검증 완료 즉시 초안을 백그라운드에서 미리 작성 (사용자가 진행 버튼을 누르면 이어 붙음)
+    if verification_done and speculative_drafting_enabled():
+        draft_messages = messages + [{"role": "user", "content": DRAFT_INSTRUCTION}]
+        case_id = st.session_state["report_case_id"]
+        if not find_job(case_id, "draft", request_fingerprint("draft", draft_messages)):
+            cancel_speculative_draft()
+            profile_request(draft_messages, "초안 작성")
+            start_job(case_id, "draft", system_prompt, draft_messages, api_key=api_key, step="drafting")
+        st.caption("✍️ 초안을 미리 작성하고 있습니다. '초안 작성 진행'을 누르면 이어서 표시됩니다.")
 
     st.markdown("---")
     col_a, col_b = st.columns([3, 1])
@@ -343,11 +605,18 @@ elif current == "verifying":
     with col_a:
         user_reply = st.chat_input("AI 질문에 답변하거나 추가 자료를 설명하세요...")
         if user_reply:
+            cancel_speculative_draft()
             messages.append({"role": "user", "content": user_reply})
-            st.session_state["report_messages"] = messages
+            save_messages(messages)
             st.rerun()
 
     with col_b:
+        if verification.get("source") == "local":
+            if st.button("AI 정밀 검증", use_container_width=True, help="규칙 점검 결과를 AI로 다시 확인합니다"):
+                cancel_speculative_draft()
+                messages.append({"role": "user", "content": "제공된 자료 전체를 다시 검토하여 검증 결과를 알려주세요."})
+                save_messages(messages)
+                st.rerun()
         if verification_done:
             if st.button("초안 작성 진행", type="primary", use_container_width=True):
                 set_phase("drafting")
@@ -371,44 +640,35 @@ elif current == "drafting":
     if not st.session_state["report_draft"]:
         st.caption("AI가 손해사정서 초안을 작성하고 있습니다...")
 
-        messages = st.session_state["report_messages"]
+        messages = load_messages()
         system_prompt = get_system_prompt()
-
-        # 초안 작성 지시 (할루시네이션 방지 강화)
-        draft_instruction = (
-            "이제 손해사정서 초안을 작성하세요.\n\n"
-            "## 절대 준수 사항\n"
-            "- **제공된 자료에 명시된 수치·금액·날짜만 사용하세요.** 자료에 없는 금액이나 정보를 절대 추측하지 마세요.\n"
-            "- 보험가입금액, 증권번호, 보험기간 등은 제공된 자료의 원본 수치를 그대로 사용하세요.\n"
-            "- 제공되지 않은 정보는 반드시 '정보 미제공'으로 표시하세요. 임의로 채우지 마세요.\n"
-            "- 담보내역, 보험금액은 첨부자료(보험증권)에 기재된 그대로만 기재하세요.\n\n"
-            "## 작성 형식\n"
-            "- 03_DOCUMENT_STRUCTURE.md의 구조(첫 페이지 공문 → Ⅰ~Ⅵ 섹션)를 정확히 따르세요.\n"
-            "- 04_TONE_AND_STYLE.md의 문체·서식 규칙을 준수하세요.\n"
-            "- 마크다운 형식으로 작성하되, Typora에서 PDF 변환이 가능하도록 구성하세요.\n"
-            "- 각 주요 섹션 앞에 <div style=\"page-break-before: always;\"></div>를 삽입하세요."
-        )
-        messages.append({"role": "user", "content": draft_instruction})
+        messages.append({"role": "user", "content": DRAFT_INSTRUCTION})
+
+        # 같은 대화의 초안 작업(검증 직후 미리 시작했거나 새로고침 전에 진행 중이던 작업)이 있으면 이어 붙임
+        case_id = st.session_state["report_case_id"]
+        job = find_job(case_id, "draft", request_fingerprint("draft", messages))
+        if job is None:
+            profile_request(messages, "초안 작성")
+            job_id = start_job(case_id, "draft", system_prompt, messages, api_key=api_key, step="drafting")
+        elif job["status"] == "interrupted":
+            st.caption("중단된 초안을 이어서 작성합니다...")
+            job_id = resume_job(job, system_prompt, messages, api_key=api_key)
+        else:
+            job_id = job["job_id"]
 
         with st.chat_message("assistant"):
-            placeholder = st.empty()
-            full_draft = ""
             try:
-                stream = send_message(system_prompt, messages, stream=True)
-                for chunk in stream:
-                    full_draft += chunk
-                    placeholder.markdown(full_draft + "▌")
-                placeholder.markdown(full_draft)
+                full_draft, _ = render_stream(follow_job(job_id), label="drafting")
             except Exception as ex:
                 st.error(f"초안 생성 중 오류: {ex}")
                 st.stop()
 
         messages.append({"role": "model", "content": full_draft})
-        st.session_state["report_messages"] = messages
-        st.session_state["report_draft"] = full_draft
+        save_messages(messages)
+        save_text("report_draft", full_draft)
 
     else:
-        st.markdown(st.session_state["report_draft"])
+        st.markdown(load_text("report_draft"))
 
     st.markdown("---")
     if st.button("검수 진행", type="primary", use_container_width=True):
@@ -423,44 +683,45 @@ elif current == "reviewing":
     st.subheader("4단계: 품질 검수")
 
     if not st.session_state["report_review"]:
-        st.caption("AI가 06_CHECKLIST.md 기준으로 자기 검수를 수행합니다...")
+        st.caption("06_CHECKLIST.md의 6개 영역을 영역별로 동시에 검수합니다...")
 
-        messages = st.session_state["report_messages"]
-        system_prompt = get_system_prompt()
-
-        review_instruction = (
-            "방금 작성한 손해사정서 초안에 대해 06_CHECKLIST.md의 모든 항목을 점검하세요.\n\n"
-            "아래 6개 영역을 각각 검증하고 결과를 보고하세요:\n"
-            "1. 사실관계 정확성\n"
-            "2. 논리적 일관성\n"
-            "3. 계산 정확성\n"
-            "4. 법적 적합성\n"
-            "5. 형식적 완결성\n"
-            "6. 할루시네이션 검증\n\n"
-            "각 항목에 대해 통과/미통과를 표시하고, 미통과 시 수정 사항을 제시하세요.\n"
-            "수정이 필요한 경우 수정된 최종 보고서를 다시 제출하세요."
+        messages = load_messages()
+        source_text = build_user_message(
+            st.session_state["report_data"],
+            load_uploaded_texts(),
         )
-        messages.append({"role": "user", "content": review_instruction})
 
-        with st.chat_message("assistant"):
-            placeholder = st.empty()
-            full_review = ""
-            try:
-                stream = send_message(system_prompt, messages, stream=True)
-                for chunk in stream:
-                    full_review += chunk
-                    placeholder.markdown(full_review + "▌")
-                placeholder.markdown(full_review)
-            except Exception as ex:
-                st.error(f"검수 중 오류: {ex}")
+        with st.status("영역별 검수 진행 중...", expanded=True) as status:
+            def _on_area_done(result: dict):
+                mark = "⚠️" if result["error"] else ("✅" if result["passed"] else "❌")
+                st.write(f"{mark} {result['number']}. {result['title']}")
+
+            results = run_review(
+                load_text("report_draft"),
+                source_text=source_text,
+                api_key=api_key,
+                on_result=_on_area_done,
+                session=st.session_state["report_case_id"],
+            )
+            if not results:
+                status.update(label="검수 실패", state="error")
+                st.error("체크리스트(06_CHECKLIST.md)를 불러오지 못했습니다.")
                 st.stop()
+            status.update(
+                label="검수 완료" if all_passed(results) else "검수 완료 — 미통과 항목이 있습니다",
+                state="complete",
+                expanded=False,
+            )
 
+        full_review = format_review_report(results)
+        messages.append({"role": "user", "content": "작성한 초안을 06_CHECKLIST.md 기준으로 영역별 검수하세요."})
         messages.append({"role": "model", "content": full_review})
-        st.session_state["report_messages"] = messages
-        st.session_state["report_review"] = full_review
+        save_messages(messages)
+        save_text("report_review", full_review)
+        st.markdown(full_review)
 
     else:
-        st.markdown(st.session_state["report_review"])
+        st.markdown(load_text("report_review"))
 
     st.markdown("---")
     if st.button("완료 및 다운로드", type="primary", use_container_width=True):
@@ -475,7 +736,7 @@ elif current == "complete":
     st.subheader("5단계: 완료")
     st.success("손해사정서가 완성되었습니다!")
 
-    draft = st.session_state["report_draft"]
+    draft = load_text("report_draft")
     data = st.session_state["report_data"]
     insured = data.get("insured_name", "보고서")
 
@@ -487,33 +748,58 @@ elif current == "complete":
     st.markdown("---")
     st.markdown("#### 다운로드")
     dl1, dl2 = st.columns(2)
+    pdf_name = f"손해사정서_{insured}.pdf"
+    report_case_id = st.session_state["report_case_id"]
+
+    def save_report_pdf(pdf: bytes):
+        save_artifact(pdf, "report", pdf_name, case_id=report_case_id)
 
+    # 변환은 버튼을 누를 때 한 번만 (export_cache가 세션 간 공유·용량 관리)
     with dl1:
         st.download_button(
             label="마크다운(.md) 다운로드",
-            data=draft.encode("utf-8"),
+            data=lazy_export("md", draft),
             file_name=f"손해사정서_{insured}.md",
-            mime="text/markdown",
+            mime=EXPORT_FORMATS["md"]["mime"],
             use_container_width=True,
         )
 
     with dl2:
-        try:
-            from modules.report_pdf_exporter import markdown_to_pdf
-
-            pdf_bytes = markdown_to_pdf(draft)
+        if not export_available("pdf"):
+            st.info("PDF 변환 모듈(report_pdf_exporter)이 없습니다. MD 파일을 Typora에서 PDF로 변환하세요.")
+        elif pdf_error := export_error("pdf", draft):
+            st.warning(f"PDF 변환 실패: {pdf_error}")
+            st.info("MD 파일을 다운로드하여 Typora에서 PDF로 변환해주세요.")
+        else:
             st.download_button(
                 label="PDF 다운로드",
-                data=pdf_bytes,
-                file_name=f"손해사정서_{insured}.pdf",
-                mime="application/pdf",
+                data=lazy_export("pdf", draft, on_build=save_report_pdf),
+                file_name=pdf_name,
+                mime=EXPORT_FORMATS["pdf"]["mime"],
                 use_container_width=True,
             )
-        except ImportError:
-            st.info("PDF 변환 모듈(report_pdf_exporter)이 없습니다. MD 파일을 Typora에서 PDF로 변환하세요.")
-        except Exception as ex:
-            st.warning(f"PDF 변환 실패: {ex}")
-            st.info("MD 파일을 다운로드하여 Typora에서 PDF로 변환해주세요.")
+            pdf_info = peek_export("pdf", draft)
+            if pdf_info and pdf_info["stats"]:
+                pdf_stats = pdf_info["stats"]
+                mode = " (병렬)" if pdf_stats["parallel"] else ""
+                st.caption(
+                    f"{pdf_stats['pages']}쪽 · {pdf_info['size'] / 1024:,.0f} KB · "
+                    f"섹션 {pdf_stats['sections']}개 중 {pdf_stats['rendered']}개 새로 변환{mode}"
+                )
+
+    # PDF 미리보기 — 이미 변환된 PDF만 바로 보여 주고, 아니면 요청할 때 변환
+    if export_available("pdf") and not export_error("pdf", draft):
+        with st.expander("PDF 미리보기", expanded=peek_export("pdf", draft) is not None):
+            if peek_export("pdf", draft) is None and not st.button("PDF로 변환해서 미리보기", key="report_preview_build"):
+                st.caption("다운로드하지 않고 쪽별로 확인할 수 있습니다.")
+            else:
+                try:
+                    with st.spinner("PDF로 변환 중..."):
+                        report_pdf = get_export("pdf", draft, on_build=save_report_pdf)
+                except Exception as e:
+                    st.warning(f"PDF 변환 실패: {e}")
+                else:
+                    show_pdf_preview(report_pdf, key="report")
 
     # 수정 요청
     st.markdown("---")
@@ -523,24 +809,38 @@ elif current == "complete":
         placeholder="예: Ⅲ장의 치료내용을 더 상세히 작성해주세요.",
         key="revision_input",
     )
-    if st.button("수정 요청 보내기"):
+    pending_job = st.session_state["report_pending_job"]
+    if st.button("수정 요청 보내기", disabled=bool(pending_job)):
         if revision_request:
-            messages = st.session_state["report_messages"]
+            messages = load_messages()
             messages.append({"role": "user", "content": f"다음 사항을 수정해 주세요:\n\n{revision_request}"})
-
-            system_prompt = get_system_prompt()
-            with st.spinner("수정 중..."):
-                try:
-                    full_revision = ""
-                    stream = send_message(system_prompt, messages, stream=True)
-                    for chunk in stream:
-                        full_revision += chunk
-
-                    messages.append({"role": "model", "content": full_revision})
-                    st.session_state["report_messages"] = messages
-                    st.session_state["report_draft"] = full_revision
-                    st.rerun()
-                except Exception as ex:
-                    st.error(f"수정 중 오류: {ex}")
+            profile_request(messages, "수정")
+            pending_job = start_job(
+                st.session_state["report_case_id"], "revision", get_system_prompt(), messages,
+                api_key=api_key, step="revision",
+            )
+            save_messages(messages)
+            st.session_state["report_pending_job"] = pending_job
+            persist_case()
         else:
             st.warning("수정 내용을 입력해주세요.")
+
+    # 진행 중인 수정 작업 (새로고침 후에도 같은 작업에 다시 붙음)
+    if pending_job:
+        with st.chat_message("assistant"):
+            try:
+                full_revision, _ = render_stream(follow_job(pending_job), label="revision")
+            except Exception as ex:
+                full_revision = ""
+                st.error(f"수정 중 오류: {ex}")
+
+        messages = load_messages()
+        if full_revision:
+            messages.append({"role": "model", "content": full_revision})
+            save_text("report_draft", full_revision)
+        elif messages and messages[-1]["role"] == "user":
+            messages.pop()
+        st.session_state["report_pending_job"] = ""
+        save_messages(messages)
+        if full_revision:
+            st.rerun()
@@ -0,0 +1,71 @@
+"""
+페이지: 사건 검색
+- 보고서 사건, 계약서, 동의서·위임장 생성 기록을 이름·증권번호·진단명 등으로 검색
+- 보고서 사건은 저장된 상태 그대로 보고서 작업 화면에서 다시 열기 (자료 재추출 없음)
+"""
+import streamlit as st
+from datetime import datetime
+
+from modules.artifact_store import DOC_TYPES, blob_path, read_artifact
+from modules.case_index import search_cases
+
+REPORT_PAGE = "pages/3_📊_손해사정_보고서(압박골절_개인보험).py"
+PHASE_LABELS = {
+    "input": "자료입력",
+    "verifying": "검증",
+    "drafting": "초안작성",
+    "reviewing": "검수",
+    "complete": "완료",
+}
+# 결과 카드에 요약으로 보여 줄 입력값 (나머지는 펼쳐 보기)
+SUMMARY_FIELDS = ("생년월일", "연락처", "보험회사", "증권번호", "관계")
+MAX_RESULTS = 30
+
+st.set_page_config(page_title="사건 검색", page_icon="🔎", layout="wide")
+st.title("🔎 사건 검색")
+st.caption("피보험자·환자 이름, 증권번호, 진단명, 사고 장소 등 입력값과 보고서 본문에서 찾습니다. 단어 일부만 입력해도 됩니다.")
+
+q_col, kind_col = st.columns([4, 1])
+with q_col:
+    query = st.text_input("검색어", placeholder="예: 홍길동 압박골절", key="case_search_query",
+                          label_visibility="collapsed")
+with kind_col:
+    kind_options = {"": "전체"} | DOC_TYPES
+    kind = st.selectbox("문서 종류", list(kind_options), format_func=kind_options.get,
+                        key="case_search_kind", label_visibility="collapsed")
+
+results = search_cases(query, kind=kind or None, limit=MAX_RESULTS)
+
+if not results:
+    st.info("검색 결과가 없습니다." if query.strip() else "아직 색인된 사건이 없습니다.")
+    st.stop()
+
+st.caption(f"{'검색 결과' if query.strip() else '최근 사건'} {len(results)}건")
+
+for entry in results:
+    fields = entry["fields"]
+    updated = datetime.fromtimestamp(entry["updated_at"]).strftime("%Y-%m-%d %H:%M")
+    status = PHASE_LABELS.get(entry["status"], entry["status"])
+    with st.container(border=True):
+        head_col, action_col = st.columns([4, 1])
+        with head_col:
+            st.markdown(f"**{entry['title']}** · {entry['kind_label']}" + (f" · {status}" if status else ""))
+            summary = " · ".join(
+                f"{name} {', '.join(map(str, value)) if isinstance(value, list) else value}"
+                for name, value in fields.items() if name in SUMMARY_FIELDS
+            )
+            st.caption(f"{updated}" + (f" · {summary}" if summary else ""))
+            if entry["snippet"]:
+                st.caption(entry["snippet"])
+        with action_col:
+            if entry["kind"] == "report":
+                st.page_link(REPORT_PAGE, label="보고서 열기", icon="📊",
+                             query_params={"case": entry["case_id"]})
+            elif entry["artifact"] and blob_path(entry["artifact"], "pdf").exists():
+                # 파일은 버튼을 누를 때 읽음
+                st.download_button("📥 PDF", data=lambda sha=entry["artifact"]: read_artifact(sha),
+                                   file_name=fields.get("파일명", "document.pdf"),
+                                   mime="application/pdf", key=f"case_dl_{entry['case_id']}")
+        with st.expander("입력값 보기"):
+            for name, value in fields.items():
+                st.markdown(f"- **{name}**: {', '.join(map(str, value)) if isinstance(value, list) else value}")
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+페이지 콜드 스타트 import 시간 벤치마크.
+
+각 페이지(Home.py, pages/*.py)의 최상단 import 블록만 뽑아 새 파이썬 프로세스에서
+`python -X importtime`으로 실행하고, streamlit 자체를 뺀 페이지 고유 import 시간을 측정합니다.
+예산(--budget-ms)을 넘는 페이지가 있으면 종료 코드 1을 반환합니다.
+
+실행 예:
+    python scripts/bench_import_time.py
+    python scripts/bench_import_time.py --budget-ms 300 --repeat 5
+    python scripts/bench_import_time.py --json
+"""
+import argparse
+import ast
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+DEFAULT_BUDGET_MS = 50.0
+DEFAULT_REPEAT = 3
+# 기준선: 모든 페이지가 공통으로 치르는 비용 (페이지 측정에서 제외)
+BASELINE_IMPORTS = ["import streamlit"]
+TOP_N = 5
+
+
+def page_files() -> list[Path]:
+    return [PROJECT_ROOT / "Home.py"] + sorted((PROJECT_ROOT / "pages").glob("*.py"))
+
+
+def top_level_imports(path: Path) -> list[str]:
+    """페이지 모듈 최상단(및 최상단 try 블록 안)의 import 문을 소스 그대로 모읍니다."""
+    source = path.read_text(encoding="utf-8")
+    tree = ast.parse(source)
+    statements = []
+
+    def collect(body):
+        for node in body:
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                statements.append(ast.get_source_segment(source, node))
+            elif isinstance(node, ast.Try):
+                collect(node.body)
+
+    collect(tree.body)
+    return statements
+
+
+def _script(statements: list[str]) -> str:
+    # import 실패(미설치 패키지 등)는 측정만 건너뛰고 계속 진행
+    lines = ["import sys", f"sys.path.insert(0, {str(PROJECT_ROOT)!r})"]
+    for stmt in statements:
+        lines.append("try:")
+        lines.extend("    " + line for line in stmt.splitlines())
+        lines.append("except Exception as e:")
+        lines.append(f"    print('IMPORT FAILED', {stmt.splitlines()[0]!r}, e, file=sys.stderr)")
+    return "\n".join(lines)
+
+
+def run_importtime(statements: list[str]) -> tuple[dict[str, tuple[int, int]], list[str]]:
+    """새 프로세스에서 import를 실행합니다.
+
+    Returns:
+        ({모듈명: (self_us, cumulative_us)}, 실패 메시지 목록)
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _script(statements)],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, encoding="utf-8",
+    )
+    modules, failures = {}, []
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:"):
+            parts = line[len("import time:"):].split("|")
+            if len(parts) != 3 or not parts[0].strip().isdigit():
+                continue  # 헤더
+            modules[parts[2].strip()] = (int(parts[0]), int(parts[1]))
+        elif line.startswith("IMPORT FAILED"):
+            failures.append(line[len("IMPORT FAILED "):])
+    return modules, failures
+
+
+def measure_page(path: Path, baseline: set[str], repeat: int) -> dict:
+    statements = top_level_imports(path)
+    best = None
+    for _ in range(repeat):
+        modules, failures = run_importtime(BASELINE_IMPORTS + statements)
+        own = {name: t for name, t in modules.items() if name not in baseline}
+        total_us = sum(self_us for self_us, _ in own.values())
+        if best is None or total_us < best["total_us"]:
+            best = {"total_us": total_us, "own": own, "failures": failures}
+
+    # 최상위 패키지별 self 시간 합계 (fitz, google, fpdf, modules ...)
+    packages: dict[str, int] = {}
+    for name, (self_us, _) in best["own"].items():
+        root = name.split(".")[0]
+        packages[root] = packages.get(root, 0) + self_us
+    heaviest = sorted(packages.items(), key=lambda kv: kv[1], reverse=True)[:TOP_N]
+
+    return {
+        "page": path.name,
+        "imports": len(statements),
+        "modules": len(best["own"]),
+        "total_ms": round(best["total_us"] / 1000, 1),
+        "heaviest": [{"package": pkg, "ms": round(us / 1000, 1)} for pkg, us in heaviest],
+        "failures": best["failures"],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="페이지별 콜드 스타트 import 시간 측정")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"페이지당 import 시간 예산(ms, streamlit 제외). 기본 {DEFAULT_BUDGET_MS:g}")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"페이지당 측정 횟수 (최솟값 사용). 기본 {DEFAULT_REPEAT}")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    baseline_modules, _ = run_importtime(BASELINE_IMPORTS)
+    baseline = set(baseline_modules)
+    baseline_ms = sum(self_us for self_us, _ in baseline_modules.values()) / 1000
+
+    results = [measure_page(path, baseline, max(1, args.repeat)) for path in page_files()]
+    for r in results:
+        r["over_budget"] = r["total_ms"] > args.budget_ms
+    over = [r for r in results if r["over_budget"]]
+
+    if args.json:
+        print(json.dumps({"budget_ms": args.budget_ms, "baseline_ms": round(baseline_ms, 1), "pages": results},
+                         ensure_ascii=False, indent=2))
+    else:
+        print(f"기준선 (streamlit): {baseline_ms:,.1f} ms · 예산: 페이지당 {args.budget_ms:,.0f} ms\n")
+        for r in results:
+            mark = "초과" if r["over_budget"] else "OK"
+            heavy = ", ".join(f"{h['package']} {h['ms']:,.1f}" for h in r["heaviest"])
+            print(f"[{mark:>2}] {r['total_ms']:>8,.1f} ms  {r['modules']:>4}개 모듈  {r['page']}")
+            if heavy:
+                print(f"       상위: {heavy}")
+            for failure in r["failures"]:
+                print(f"       import 실패: {failure}")
+        if over:
+            print(f"\n예산 초과 페이지 {len(over)}개: {', '.join(r['page'] for r in over)}")
+
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
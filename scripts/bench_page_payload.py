@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+페이지 rerun 전송량 벤치마크.
+
+Streamlit은 rerun마다 페이지의 모든 요소를 웹소켓으로 다시 보냅니다. 이 스크립트는 AppTest로 페이지를 실행한 뒤
+요소별 protobuf 직렬화 크기를 합산해 rerun 1회의 전송량(요소 페이로드)을 측정합니다.
+인라인 <style>처럼 rerun마다 반복되는 큰 요소를 찾는 용도입니다.
+
+실행 예:
+    python scripts/bench_page_payload.py
+    python scripts/bench_page_payload.py --page Home.py --json
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# 페이지 실행 중 AI 호출이 일어나지 않도록
+os.environ.setdefault("JISAN_LLM_BACKEND", "stub")
+
+TOP_N = 5
+PREVIEW_CHARS = 60
+
+
+def _walk(node):
+    """요소 트리를 돌며 (요소 종류, 직렬화 크기, 미리보기)를 냅니다."""
+    children = getattr(node, "children", None)
+    if children is not None:
+        for child in children.values():
+            yield from _walk(child)
+        return
+    proto = getattr(node, "proto", None)
+    if proto is None:
+        return
+    value = getattr(node, "value", "")
+    preview = " ".join(str(value).split())[:PREVIEW_CHARS] if isinstance(value, str) else ""
+    yield node.type, proto.ByteSize(), preview
+
+
+def measure_page(path: Path, timeout: float) -> dict:
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(path), default_timeout=timeout).run()
+    # 두 번째 실행 = 사용자 상호작용으로 인한 rerun (첫 실행과 같은 요소를 다시 보냄)
+    at.run()
+    elements = list(_walk(at._tree))
+    by_type: dict[str, int] = {}
+    for kind, size, _ in elements:
+        by_type[kind] = by_type.get(kind, 0) + size
+    largest = sorted(elements, key=lambda e: e[1], reverse=True)[:TOP_N]
+    return {
+        "page": path.name,
+        "elements": len(elements),
+        "bytes": sum(size for _, size, _ in elements),
+        "by_type": dict(sorted(by_type.items(), key=lambda kv: kv[1], reverse=True)),
+        "largest": [{"type": kind, "bytes": size, "preview": preview} for kind, size, preview in largest],
+        "exceptions": [str(e.value)[:200] for e in at.exception],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="페이지 rerun 1회 전송량(요소 페이로드) 측정")
+    parser.add_argument("--page", action="append",
+                        help="측정할 페이지 (Home.py 또는 pages/ 아래 파일명, 여러 번 지정 가능). 기본: Home.py")
+    parser.add_argument("--timeout", type=float, default=60.0, help="페이지 실행 제한 시간(초)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args(argv)
+
+    paths = []
+    for name in args.page or ["Home.py"]:
+        path = PROJECT_ROOT / name
+        if not path.exists():
+            path = PROJECT_ROOT / "pages" / name
+        paths.append(path)
+
+    results = [measure_page(path, args.timeout) for path in paths]
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return 0
+
+    for r in results:
+        print(f"{r['page']}: rerun당 {r['bytes']:,} B · 요소 {r['elements']}개")
+        print("  종류별: " + ", ".join(f"{kind} {size:,}" for kind, size in r["by_type"].items()))
+        for item in r["largest"]:
+            print(f"  {item['bytes']:>8,} B  {item['type']:<10} {item['preview']}")
+        for exc in r["exceptions"]:
+            print(f"  예외: {exc}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
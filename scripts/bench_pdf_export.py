@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+"""
+손해사정서 PDF 변환 벤치마크.
+
+합성한 50~200페이지 보고서로 이전 방식(줄마다 정규식 연쇄, set_font 반복)과 현재
+report_pdf_exporter.markdown_to_pdf(토큰화 + 상태 추적 렌더러)의 변환 시간을 비교하고,
+두 결과 PDF의 페이지 수와 페이지별 텍스트가 같은지 확인합니다.
+--revision을 주면 섹션 캐시(render_report_pdf)로 전체 변환과 한 섹션 수정 후 재변환 시간, 결과 PDF 크기를 잽니다.
+--parallel을 주면 섹션을 현재 프로세스와 프로세스 풀에서 각각 변환한 시간, 풀 호출 고정 비용,
+측정된 변환 시간(문서당 고정 비용 + 글자당 시간)을 보여 주고 PDF_PARALLEL_MIN_SECONDS 값을 제안합니다.
+
+실행 예:
+    python scripts/bench_pdf_export.py
+    python scripts/bench_pdf_export.py --pages 50 200 --repeat 5
+    python scripts/bench_pdf_export.py --revision --pages 100
+    python scripts/bench_pdf_export.py --parallel --workers 4
+    python scripts/bench_pdf_export.py --font /usr/share/fonts/truetype/nanum/NanumGothic.ttf
+"""
+import argparse
+import logging
+import os
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from modules import report_pdf_exporter  # noqa: E402
+from modules.report_pdf_exporter import (  # noqa: E402
+    NEXT_LINE,
+    ReportPDF,
+    estimate_parallel_saving,
+    estimate_render_seconds,
+    markdown_to_pdf,
+    render_fragments,
+    render_report_pdf,
+    split_sections,
+    tokenize,
+)
+
+DEFAULT_PAGES = (50, 100, 200)
+DEFAULT_REPEAT = 3
+
+SECTION = """## {n}. 사고 경위 및 조사 내용
+
+<div class="section">피보험자 **홍길동**은 {n}번째 조사 항목과 관련하여 *요추 압박골절* 진단을 받았습니다.<br>
+진단서 발급일은 `2024-03-{day:02d}`이며, 주치의 소견은 아래와 같습니다.</div>
+
+### 가. 의료 기록 검토
+
+- 최초 내원: **2024년 3월 {day}일** 정형외과 외래
+- 영상 검사: X-ray 및 MRI 촬영, *L1 압박률 25%*
+- 치료 내용: 보존적 치료(보조기 착용) 및 약물 치료
+1. 입원 기간 14일 (입원 기록 `ADM-{n:04d}` 확인)
+2. 통원 치료 8회, 물리치료 병행
+
+> 주치의 소견: **골다공증 동반 여부**를 추가로 확인할 필요가 있음.
+
+| 구분 | 청구 금액 | 인정 금액 | 비고 |
+|------|----------:|----------:|------|
+| 입원 일당 | 700,000 | 700,000 | **전액 인정** |
+| 수술비 | 0 | 0 | 해당 없음 |
+| 골절 진단비 | 1,000,000 | 1,000,000 | 약관 제{n}조 |
+| 후유장해 | 3,000,000 | 2,100,000 | *지급률 조정* |
+
+약관 해석상 압박골절은 골절 진단비 지급 대상에 해당하며, 후유장해는 척추 기형 정도에 따라
+지급률을 산정하였습니다. 본 건은 고지의무 위반 사항이 확인되지 않았으므로 면책 사유에 해당하지 않습니다.
+피보험자의 직업, 기왕증, 사고 발생 경위를 종합적으로 검토한 결과 보험금 지급이 타당하다고 판단됩니다.
+
+---
+
+"""
+
+
+# ── 이전 구현 (비교 기준) ──
+# multi_cell 커서 위치(NEXT_LINE)만 현재 구현과 같게 맞춤 — 그렇지 않으면 연속된 문단에서 실패
+
+def _legacy_clean_inline(text: str) -> str:
+    text = re.sub(r"\*\*(.+?)\*\*", r"\1", text)
+    text = re.sub(r"\*(.+?)\*", r"\1", text)
+    text = re.sub(r"`(.+?)`", r"\1", text)
+    return text.strip()
+
+
+def legacy_markdown_to_pdf(md_text: str) -> bytes:
+    text = re.sub(r"<div[^>]*>\s*</div>", "", md_text)
+    text = re.sub(r"<div[^>]*>", "", text)
+    text = re.sub(r"</div>", "", text)
+    text = re.sub(r"<br\s*/?>", "\n", text)
+    text = re.sub(r"<hr[^>]*>", "---PAGE_BREAK---", text)
+
+    pdf = ReportPDF()
+    pdf.add_page()
+    pdf.set_font("malgun", "", 11)
+
+    lines = text.split("\n")
+    i = 0
+    while i < len(lines):
+        line = lines[i].rstrip()
+        if not line.strip():
+            pdf.ln(3)
+            i += 1
+            continue
+        if "PAGE_BREAK" in line or "page-break" in line.lower():
+            pdf.add_page()
+            i += 1
+            continue
+        if line.strip() in ("---", "***", "___"):
+            pdf.ln(2)
+            pdf.set_draw_color(200, 200, 200)
+            pdf.line(20, pdf.get_y(), 190, pdf.get_y())
+            pdf.ln(4)
+            i += 1
+            continue
+        heading = None
+        for prefix, before, size, height, after in (("# ", 4, 16, 9, 2), ("## ", 3, 13, 8, 1), ("### ", 2, 11, 7, 1)):
+            if line.startswith(prefix):
+                heading = (prefix, before, size, height, after)
+                break
+        if heading:
+            prefix, before, size, height, after = heading
+            pdf.ln(before)
+            pdf.set_font("malgun", "B", size)
+            pdf.multi_cell(0, height, _legacy_clean_inline(line[len(prefix):]), **NEXT_LINE)
+            pdf.set_font("malgun", "", 11)
+            pdf.ln(after)
+            i += 1
+            continue
+        if line.startswith("> "):
+            pdf.set_text_color(80, 80, 80)
+            pdf.set_x(25)
+            pdf.multi_cell(165, 6, _legacy_clean_inline(line[2:]), **NEXT_LINE)
+            pdf.set_text_color(0, 0, 0)
+            i += 1
+            continue
+        if re.match(r"^[-*]\s", line.strip()):
+            pdf.cell(8, 6, "  -")
+            pdf.multi_cell(0, 6, _legacy_clean_inline(line.strip()[2:]), **NEXT_LINE)
+            i += 1
+            continue
+        m = re.match(r"^(\d+)\.\s(.+)", line.strip())
+        if m:
+            pdf.cell(10, 6, f"  {m.group(1)}.")
+            pdf.multi_cell(0, 6, _legacy_clean_inline(m.group(2)), **NEXT_LINE)
+            i += 1
+            continue
+        if line.strip().startswith("|"):
+            table_rows = []
+            while i < len(lines) and lines[i].strip().startswith("|"):
+                cells = [c.strip() for c in lines[i].strip().split("|")[1:-1]]
+                if cells and not all(set(c) <= set("-: ") for c in cells):
+                    table_rows.append(cells)
+                i += 1
+            if table_rows:
+                num_cols = max(len(r) for r in table_rows)
+                col_w = 170 / num_cols
+                pdf.set_font("malgun", "", 9)
+                for row_idx, row in enumerate(table_rows):
+                    for col_idx in range(num_cols):
+                        cell_text = _legacy_clean_inline(row[col_idx]) if col_idx < len(row) else ""
+                        if row_idx == 0:
+                            pdf.set_font("malgun", "B", 9)
+                            pdf.set_fill_color(240, 240, 240)
+                            pdf.cell(col_w, 7, cell_text, border=1, fill=True)
+                            pdf.set_font("malgun", "", 9)
+                        else:
+                            pdf.cell(col_w, 7, cell_text, border=1)
+                    pdf.ln()
+                pdf.set_font("malgun", "", 11)
+                pdf.ln(2)
+            continue
+        clean = _legacy_clean_inline(line)
+        if clean:
+            pdf.multi_cell(0, 6, clean, **NEXT_LINE)
+        i += 1
+    return bytes(pdf.output())
+
+
+# ── 측정 ──
+
+PAGE_BREAK_DIV = '<div style="page-break-before: always;"></div>\n'
+
+
+def build_report(sections: int, page_breaks: bool = False) -> str:
+    parts = [SECTION.format(n=n, day=n % 28 + 1) for n in range(1, sections + 1)]
+    return "# 손해사정서 (벤치마크용)\n\n" + (PAGE_BREAK_DIV if page_breaks else "").join(parts)
+
+
+def page_texts(pdf_bytes: bytes) -> list[str]:
+    import fitz
+
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return [page.get_text() for page in doc]
+
+
+def sections_for_pages(pages: int) -> int:
+    """목표 페이지 수에 맞는 섹션 수 (작은 문서로 섹션당 페이지 수를 먼저 잰 뒤 비례 계산)."""
+    sample = 10
+    sample_pages = len(page_texts(markdown_to_pdf(build_report(sample))))
+    return max(1, round(pages * sample / sample_pages))
+
+
+def timed(func, text: str, repeat: int) -> tuple[float, bytes]:
+    times, result = [], b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(text)
+        times.append(time.perf_counter() - started)
+    return statistics.median(times), result
+
+
+def bench_revision(target: int) -> bool:
+    """섹션 캐시: 전체 변환 vs 처음 변환(캐시 비어 있음) vs 캐시 적중 vs 한 섹션 수정 후 재변환."""
+    sections = sections_for_pages(target)
+    text = build_report(sections, page_breaks=True)
+    revised = text.replace(f"{sections // 2}번째 조사 항목", "수정된 조사 항목", 1)
+
+    full_s, full_pdf = timed(markdown_to_pdf, text, 1)
+    # 크기가 다른 보고서도 같은 섹션을 공유하므로 크기마다 빈 캐시에서 시작
+    report_pdf_exporter.clear_cache()
+    cold_s, cold_pdf = timed(render_report_pdf, text, 1)
+    warm_s, _ = timed(render_report_pdf, text, 1)
+    stats = {}
+    started = time.perf_counter()
+    result = render_report_pdf(revised, stats=stats)
+    revision_s = time.perf_counter() - started
+    same = page_texts(result) == page_texts(markdown_to_pdf(revised))
+    print(f"{stats['pages']:>6} {full_s:>9.3f} {cold_s:>9.3f} {warm_s:>9.3f} {revision_s:>9.3f}  "
+          f"{stats['rendered']}/{stats['sections']}  {len(full_pdf) / 1024:>7.0f} {len(cold_pdf) / 1024:>7.0f} "
+          f"{len(result) / 1024:>7.0f}  {'예' if same else '아니오'}")
+    return same
+
+
+def bench_parallel(targets: list[int], workers: int):
+    """현재 프로세스 vs 프로세스 풀 변환 시간과, 병렬이 이득이 되는 예상 절감 시간을 측정합니다."""
+    tiny = split_sections(tokenize("짧은 섹션"))
+    # 풀 시작(spawn) 비용과, 시작된 풀에 작업 하나를 보내고 받는 고정 비용
+    started = time.perf_counter()
+    render_fragments(tiny * workers, parallel=True)
+    spawn_s = time.perf_counter() - started
+    dispatch = []
+    for _ in range(5):
+        started = time.perf_counter()
+        render_fragments(tiny * workers, parallel=True)
+        dispatch.append(time.perf_counter() - started)
+    dispatch_s = statistics.median(dispatch)
+    print(f"풀 시작 {spawn_s:.3f}s · 작업 {workers}개 왕복 {dispatch_s:.3f}s (작업자 {workers}개)\n")
+
+    print(f"{'페이지':>6} {'섹션':>5} {'예상(s)':>9} {'현재(s)':>9} {'예상절감':>9} {'병렬(s)':>9} {'배율':>6}")
+    suggestion = None
+    for target in targets:
+        sections = split_sections(tokenize(build_report(sections_for_pages(target), page_breaks=True)))
+        started = time.perf_counter()
+        render_fragments(sections, parallel=False)
+        serial_s = time.perf_counter() - started
+        estimate = estimate_render_seconds(sections)
+        saving = estimate_parallel_saving(sections, min(workers, len(sections)))
+        started = time.perf_counter()
+        render_fragments(sections, parallel=True)
+        parallel_s = time.perf_counter() - started
+        if parallel_s < serial_s and (suggestion is None or saving < suggestion):
+            suggestion = saving
+        print(f"{target:>6} {len(sections):>5} {estimate:>9.3f} {serial_s:>9.3f} {saving:>9.3f} {parallel_s:>9.3f} "
+              f"{serial_s / parallel_s:>5.2f}x")
+
+    print(f"\n측정된 변환 시간: 문서당 {report_pdf_exporter._fixed_seconds:.3f}s + "
+          f"{report_pdf_exporter._seconds_per_char * 1e6:.1f} µs/글자")
+    if suggestion is None:
+        print("이 환경에서는 병렬 변환이 더 빠른 크기가 없었습니다 (CPU 수를 확인하세요).")
+    else:
+        # 이득이 난 가장 작은 크기의 예상 절감 시간과, 시작된 풀의 작업 왕복 비용 중 큰 값
+        print(f"제안: PDF_PARALLEL_MIN_SECONDS = {max(dispatch_s, min(suggestion, 1.0)):.2f}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="마크다운 → PDF 변환 벤치마크")
+    parser.add_argument("--pages", type=int, nargs="+", default=list(DEFAULT_PAGES), help="목표 페이지 수")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="크기별 측정 횟수 (중앙값 사용)")
+    parser.add_argument("--font", help="malgun.ttf 대신 사용할 TTF 경로 (폰트가 없는 환경용)")
+    parser.add_argument("--revision", action="store_true", help="섹션 캐시의 수정 후 재변환 시간 측정")
+    parser.add_argument("--parallel", action="store_true", help="프로세스 풀 병렬 변환 측정")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="--parallel 작업자 수")
+    args = parser.parse_args(argv)
+
+    if args.font:
+        report_pdf_exporter.FONT_PATH = args.font
+    if not Path(report_pdf_exporter.FONT_PATH).exists():
+        print(f"폰트 파일이 없습니다: {report_pdf_exporter.FONT_PATH} (--font로 지정)", file=sys.stderr)
+        return 2
+    # 대체 폰트에 없는 한글 글리프 경고는 생략
+    logging.getLogger("fpdf").setLevel(logging.ERROR)
+
+    if args.parallel:
+        os.environ["JISAN_PDF_RENDER_WORKERS"] = str(args.workers)
+        bench_parallel(args.pages, args.workers)
+        return 0
+
+    if args.revision:
+        print(f"{'페이지':>6} {'전체(s)':>9} {'처음(s)':>9} {'적중(s)':>9} {'수정(s)':>9}  재변환  "
+              f"{'전체KB':>7} {'처음KB':>7} {'수정KB':>7}  결과 일치")
+        return 0 if all([bench_revision(target) for target in args.pages]) else 1
+
+    mismatched = 0
+    print(f"{'페이지':>6} {'이전(s)':>9} {'현재(s)':>9} {'배율':>6}  결과 일치")
+    for target in args.pages:
+        text = build_report(sections_for_pages(target))
+        legacy_s, legacy_pdf = timed(legacy_markdown_to_pdf, text, args.repeat)
+        current_s, current_pdf = timed(markdown_to_pdf, text, args.repeat)
+        legacy_pages, current_pages = page_texts(legacy_pdf), page_texts(current_pdf)
+        same = legacy_pages == current_pages
+        mismatched += not same
+        print(f"{len(current_pages):>6} {legacy_s:>9.3f} {current_s:>9.3f} {legacy_s / current_s:>5.2f}x  "
+              f"{'예' if same else '아니오'}")
+    return 1 if mismatched else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
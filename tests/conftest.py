@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""테스트에서 modules 패키지를 import할 수 있도록 프로젝트 루트를 경로에 추가합니다."""
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
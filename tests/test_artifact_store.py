@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""artifact_store 집계(rollups) 유지 테스트 (임시 output 폴더 사용)."""
+from datetime import datetime
+
+import pytest
+
+from modules import artifact_store
+from modules.artifact_store import (
+    period_bucket,
+    rollup_breakdown,
+    rollup_counts,
+    rollup_series,
+    save_artifact,
+)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifact_store, "OUTPUT_DIR", tmp_path)
+    monkeypatch.setattr(artifact_store, "DB_PATH", tmp_path / "ledger.sqlite3")
+    monkeypatch.setattr(artifact_store, "_initialized", False)
+    return tmp_path
+
+
+def _all_rollups() -> list[tuple]:
+    conn = artifact_store._connect()
+    try:
+        return conn.execute("SELECT * FROM rollups ORDER BY period, bucket, doc_type, staff").fetchall()
+    finally:
+        conn.close()
+
+
+# ── 버킷 ──
+def test_period_bucket_uses_iso_week_across_years():
+    assert period_bucket("day", datetime(2027, 1, 1)) == "2027-01-01"
+    assert period_bucket("week", datetime(2027, 1, 1)) == "2026-W53"
+    assert period_bucket("week", datetime(2024, 12, 30)) == "2025-W01"
+    assert period_bucket("month", datetime(2027, 1, 1)) == "2027-01"
+    assert period_bucket("all", datetime(2027, 1, 1)) == "all"
+
+
+# ── 집계 유지 ──
+def test_save_artifact_bumps_every_rollup(store):
+    save_artifact(b"a", "contract", "a.pdf", staff="kim")
+    save_artifact(b"b", "consent", "b.pdf", staff="kim")
+    saved = save_artifact(b"a", "contract", "a2.pdf", staff="lee")
+    assert saved["deduplicated"] is True
+
+    assert rollup_counts() == {"today": 3, "week": 3, "month": 3, "total": 3}
+    assert rollup_counts(doc_type="contract")["total"] == 2
+    assert rollup_counts(staff="kim")["total"] == 2
+    assert rollup_counts(doc_type="contract", staff="lee")["today"] == 1
+    assert rollup_breakdown("day", by="doc_type") == {"contract": 2, "consent": 1}
+    assert rollup_breakdown("day", by="staff") == {"kim": 2, "lee": 1}
+
+
+def test_rollup_series_fills_empty_buckets(store):
+    save_artifact(b"a", "report", "a.pdf")
+    series = rollup_series("day", n=3)
+    assert [count for _, count in series] == [0, 0, 1]
+    assert series[-1][0] == period_bucket("day", datetime.now())
+
+
+def test_rebuild_matches_incremental_rollups(store):
+    save_artifact(b"a", "contract", "a.pdf", staff="kim")
+    save_artifact(b"bb", "report", "b.pdf", staff="lee")
+    incremental = _all_rollups()
+
+    conn = artifact_store._connect()
+    try:
+        conn.execute("DELETE FROM rollups")
+        conn.commit()
+    finally:
+        conn.close()
+    artifact_store._initialized = False
+    assert _all_rollups() == incremental
+
+
+def test_empty_store_reads_zero_without_creating_db(store):
+    assert rollup_counts()["total"] == 0
+    assert rollup_breakdown() == {}
+    assert not (store / "ledger.sqlite3").exists()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""case_index 2-gram 검색식과 보존 기간 정리 테스트 (임시 SQLite DB 사용)."""
+import time
+
+import pytest
+
+from modules import case_index
+from modules.case_index import expire_cases, index_case, match_query, ngrams, search_cases
+
+DAY = 86400
+
+
+@pytest.fixture
+def index_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(case_index, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(case_index, "DB_PATH", tmp_path / "case_index.sqlite3")
+    monkeypatch.setattr(case_index, "_initialized", False)
+    # index_case·search_cases 안의 자동 정리는 시간 간격으로 건너뛰게 함
+    monkeypatch.setattr(case_index, "_last_expire", time.time())
+    monkeypatch.setattr(case_index, "_backfill_reports", lambda: None)
+    monkeypatch.setenv("JISAN_CASE_RETENTION_DAYS", "180")
+    return tmp_path
+
+
+def _case_ids(results: list[dict]) -> list[str]:
+    return sorted(entry["case_id"] for entry in results)
+
+
+# ── 2-gram 검색식 ──
+def test_ngrams_adds_trailing_syllable():
+    assert ngrams("홍길동") == "홍길 길동 동"
+
+
+def test_ngrams_keeps_single_character_words():
+    assert ngrams("김 S22.0") == "김 s2 22 2 0"
+
+
+def test_match_query_builds_phrase_per_word():
+    assert match_query("홍길동 압박골절") == '"홍길 길동" AND "압박 박골 골절"'
+
+
+def test_match_query_single_character_is_prefix():
+    assert match_query("동") == '"동"*'
+
+
+def test_match_query_empty():
+    assert match_query("  ,. ") == ""
+
+
+# ── 검색 ──
+def test_search_finds_partial_and_trailing_syllable(index_db):
+    index_case("c1", "contract", "홍길동", {"주소": "서울시 강남구"})
+    index_case("c2", "consent", "김철수", {"주소": "부산시 해운대구"})
+    assert _case_ids(search_cases("길동")) == ["c1"]
+    assert _case_ids(search_cases("동")) == ["c1"]
+    assert _case_ids(search_cases("구")) == ["c1", "c2"]
+    assert _case_ids(search_cases("홍길동 강남")) == ["c1"]
+
+
+# ── 보존 기간 ──
+def test_expire_cases_removes_old_entries_of_every_kind(index_db):
+    now = time.time()
+    old = now - 200 * DAY
+    index_case("old-contract", "contract", "홍길동", {"연락처": "010-1234-5678"}, updated_at=old)
+    index_case("old-consent", "consent", "김철수", {"생년월일": "900101"}, updated_at=old)
+    index_case("old-report", "report", "이영희", {"주소": "대전"}, updated_at=old)
+    index_case("new-contract", "contract", "박민수", {"주소": "광주"}, updated_at=now)
+
+    assert expire_cases(force=True, now=now) == 3
+    assert _case_ids(search_cases("")) == ["new-contract"]
+    assert search_cases("홍길동") == []
+
+
+def test_expire_cases_is_throttled(index_db):
+    index_case("c1", "contract", "홍길동", {}, updated_at=time.time() - 200 * DAY)
+    assert expire_cases(force=True) == 1
+    index_case("c2", "contract", "김철수", {}, updated_at=time.time() - 200 * DAY)
+    assert expire_cases() == 0
+    assert expire_cases(force=True) == 1
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""llm_scheduler 입장 제어 단위 테스트 (API 호출 없음)."""
+import threading
+import time
+
+import pytest
+
+from modules import llm_scheduler
+from modules.llm_scheduler import CallCancelled, LLMScheduler, _TokenBucket, is_retryable
+
+TIMEOUT = 5.0
+
+
+class _Transient(Exception):
+    code = 429
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(llm_scheduler, "backoff_delay", lambda attempt: 0.0)
+
+
+def _wait_for(predicate, timeout: float = TIMEOUT):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def _hold_slot(scheduler: LLMScheduler, session: str = "holder") -> threading.Event:
+    """자리 하나를 점유하는 스레드를 띄우고, 반납 신호용 이벤트를 반환합니다."""
+    entered, release = threading.Event(), threading.Event()
+
+    def hold():
+        with scheduler.slot(session):
+            entered.set()
+            release.wait(TIMEOUT)
+
+    threading.Thread(target=hold, daemon=True).start()
+    assert entered.wait(TIMEOUT)
+    return release
+
+
+# ── 판별·토큰 버킷 ──
+def test_is_retryable_by_code_and_marker():
+    assert is_retryable(_Transient())
+    assert is_retryable(RuntimeError("503 UNAVAILABLE"))
+    assert not is_retryable(ValueError("invalid argument"))
+
+
+def test_token_bucket_refills_per_second():
+    bucket = _TokenBucket(60)
+    bucket.take(60)
+    assert bucket.wait_time(1, bucket.updated) == pytest.approx(1.0)
+    assert bucket.wait_time(1, bucket.updated + 1.0) == 0.0
+
+
+def test_token_bucket_caps_request_at_capacity():
+    bucket = _TokenBucket(10)
+    assert bucket.wait_time(1000, bucket.updated) == 0.0
+
+
+def test_rpm_limit_delays_admission():
+    scheduler = LLMScheduler(rpm=1)
+    with scheduler.slot("a"):
+        pass
+    cancel = threading.Event()
+    outcome = []
+
+    def second():
+        try:
+            with scheduler.slot("b", cancel=cancel):
+                outcome.append("admitted")
+        except CallCancelled:
+            outcome.append("cancelled")
+
+    thread = threading.Thread(target=second, daemon=True)
+    thread.start()
+    _wait_for(lambda: scheduler.throttled > 0)
+    cancel.set()
+    thread.join(TIMEOUT)
+    assert outcome == ["cancelled"]
+    assert scheduler.admitted == 1
+
+
+# ── 공정 대기열 ──
+def test_round_robin_between_sessions():
+    scheduler = LLMScheduler(max_concurrency=1)
+    release = _hold_slot(scheduler)
+    admitted, threads = [], []
+
+    def call(session: str):
+        with scheduler.slot(session):
+            admitted.append(session)
+
+    for session in ("a", "a", "a", "b"):
+        thread = threading.Thread(target=call, args=(session,), daemon=True)
+        thread.start()
+        threads.append(thread)
+        _wait_for(lambda: len(scheduler.snapshot()["waiting"]) == len(threads))
+
+    assert [w["session"] for w in scheduler.snapshot()["waiting"]] == ["a", "b", "a", "a"]
+    assert scheduler.session_position("b") == 2
+    release.set()
+    for thread in threads:
+        thread.join(TIMEOUT)
+    assert admitted == ["a", "b", "a", "a"]
+
+
+def test_on_wait_reports_position_and_errors_are_contained():
+    scheduler = LLMScheduler(max_concurrency=1)
+    release = _hold_slot(scheduler)
+    positions = []
+
+    def on_wait(position: int, total: int):
+        positions.append((position, total))
+        raise RuntimeError("ui gone")
+
+    result = []
+    thread = threading.Thread(
+        target=lambda: result.append(scheduler.call(lambda: "ok", session="a", on_wait=on_wait)), daemon=True,
+    )
+    thread.start()
+    _wait_for(lambda: positions)
+    release.set()
+    thread.join(TIMEOUT)
+    assert positions[0] == (1, 1)
+    assert result == ["ok"]
+
+
+def test_cancel_while_queued_never_opens_stream():
+    scheduler = LLMScheduler(max_concurrency=1)
+    release = _hold_slot(scheduler)
+    cancel, opened, outcome = threading.Event(), [], []
+
+    def consume():
+        try:
+            list(scheduler.stream(lambda: opened.append(1) or iter(["x"]), session="b", cancel=cancel))
+        except CallCancelled:
+            outcome.append("cancelled")
+
+    thread = threading.Thread(target=consume, daemon=True)
+    thread.start()
+    _wait_for(lambda: scheduler.session_position("b") == 1)
+    cancel.set()
+    thread.join(TIMEOUT)
+    release.set()
+    assert outcome == ["cancelled"]
+    assert opened == []
+    assert scheduler.snapshot()["waiting"] == []
+
+
+# ── 재시도 ──
+def test_stream_retries_before_first_chunk():
+    scheduler = LLMScheduler()
+    attempts = []
+
+    def open_stream():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise _Transient("rate limited")
+        return iter(["a", "b"])
+
+    assert list(scheduler.stream(open_stream)) == ["a", "b"]
+    assert scheduler.retries == 1
+    assert scheduler.admitted == 2
+
+
+def test_stream_does_not_retry_after_first_chunk():
+    scheduler = LLMScheduler()
+    attempts, received = [], []
+
+    def open_stream():
+        attempts.append(1)
+        yield "a"
+        raise _Transient("rate limited")
+
+    with pytest.raises(_Transient):
+        for chunk in scheduler.stream(open_stream):
+            received.append(chunk)
+    assert received == ["a"]
+    assert len(attempts) == 1
+    assert scheduler.retries == 0
+
+
+def test_call_gives_up_after_max_retries():
+    scheduler = LLMScheduler(max_retries=2)
+    attempts = []
+
+    def fail():
+        attempts.append(1)
+        raise _Transient("overloaded")
+
+    with pytest.raises(_Transient):
+        scheduler.call(fail)
+    assert len(attempts) == 3
+
+
+def test_call_does_not_retry_permanent_errors():
+    scheduler = LLMScheduler()
+    attempts = []
+
+    def fail():
+        attempts.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        scheduler.call(fail)
+    assert len(attempts) == 1
+    assert scheduler.snapshot()["active"] == 0
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""report_pdf_exporter.tokenize 블록·인라인 처리 테스트 (PDF는 만들지 않음)."""
+from modules.report_pdf_exporter import split_sections, tokenize
+
+
+def test_inline_bold_italic_and_code():
+    assert tokenize("**굵게 *기울임* 포함** 그리고 `코드 **그대로**`") == [
+        ("text", "굵게 기울임 포함 그리고 코드 **그대로**"),
+    ]
+
+
+def test_emphasis_at_line_start_is_not_a_bullet():
+    assert tokenize("*강조*로 시작하는 문장") == [("text", "강조로 시작하는 문장")]
+
+
+def test_headings_lists_and_quotes():
+    assert tokenize("## **진단**\n- 항목 *하나*\n* 항목 둘\n3. **셋째**\n> 인용 `문구`") == [
+        ("heading", 2, "진단"),
+        ("bullet", "항목 하나"),
+        ("bullet", "항목 둘"),
+        ("numbered", "3", "셋째"),
+        ("quote", "인용 문구"),
+    ]
+
+
+def test_table_skips_separator_row():
+    assert tokenize("| 항목 | **금액** |\n|---|:---:|\n| 입원 | 100 |\n다음 문단") == [
+        ("table", [["항목", "금액"], ["입원", "100"]]),
+        ("text", "다음 문단"),
+    ]
+
+
+def test_html_page_break_and_br():
+    tokens = tokenize('첫 쪽<br>둘째 줄\n<div style="page-break-before: always;"></div>\n둘째 쪽')
+    assert ("page_break",) in tokens
+    assert [t for t in tokens if t[0] == "text"] == [("text", "첫 쪽"), ("text", "둘째 줄"), ("text", "둘째 쪽")]
+
+
+def test_split_sections_on_page_breaks():
+    sections = split_sections(tokenize("가\n---PAGE_BREAK---\n나"))
+    assert [[t for t in s if t[0] == "text"] for s in sections] == [[("text", "가")], [("text", "나")]]
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""report_precheck 규칙 엔진 단위 테스트 (API 호출 없음)."""
+from datetime import date
+
+from modules.report_precheck import (
+    find_angles,
+    find_compression_rates,
+    find_dates,
+    find_kcd_codes,
+    parse_period,
+    precheck_case,
+)
+
+
+# ── 날짜 ──
+def test_find_dates_reads_mixed_formats_in_order():
+    text = "사고일 2024.03.15, 입원 2024년 3월 20일, 퇴원 24-04-02"
+    assert find_dates(text) == [date(2024, 3, 15), date(2024, 3, 20), date(2024, 4, 2)]
+
+
+def test_find_dates_rejects_impossible_dates():
+    assert find_dates("2024.13.45 / 2023년 2월 30일") == []
+
+
+def test_parse_period_orders_start_and_end():
+    assert parse_period("2025.01.01 ~ 2020.01.01") == (date(2020, 1, 1), date(2025, 1, 1))
+
+
+# ── KCD 코드 ──
+def test_find_kcd_codes_dedupes_in_order():
+    assert find_kcd_codes("S22.0 흉추 압박골절, M48.56 척추협착, S22.0") == ["S22.0", "M48.56"]
+
+
+def test_find_kcd_codes_ignores_embedded_tokens():
+    assert find_kcd_codes("모델 ABS22, 번호 S223") == []
+
+
+# ── 각도 ──
+def test_find_angles():
+    assert find_angles("후만각 15도, 측만각 12.5°") == [15.0, 12.5]
+
+
+def test_find_angles_ignores_words_starting_with_do():
+    assert find_angles("15도로 이동") == []
+
+
+# ── 압박률 ──
+def test_find_compression_rates_both_orders():
+    assert find_compression_rates("압박률 35%, 40% 압박") == [35.0, 40.0]
+
+
+def test_find_compression_rates_ignores_other_percentages():
+    assert find_compression_rates("할인율 35%") == []
+
+
+# ── 주민번호 (생년월일 대체) ──
+def _items(result: dict, kind: str) -> list[str]:
+    return [entry["item"] for entry in result[kind]]
+
+
+def test_resident_number_in_attachment_counts_as_birth_date():
+    result = precheck_case({"insured_name": "홍길동"}, uploaded_texts=["주민등록번호 900101-1234567"])
+    assert "피보험자 생년월일" not in _items(result, "missing")
+
+
+def test_invalid_resident_number_does_not_count_as_birth_date():
+    result = precheck_case({"insured_name": "홍길동"}, uploaded_texts=["번호 900101-5234567"])
+    assert "피보험자 생년월일" in _items(result, "missing")
+
+
+# ── precheck_case ──
+def test_precheck_case_reports_missing_fields_without_model():
+    result = precheck_case({})
+    missing = _items(result, "missing")
+    assert {"피보험자 성명", "사고일시", "보험계약사항", "약관", "장해진단서"} <= set(missing)
+    assert result["status"] == "incomplete"
+    assert result["needs_model"] is False
+    assert len(result["questions"]) == len(missing)
+
+
+def test_precheck_case_flags_accident_outside_policy_period():
+    data = {
+        "insured_name": "홍길동",
+        "insured_birth": "1990.01.01",
+        "insured_address": "서울시",
+        "insured_phone": "010-1234-5678",
+        "accident_date": "2024.03.15",
+        "accident_place": "자택",
+        "accident_desc": "계단에서 넘어짐",
+        "contracts": [{"company": "A손보", "product": "상해보험", "policy_no": "123",
+                       "period": "2020.01.01 ~ 2023.12.31", "coverage": "후유장해"}],
+    }
+    result = precheck_case(data, uploaded_texts=["진단명 S22.0 압박률 30%"],
+                           uploaded_names=["약관.pdf", "장해진단서.pdf"])
+    assert result["missing"] == []
+    assert _items(result, "conflicting") == ["계약 1(A손보) 보험기간"]
+    assert result["facts"]["kcd_codes"] == ["S22.0"]
+    assert result["facts"]["compression_rates"] == [30.0]
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""report_verification.parse_verification 응답 정규화 테스트 (API 호출 없음)."""
+from modules.report_verification import is_complete, parse_verification
+
+
+def test_parses_fenced_json_and_normalizes_entries():
+    result = parse_verification(
+        '```json\n{"status": "incomplete", "summary": "요약",'
+        ' "missing": ["사고일시", {"item": "진단서", "detail": "발급일 없음"}, ""],'
+        ' "questions": ["사고 장소는?", null]}\n```'
+    )
+    assert result["parse_error"] is False
+    assert result["summary"] == "요약"
+    assert result["missing"] == [{"item": "사고일시", "detail": ""}, {"item": "진단서", "detail": "발급일 없음"}]
+    assert result["ambiguous"] == [] and result["conflicting"] == []
+    assert result["questions"] == ["사고 장소는?"]
+
+
+def test_invalid_json_falls_back_to_raw_text():
+    result = parse_verification("검증 결과: 자료가 충분합니다.")
+    assert result["parse_error"] is True
+    assert result["status"] == "incomplete"
+    assert result["summary"] == "검증 결과: 자료가 충분합니다."
+    assert not is_complete(result)
+
+
+def test_non_object_json_is_a_parse_error():
+    assert parse_verification('["complete"]')["parse_error"] is True
+
+
+def test_unknown_status_is_incomplete():
+    assert parse_verification('{"status": "done"}')["status"] == "incomplete"
+
+
+def test_complete_only_without_open_issues():
+    assert is_complete(parse_verification('{"status": "complete", "summary": "이상 없음"}'))
+    assert not is_complete(parse_verification('{"status": "complete", "conflicting": ["사고일"]}'))
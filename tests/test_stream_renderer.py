@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""stream_renderer 블록 경계 판정 테스트 (화면 렌더링 없음)."""
+from modules.stream_renderer import _last_block_boundary
+
+
+def _frozen(text: str) -> str:
+    return text[:_last_block_boundary(text, 0)]
+
+
+def test_freezes_paragraph_before_next_paragraph():
+    text = "첫 단락\n\n둘째 단락\n"
+    assert _frozen(text) == "첫 단락\n\n"
+
+
+def test_waits_until_next_line_is_complete():
+    assert _frozen("첫 단락\n\n둘") == ""
+    assert _frozen("첫 단락\n\n\n") == ""
+
+
+def test_keeps_loose_list_together():
+    text = "- 항목 1\n\n- 항목 2\n\n1. 순서 항목\n"
+    assert _frozen(text) == ""
+
+
+def test_keeps_indented_continuation_with_list_item():
+    text = "- 항목\n\n    이어지는 단락\n\n다음 단락\n"
+    assert _frozen(text) == "- 항목\n\n    이어지는 단락\n\n"
+
+
+def test_ignores_blank_lines_inside_code_fence():
+    text = "```\n코드\n\n더 많은 코드\n"
+    assert _frozen(text) == ""
+    text += "```\n\n본문\n"
+    assert _frozen(text) == "```\n코드\n\n더 많은 코드\n```\n\n"
+
+
+def test_bold_and_rule_lines_are_not_list_items():
+    assert _frozen("단락\n\n**굵게**\n") == "단락\n\n"
+    assert _frozen("단락\n\n---\n") == "단락\n\n"